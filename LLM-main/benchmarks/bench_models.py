@@ -0,0 +1,238 @@
+"""
+Benchmark suite for model training and acquisition scaling.
+
+Measures train_gaussian_process, train_neural_network and
+get_most_uncertain_point on synthetic isotherm-like data across training and
+pool sizes. Every case runs in a fresh process, so the recorded peak RSS
+belongs to that case alone.
+
+Standalone:
+    python benchmarks/bench_models.py --preset quick --output results.json
+    python benchmarks/bench_models.py --preset scale --kind train_gp   # GP up to 50k points
+    python benchmarks/bench_models.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_models.py --baseline benchmarks/baseline.json --tolerance 0.25
+
+With pytest-benchmark (file must be passed explicitly):
+    pytest benchmarks/bench_models.py --benchmark-autosave
+    pytest benchmarks/bench_models.py --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+import numpy as np
+
+PRESETS = {
+    "quick": {
+        "train_gp": [100, 500, 2000],
+        "train_nn": [100, 1000, 10000],
+        "acquire_gp": [1000, 100000, 1000000],
+    },
+    "full": {
+        "train_gp": [100, 500, 2000, 5000, 10000],
+        "train_nn": [100, 1000, 10000, 50000],
+        "acquire_gp": [1000, 100000, 1000000, 10000000],
+    },
+    # Exact-GP training up to 50k points: the dense kernel matrix alone is
+    # n^2 * 8 bytes (20 GB at 50k), so these cases need a large-memory node.
+    "scale": {
+        "train_gp": [100, 500, 2000, 5000, 10000, 20000, 50000],
+        "train_nn": [100, 1000, 10000, 50000],
+        "acquire_gp": [1000, 100000, 1000000, 10000000],
+    },
+}
+
+# Dense n x n float64 matrices held at once while training an exact GP
+# (kernel matrix, Cholesky factor and a gradient-sized temporary).
+GP_DENSE_COPIES = 3
+
+# Training-set size of the GP used for the acquisition (pool-size) cases.
+ACQUISITION_TRAIN_SIZE = 200
+
+def make_isotherm_data(n, seed=0, noise=0.01):
+    """
+    Synthetic single-site Langmuir isotherms with a van 't Hoff temperature
+    dependence. Inputs are (pressure [Pa], temperature [K]); the target is the
+    loading [mol/kg]. Pressure is log-uniform over 1e2-1e7 Pa.
+    """
+    rng = np.random.default_rng(seed)
+    pressure = 10.0 ** rng.uniform(2.0, 7.0, n)
+    temperature = rng.uniform(250.0, 350.0, n)
+    q_max, k0, dh = 8.0, 1e-9, 25000.0
+    k = k0 * np.exp(dh / (8.314 * temperature))
+    loading = q_max * k * pressure / (1.0 + k * pressure)
+    loading += noise * rng.standard_normal(n)
+    X = np.column_stack([pressure, temperature])
+    return X, loading.reshape(-1, 1)
+
+def _peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kB on Linux and in bytes on macOS.
+    return rss / (1024.0 * 1024.0) if platform.system() == "Darwin" else rss / 1024.0
+
+def _run_case(kind, n, repeat, nn_epochs, seed):
+    """
+    Child-process entry point: prepare data, time the call, report peak RSS.
+    """
+    from osairo.model_manager import train_gaussian_process, train_neural_network, get_most_uncertain_point
+    if kind == "train_gp":
+        X, y = make_isotherm_data(n, seed)
+        call = lambda: train_gaussian_process(X, y)
+    elif kind == "train_nn":
+        X, y = make_isotherm_data(n, seed)
+        call = lambda: train_neural_network(X, y, epochs=nn_epochs)
+    elif kind == "acquire_gp":
+        X, y = make_isotherm_data(ACQUISITION_TRAIN_SIZE, seed)
+        model = train_gaussian_process(X, y)
+        X_pool, _ = make_isotherm_data(n, seed + 1)
+        call = lambda: get_most_uncertain_point(model, X_pool, 'gp')
+    else:
+        raise ValueError(f"Unknown benchmark kind: {kind}")
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    return {"seconds": min(times), "peak_rss_mb": _peak_rss_mb()}
+
+def _physical_memory_mb():
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def gp_memory_mb(n):
+    """
+    Rough lower bound on the memory an exact GP fit on n points needs.
+    """
+    return GP_DENSE_COPIES * n * n * 8 / (1024.0 * 1024.0)
+
+def run_case(kind, n, repeat=3, nn_epochs=20, seed=0):
+    """
+    Run one benchmark case in a fresh process.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        result = pool.submit(_run_case, kind, n, repeat, nn_epochs, seed).result()
+    result.update({"case": f"{kind}[{n}]", "kind": kind, "n": n})
+    return result
+
+def run_suite(preset="quick", kinds=None, repeat=3, nn_epochs=20, seed=0):
+    """
+    Run every case of a preset and return the list of results.
+    """
+    results = []
+    for kind, sizes in PRESETS[preset].items():
+        if kinds and kind not in kinds:
+            continue
+        for n in sizes:
+            available = _physical_memory_mb()
+            if kind == "train_gp" and available and gp_memory_mb(n) > available:
+                print(f"{kind}[{n}]: SKIPPED (needs ~{gp_memory_mb(n) / 1024:.0f} GB, "
+                      f"{available / 1024:.0f} GB installed)")
+                continue
+            try:
+                result = run_case(kind, n, repeat, nn_epochs, seed)
+            except Exception as e:
+                print(f"{kind}[{n}]: FAILED ({type(e).__name__}: {e})")
+                continue
+            print(f"{result['case']:<24}{result['seconds']:>12.4f} s{result['peak_rss_mb']:>12.1f} MB")
+            results.append(result)
+    return results
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    """
+    Return a list of regression messages: cases slower (or using more memory)
+    than the baseline by more than the given relative tolerance.
+    """
+    reference = {entry["case"]: entry for entry in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        ref = reference.get(result["case"])
+        if ref is None:
+            continue
+        for metric in ("seconds", "peak_rss_mb"):
+            if result[metric] > ref[metric] * (1.0 + tolerance):
+                regressions.append(
+                    f"{result['case']}: {metric} {result[metric]:.4g} vs baseline {ref[metric]:.4g} "
+                    f"(+{100.0 * (result[metric] / ref[metric] - 1.0):.0f}%)"
+                )
+    return regressions
+
+def _metadata(preset):
+    return {
+        "preset": preset,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="osairo model/acquisition benchmarks")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--kind", action="append", choices=sorted(PRESETS["quick"]),
+                        help="Only run these benchmark kinds.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--nn-epochs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    parser.add_argument("--save-baseline", help="Write results as a baseline JSON file.")
+    parser.add_argument("--baseline", help="Compare against this baseline and fail on regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    print(f"{'case':<24}{'time':>14}{'peak RSS':>15}")
+    results = run_suite(args.preset, args.kind, args.repeat, args.nn_epochs, args.seed)
+    payload = {"metadata": _metadata(args.preset), "results": results}
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(payload, f, indent=2)
+            print(f"Results written to {path}")
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for msg in regressions:
+                print(f"  {msg}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+# pytest-benchmark entry points. Sizes are kept small; use the standalone
+# runner for the full scaling sweep.
+BENCH_N = int(os.environ.get("OSAIRO_BENCH_N", "500"))
+
+def test_train_gaussian_process(benchmark):
+    from osairo.model_manager import train_gaussian_process
+    X, y = make_isotherm_data(BENCH_N)
+    benchmark.pedantic(train_gaussian_process, args=(X, y), rounds=3)
+
+def test_train_neural_network(benchmark):
+    from osairo.model_manager import train_neural_network
+    X, y = make_isotherm_data(BENCH_N)
+    benchmark.pedantic(train_neural_network, args=(X, y), kwargs={"epochs": 20}, rounds=3)
+
+def test_get_most_uncertain_point(benchmark):
+    from osairo.model_manager import train_gaussian_process, get_most_uncertain_point
+    X, y = make_isotherm_data(ACQUISITION_TRAIN_SIZE)
+    model = train_gaussian_process(X, y)
+    X_pool, _ = make_isotherm_data(100 * BENCH_N, seed=1)
+    benchmark(get_most_uncertain_point, model, X_pool, 'gp')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Import-time regression check for the osairo entry point.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter,
+reports the slowest imports, and fails if the total exceeds the budget or if
+a heavy dependency (LLM client, pymatgen, TensorFlow, ...) is imported at
+startup instead of on first use.
+
+Usage:
+    python benchmarks/import_time.py [--module osairo.cli] [--budget 1.0]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Modules that must only be imported on first use.
+HEAVY_MODULES = [
+    "langchain",
+    "langchain_openai",
+    "langchain_core",
+    "openai",
+    "pymatgen",
+    "tensorflow",
+    "gpflow",
+    "pandas",
+]
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure_import_time(module="osairo.cli"):
+    """
+    Return (total_seconds, [(cumulative_us, module_name), ...]) for a cold import.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+    entries = []
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        entries.append((cumulative, name))
+        # Top-level imports have a single space of indentation.
+        if len(indent) == 1:
+            total_us += cumulative
+    return total_us / 1e6, entries
+
+def check_import_time(module="osairo.cli", budget=1.0, top=10):
+    """
+    Print an import-time report and return a list of failure messages.
+    """
+    total, entries = measure_import_time(module)
+    print(f"import {module}: {total:.3f} s (budget {budget:.3f} s)")
+    for cumulative, name in sorted(entries, reverse=True)[:top]:
+        print(f"  {cumulative / 1e3:9.1f} ms  {name}")
+    failures = []
+    if total > budget:
+        failures.append(f"import time {total:.3f} s exceeds budget {budget:.3f} s")
+    loaded = {name.split(".")[0] for _, name in entries}
+    for heavy in HEAVY_MODULES:
+        if heavy in loaded:
+            failures.append(f"heavy module '{heavy}' imported at startup")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", action="append", help="Module(s) to import (default: osairo.cli and workers).")
+    parser.add_argument("--budget", type=float, default=1.0, help="Maximum import time in seconds.")
+    args = parser.parse_args()
+    modules = args.module or ["osairo.cli", "osairo.result_harvester", "osairo.gulp_generator"]
+    failures = []
+    for module in modules:
+        failures += [f"{module}: {msg}" for msg in check_import_time(module, args.budget)]
+    if failures:
+        print("\nFAILED:")
+        for msg in failures:
+            print(f"  {msg}")
+        sys.exit(1)
+    print("\nOK")
+
+if __name__ == "__main__":
+    main()
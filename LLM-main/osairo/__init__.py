@@ -5,9 +5,29 @@ machine learning Active Learning platform, orchestrated with an LLM.
 Modules:
 - data_manager: Functions to handle CSV and data management
 - model_manager: Functions to train/handle predictive models (GP, NN, etc.)
+- preprocessing: Fitted input/target normalization pipeline stored with models
+- model_store: Pickle-free model save/load and content-hash model cache
+- model_selection: Parallel k-fold cross-validation and surrogate selection
+- acquisition: Registry of chunked acquisition functions (variance, UCB, EI, IVR, cost-aware)
+- precision: Float32 GP prediction path with float64 ranking check
+- sharded_scoring: Multi-process top-k scoring of large memory-mapped candidate pools
+- candidate_grid: Lazy Cartesian candidate grids (ranges, log spacing, categorical axes)
 - active_learning: Core AL loop (uncertainty estimation, re-training, etc.)
+- async_campaign: Pipelined AL campaigns with fantasized pending points (kriging believer)
+- convergence: Stopping criteria and convergence tracking for AL campaigns
 - simulation_scripts: Generators for molecular/quantum simulation input scripts
+- script_patch: Validation and local application of LLM diff/line-edit responses
+- script_templates: Slot templates captured from seed scripts and rendered locally per point
+- script_validation: Offline validators for generated RASPA/LAMMPS/GROMACS/GULP inputs
+- supercell: Perpendicular widths and minimum supercells for a cutoff radius
+- structure_cache: Memory-mapped cache of parsed CIF structures keyed by path, mtime and content hash
+- forcefields: Cached force-field registry (JSON species/Buckingham/three-body/spring terms)
 - job_scripts: Generators for job submission scripts (UGE, Slurm, etc.)
+- local_executor: Workstation stand-in for UGE/Slurm with resource limits and status tracking
+- scheduler: sbatch/qsub submission with batched, backed-off squeue/qstat polling
+- feature_index: Hashed membership index to skip labelled/duplicate candidates
+- training_store: Append-optimized training data buffer with .npz compaction
+- result_harvester: Parallel parsing of RASPA/GULP outputs back into training data
 - cli: Command-line interface for interactive usage
 - config: Global config & environment variable handling
 """
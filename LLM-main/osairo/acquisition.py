@@ -0,0 +1,168 @@
+import numpy as np
+from .config import SCORING_CHUNK_SIZE
+from .model_manager import predict_mean_variance, combine_target_variances
+
+# name -> {"score": fn(mean, variance, X, state, **params), "prepare": fn(model, X_pool, **params) or None}
+ACQUISITION_FUNCTIONS = {}
+
+def register_acquisition(name, prepare=None):
+    """
+    Decorator registering an acquisition function.
+    The score function receives a chunk of predictive means and variances
+    (original target units, shape (n, n_targets)), the raw candidate chunk and
+    the state returned by prepare(model, X_pool, **params) (computed once per
+    selection), and returns one score per row; higher is better.
+    """
+    def decorator(func):
+        ACQUISITION_FUNCTIONS[name] = {"score": func, "prepare": prepare}
+        return func
+    return decorator
+
+def _combined_mean(mean, target_weights=None):
+    mean = np.asarray(mean, dtype=float)
+    if mean.ndim == 1:
+        return mean
+    weights = np.ones(mean.shape[1]) if target_weights is None else np.asarray(target_weights, dtype=float)
+    return mean @ weights
+
+def _combined_variance(variance, target_weights=None):
+    # Targets are modelled independently, so Var(sum w_i f_i) = sum w_i**2 Var(f_i).
+    weights = None if target_weights is None else np.asarray(target_weights, dtype=float) ** 2
+    return combine_target_variances(variance, 'sum', weights)
+
+@register_acquisition("variance")
+def max_variance(mean, variance, X, state, target_rule='sum', target_weights=None, **params):
+    """
+    Pure exploration: predictive variance (combined over targets).
+    """
+    return combine_target_variances(variance, target_rule, target_weights)
+
+@register_acquisition("ucb")
+def upper_confidence_bound(mean, variance, X, state, beta=2.0, target_weights=None, **params):
+    """
+    mean + beta * std, for maximizing the (weighted sum of the) targets.
+    """
+    std = np.sqrt(np.maximum(_combined_variance(variance, target_weights), 0.0))
+    return _combined_mean(mean, target_weights) + beta * std
+
+def _prepare_ei(model, X_pool, y_best=None, **params):
+    if y_best is None:
+        pipeline = getattr(model, "osairo_pipeline", None)
+        y = np.asarray(model.data[1]) if hasattr(model, "data") else None
+        if y is None:
+            raise ValueError("Expected improvement needs y_best for this model.")
+        if pipeline is not None:
+            y = pipeline.inverse_transform_targets(y)
+        y_best = float(np.max(_combined_mean(y, params.get("target_weights"))))
+    return {"y_best": y_best}
+
+@register_acquisition("ei", prepare=_prepare_ei)
+def expected_improvement(mean, variance, X, state, xi=0.0, target_weights=None, **params):
+    """
+    Expected improvement over the best observed (weighted) target value.
+    """
+    from scipy.special import ndtr
+    mu = _combined_mean(mean, target_weights)
+    sigma = np.sqrt(np.maximum(_combined_variance(variance, target_weights), 1e-300))
+    improvement = mu - state["y_best"] - xi
+    z = improvement / sigma
+    pdf = np.exp(-0.5 * z ** 2) / np.sqrt(2.0 * np.pi)
+    return improvement * ndtr(z) + sigma * pdf
+
+def _prepare_ivr(model, X_pool, n_reference=256, seed=0, **params):
+    from scipy.linalg import cholesky, solve_triangular
+    pipeline = getattr(model, "osairo_pipeline", None)
+    rng = np.random.default_rng(seed)
+    ref_idx = rng.choice(len(X_pool), size=min(n_reference, len(X_pool)), replace=False)
+    X_ref = np.asarray(X_pool[np.sort(ref_idx)], dtype=float)
+    if pipeline is not None:
+        X_ref = pipeline.transform(X_ref)
+    X_train = np.asarray(model.data[0], dtype=float)
+    noise = float(model.likelihood.variance.numpy())
+    K = model.kernel(X_train).numpy() + noise * np.eye(len(X_train))
+    L = cholesky(K, lower=True)
+    B = solve_triangular(L, model.kernel(X_train, X_ref).numpy(), lower=True)
+    return {"L": L, "B": B, "X_ref": X_ref, "X_train": X_train, "noise": noise, "pipeline": pipeline}
+
+@register_acquisition("ivr", prepare=_prepare_ivr)
+def integrated_variance_reduction(mean, variance, X, state, **params):
+    """
+    Reduction of the summed posterior variance over a reference subset of the
+    pool if the candidate were labelled (GP models only). Uses one Cholesky
+    factor computed in prepare; each chunk costs two triangular solves.
+    """
+    from scipy.linalg import solve_triangular
+    kernel = params["model"].kernel
+    Xc = state["pipeline"].transform(X) if state["pipeline"] is not None else np.asarray(X, dtype=float)
+    A = solve_triangular(state["L"], kernel(state["X_train"], Xc).numpy(), lower=True)
+    cov = kernel(Xc, state["X_ref"]).numpy() - A.T @ state["B"]
+    var = kernel(Xc, full_cov=False).numpy() - np.sum(A ** 2, axis=0)
+    return np.sum(cov ** 2, axis=1) / (np.maximum(var, 0.0) + state["noise"])
+
+def pressure_cost_model(pressure_column=0, base_hours=1.0, reference_pressure=1e5, exponent=0.5):
+    """
+    Expected CPU-hours per GCMC point, growing with pressure (more molecules
+    to move at high loading): base_hours * (1 + (P / reference_pressure) ** exponent).
+    """
+    def cost(X):
+        pressure = np.maximum(np.asarray(X, dtype=float)[:, pressure_column], 0.0)
+        return base_hours * (1.0 + (pressure / reference_pressure) ** exponent)
+    return cost
+
+@register_acquisition("cost_aware")
+def cost_aware_variance(mean, variance, X, state, cost_fn=None, target_rule='sum', target_weights=None, **params):
+    """
+    Predictive variance per expected CPU-hour (pressure-dependent cost by default).
+    """
+    cost_fn = cost_fn or pressure_cost_model()
+    return combine_target_variances(variance, target_rule, target_weights) / np.maximum(cost_fn(X), 1e-12)
+
+def get_acquisition(name):
+    if name not in ACQUISITION_FUNCTIONS:
+        raise ValueError(f"Unknown acquisition '{name}'. Choose one of {sorted(ACQUISITION_FUNCTIONS)}.")
+    return ACQUISITION_FUNCTIONS[name]
+
+def iter_acquisition_scores(model, X, acquisition='variance', model_type='gp',
+                            chunk_size=SCORING_CHUNK_SIZE, precision='float64', state=None, exclude=None,
+                            **params):
+    """
+    Yield (start, scores) for consecutive chunks of X.
+    A precomputed prepare state may be passed when X is one shard of a larger
+    pool, so every shard is scored against the same reference. Rows found in
+    exclude (a FeatureIndex) score -inf.
+    """
+    entry = get_acquisition(acquisition)
+    if state is None and entry["prepare"]:
+        state = entry["prepare"](model, X, **params)
+    for start in range(0, len(X), chunk_size):
+        chunk = X[start:start + chunk_size]
+        mean, variance = predict_mean_variance(model, chunk, model_type, chunk_size, precision)
+        scores = np.asarray(entry["score"](mean, variance, chunk, state, model=model, **params), dtype=float)
+        if exclude is not None:
+            scores[exclude.contains(chunk)] = -np.inf
+        yield start, scores
+
+def score_candidates(model, X, acquisition='variance', model_type='gp', chunk_size=SCORING_CHUNK_SIZE,
+                     precision='float64', **params):
+    """
+    Return the acquisition score of every row of X.
+    """
+    scores = np.empty(len(X))
+    for start, chunk_scores in iter_acquisition_scores(model, X, acquisition, model_type, chunk_size,
+                                                       precision, **params):
+        scores[start:start + len(chunk_scores)] = chunk_scores
+    return scores
+
+def select_best(model, X, acquisition='variance', model_type='gp', chunk_size=SCORING_CHUNK_SIZE,
+                precision='float64', **params):
+    """
+    Return (index, score) of the highest-scoring row, keeping only a running
+    maximum so memory stays bounded by one chunk.
+    """
+    best_idx, best_score = -1, -np.inf
+    for start, scores in iter_acquisition_scores(model, X, acquisition, model_type, chunk_size,
+                                                 precision, **params):
+        i = int(np.argmax(scores))
+        if scores[i] > best_score:
+            best_idx, best_score = start + i, float(scores[i])
+    return best_idx, best_score
@@ -1,9 +1,12 @@
 import os
 import click
 from .model_manager import get_most_uncertain_point
-from .simulation_scripts import interactive_generate_simulation_script
+from .candidate_grid import CandidateGrid
+from .script_templates import capture_template, point_values
+from .simulation_scripts import interactive_generate_simulation_script, ensure_valid_script, prompt_ensemble
 from .job_scripts import generate_job_script
 from .config import DEFAULT_RESPONSES_FOLDER
+from .profiling import span, traced
 
 def colorful_print(msg, color="cyan", bold=False):
     click.secho(msg, fg=color, bold=bold)
@@ -13,31 +16,57 @@ def save_response(filename, content, folder=None):
     Save the provided content to a file inside the specified folder.
     """
     target_folder = folder or DEFAULT_RESPONSES_FOLDER
-    os.makedirs(target_folder, exist_ok=True)
-    filepath = os.path.join(target_folder, filename)
-    with open(filepath, 'w') as f:
-        f.write(content)
+    with span("io.save_response", bytes=len(content)):
+        os.makedirs(target_folder, exist_ok=True)
+        filepath = os.path.join(target_folder, filename)
+        with open(filepath, 'w') as f:
+            f.write(content)
     print(f"Saved {filename} -> {target_folder}")
 
+@traced("al.cycle")
 def active_learning_cycle(model, model_type, X_unlabeled, simulation_type,
-                          simulation_parameters, job_system, job_params=None, folder=None):
+                          simulation_parameters, job_system, job_params=None, folder=None,
+                          labeled_index=None, acquisition='variance', acquisition_params=None, templates=None):
     """
     Execute one active learning iteration:
       1. Identify the most uncertain point.
       2. Display its value and ask what it represents (e.g., pressure, temperature).
-      3. Prompt for a one-line simulation description.
+      3. Prompt for a one-line simulation description and the ensemble.
       4. Combine these inputs into a final simulation parameter string.
       5. Generate a complete, submission-ready simulation input script via ChatOpenAI.
       6. Allow interactive modification of that script via a chat interface.
       7. Generate an HPC job submission script.
+    If labeled_index (a FeatureIndex) is given, already-labelled and duplicate
+    candidates are skipped and the chosen point is added to it, so later
+    cycles never select the same simulation twice. acquisition selects the
+    rule used to rank candidates (see osairo.acquisition).
+    If templates (a TemplateStore) holds a template for simulation_type and
+    the same fixed setup (simulation_parameters, description and ensemble) whose slots
+    cover every variable of the point, the script is rendered locally and
+    shown for confirmation instead of asking the LLM; slots the point does
+    not vary keep the seed's values. The first LLM script for a setup is
+    captured as its template.
+    Scripts are checked by the offline validators (osairo.script_validation)
+    before they are saved.
     Returns (uncertain_point, simulation_script_filename, job_script_filename).
     """
-    uncertain_point, idx, uncertainty = get_most_uncertain_point(model, X_unlabeled, model_type)
+    uncertain_point, idx, uncertainty = get_most_uncertain_point(model, X_unlabeled, model_type,
+                                                                 exclude=labeled_index,
+                                                                 acquisition=acquisition,
+                                                                 acquisition_params=acquisition_params)
+    if labeled_index is not None:
+        labeled_index.add(uncertain_point)
     print(f"Most uncertain point index: {idx}, uncertainty: {uncertainty}")
     print(f"Most uncertain point value: {uncertain_point}")
+    default_meaning = "pressure"
+    if isinstance(X_unlabeled, CandidateGrid):
+        print(f"Grid coordinates: {X_unlabeled.coordinates(idx)}")
+        default_meaning = ", ".join(X_unlabeled.columns)
     
-    meaning = click.prompt("What does this value represent? (e.g., pressure, temperature)", default="pressure")
+    meaning = click.prompt("What does this value represent? (e.g., pressure, temperature)", default=default_meaning)
     sim_desc = click.prompt("Enter a one-line description of the simulation (e.g., 'N2 in cubtc')", default="")
+    # Asked before the template lookup: a template rendered for one ensemble must not serve another.
+    ensemble = prompt_ensemble()
     
     base_sim_params = (
         f"User simulation description: {sim_desc}\n"
@@ -46,7 +75,32 @@ def active_learning_cycle(model, model_type, X_unlabeled, simulation_type,
     )
     final_sim_params = simulation_parameters + "\n" + base_sim_params
 
-    sim_script = interactive_generate_simulation_script(simulation_type, final_sim_params)
+    values = point_values(uncertain_point, meaning)
+    # Templates are keyed on the fixed setup; only the point's values change.
+    context = f"{simulation_parameters}\n{sim_desc}\nEnsemble: {ensemble}"
+    template = templates.get(simulation_type, context) if templates is not None else None
+    stored = template is not None
+    sim_script = None
+    if template is not None and template.covers(values):
+        rendered = template.render(values)
+        colorful_print(f"Rendered {simulation_type} script from saved template (slots: {', '.join(template.slots)}):", "bright_cyan")
+        print(rendered)
+        if click.confirm("Use this rendered script?", default=True):
+            sim_script = rendered
+    elif template is not None:
+        print(f"Saved {simulation_type} template (slots: {', '.join(template.slots)}) does not cover "
+              f"{', '.join(values)}; generating a new script.")
+    if sim_script is None:
+        template = None
+        sim_script = interactive_generate_simulation_script(simulation_type, final_sim_params, ensemble=ensemble)
+    # Offline checks before anything is written; failures trigger a targeted LLM fix.
+    sim_script, issues = ensure_valid_script(simulation_type, sim_script, final_sim_params)
+    # Captured once per setup; a point that did not render keeps the stored template.
+    if templates is not None and not stored and not issues:
+        captured = capture_template(simulation_type, sim_script, context)
+        if captured.slots:
+            path = templates.save(captured)
+            print(f"Saved {simulation_type} template with slots {captured.slots} -> {path}")
     sim_script_filename = f"{simulation_type}_simulation_{idx}.input"
     save_response(sim_script_filename, sim_script, folder)
 
@@ -58,8 +112,49 @@ def active_learning_cycle(model, model_type, X_unlabeled, simulation_type,
 
 def update_training_data(df, new_data):
     """
-    Optionally update the training DataFrame with new simulation results.
+    Optionally update the training data with new simulation results.
+    new_data may be a single row (dict) or a batch of rows (list of dicts).
+    If df is a TrainingStore the rows are appended in place (amortized O(1));
+    a DataFrame is extended with a single concat.
     """
     import pandas as pd
-    new_df = pd.DataFrame([new_data])
+    from .training_store import TrainingStore
+    rows = [new_data] if isinstance(new_data, dict) else list(new_data)
+    if not rows:
+        return df
+    if isinstance(df, TrainingStore):
+        df.extend(rows)
+        return df
+    new_df = pd.DataFrame(rows)
     return pd.concat([df, new_df], ignore_index=True)
+
+def run_campaign(train_fn, label_fn, X_pool, model_type, monitor, max_cycles=50,
+                 labeled_index=None, X_holdout=None, y_holdout=None):
+    """
+    Run active-learning cycles until the ConvergenceMonitor reports
+    convergence or max_cycles is reached.
+      - train_fn() returns a model trained on the current training data.
+      - label_fn(point, idx) obtains the simulation result for the chosen point
+        (e.g., submit the job and harvest its output) and adds it to the
+        training data used by train_fn.
+    monitor.update raises ValueError up front if one of its thresholds
+    cannot be computed (e.g. prediction_change without X_holdout).
+    Returns (model, monitor).
+    """
+    model = train_fn()
+    for cycle in range(max_cycles):
+        metrics = monitor.update(model, model_type, X_pool, X_holdout, y_holdout)
+        monitor.print_status()
+        if metrics["converged"]:
+            colorful_print(f"Surrogate converged after {cycle} new simulations; stopping campaign.", "green")
+            break
+        with span("al.select"):
+            point, idx, _ = get_most_uncertain_point(model, X_pool, model_type, exclude=labeled_index)
+        if labeled_index is not None:
+            labeled_index.add(point)
+        with span("al.label"):
+            label_fn(point, idx)
+        model = train_fn()
+    else:
+        colorful_print(f"Reached max_cycles={max_cycles} without convergence.", "yellow")
+    return model, monitor
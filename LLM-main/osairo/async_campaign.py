@@ -0,0 +1,192 @@
+import time
+import asyncio
+import inspect
+from functools import partial
+import numpy as np
+from .model_manager import PoolExhausted, get_most_uncertain_point
+from .feature_index import FeatureIndex
+from .training_store import TrainingStore
+from .local_executor import COMPLETED, FINAL_STATES as EXECUTOR_FINAL_STATES
+from .scheduler import FINISHED, FINAL_STATES as SCHEDULER_FINAL_STATES
+from .profiling import span
+
+FINAL_STATES = EXECUTOR_FINAL_STATES | SCHEDULER_FINAL_STATES
+
+def fantasize(model, X_pending, model_type='gp'):
+    """
+    Kriging believer: a copy of a GP whose training data also holds the
+    pending points, labelled with the model's own predicted mean. The
+    posterior variance collapses around points already being simulated, so
+    the next selection moves elsewhere. Hyperparameters are shared, not
+    re-optimized. NN models (no variance) are returned unchanged; the
+    labelled-point index keeps them from picking a pending point twice.
+    """
+    if model_type != 'gp' or X_pending is None or not len(X_pending):
+        return model
+    import gpflow
+    pipeline = getattr(model, "osairo_pipeline", None)
+    X_pending = np.asarray(X_pending, dtype=float)
+    if pipeline is not None:
+        X_pending = pipeline.transform(X_pending)
+    mean, _ = model.predict_f(X_pending)
+    X_train, y_train = model.data
+    fantasy = gpflow.models.GPR(
+        data=(np.concatenate([np.asarray(X_train), X_pending]), np.concatenate([np.asarray(y_train), np.asarray(mean)])),
+        kernel=model.kernel,
+        mean_function=model.mean_function,
+        noise_variance=float(model.likelihood.variance.numpy()),
+    )
+    fantasy.osairo_pipeline = pipeline
+    return fantasy
+
+async def _call(fn, *args):
+    """
+    Await a coroutine function, or run a blocking one in the default thread pool.
+    """
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, fn, *args)
+
+def job_label_fn(write_job, backend, read_result, poll_interval=5.0):
+    """
+    Build an async label_fn on a LocalExecutor or SchedulerClient:
+      - write_job(point, idx) writes the input and job scripts and returns the
+        job script path (e.g., rendered from a stored template).
+      - read_result(job) returns the label from the finished job's record
+        (job["cwd"] holds the outputs).
+    Each in-flight point waits on its own job; SchedulerClient.poll() is
+    throttled by the client, so many waiting points still cost one squeue/qstat
+    query per interval.
+    """
+    async def label(point, idx):
+        script_path = await _call(write_job, point, idx)
+        job_id = await _call(backend.submit, script_path)
+        while True:
+            if hasattr(backend, "poll"):
+                # squeue/qstat run in a worker thread so other in-flight points keep going.
+                await _call(backend.poll)
+            status = backend.status(job_id)
+            if status in FINAL_STATES:
+                break
+            await asyncio.sleep(poll_interval)
+        if status not in (COMPLETED, FINISHED):
+            raise RuntimeError(f"Job {job_id} ended as {status}.")
+        return await _call(read_result, backend.jobs[job_id])
+    return label
+
+def _select(model, X_pool, model_type, X_pending, labeled_index, acquisition, acquisition_params):
+    with span("al.select", pending=0 if X_pending is None else len(X_pending)):
+        candidate = fantasize(model, X_pending, model_type)
+        return get_most_uncertain_point(candidate, X_pool, model_type, exclude=labeled_index,
+                                        acquisition=acquisition, acquisition_params=acquisition_params)
+
+async def run_async_campaign(train_fn, label_fn, X_pool, X_train, y_train, model_type='gp', monitor=None,
+                             max_in_flight=4, max_points=50, labeled_index=None, X_holdout=None, y_holdout=None,
+                             acquisition='variance', acquisition_params=None):
+    """
+    Pipelined active learning: keep up to max_in_flight simulations running at
+    all times instead of alternating train -> select -> simulate.
+      - train_fn(X, y) returns a model trained on the given data; it runs in a
+        worker thread whenever new results have arrived, while the remaining
+        jobs keep running (at most one training at a time; results that arrive
+        meanwhile trigger the next one).
+      - label_fn(point, idx) returns the simulation result for a point (a
+        scalar or one value per target); coroutine functions are awaited,
+        blocking ones run in a worker thread. See job_label_fn.
+    Every free slot is filled at once from the latest model, fantasized over
+    the points still in flight (kriging believer), so each pick differs from
+    the pending ones. Submission stops after max_points picks or once the
+    ConvergenceMonitor converges; in-flight jobs are still collected. A
+    failed label_fn is reported and its point stays excluded; a failed
+    training keeps the previous model and is retried on the next result.
+    Results are appended to a TrainingStore and handed to train_fn as views.
+    Returns (model, X_train, y_train, stats).
+    """
+    X_train = np.asarray(X_train, dtype=float)
+    y_train = np.asarray(y_train, dtype=float)
+    if y_train.ndim == 1:
+        y_train = y_train.reshape(-1, 1)
+    if labeled_index is None:
+        labeled_index = FeatureIndex(X_train)
+    x_columns = [f"x{i}" for i in range(X_train.shape[1])]
+    y_columns = [f"y{i}" for i in range(y_train.shape[1])]
+    store = TrainingStore(x_columns + y_columns, capacity=2 * (len(X_train) + max_points))
+    store.extend(np.hstack([X_train, y_train]))
+    started = time.time()
+    stats = {"submitted": 0, "completed": 0, "failed": 0, "trainings": 0, "train_failures": 0, "events": []}
+
+    def record(event, **fields):
+        stats["events"].append({"event": event, "time": time.time() - started, **fields})
+
+    model = await _call(train_fn, X_train, y_train)
+    stats["trainings"] += 1
+    pending = {}
+    training = None
+    new_results = 0
+    stop = False
+    while True:
+        while not stop and len(pending) < max_in_flight and stats["submitted"] < max_points:
+            X_pending = np.array([point for point, _ in pending.values()]) if pending else None
+            try:
+                # Scoring scans the whole pool; keep it off the event loop.
+                point, idx, _ = await _call(partial(_select, model, X_pool, model_type, X_pending, labeled_index,
+                                                    acquisition, acquisition_params))
+            except PoolExhausted:
+                stop = True
+                break
+            point = np.asarray(point, dtype=float)
+            labeled_index.add(point)
+            pending[asyncio.ensure_future(_call(label_fn, point, idx))] = (point, idx)
+            stats["submitted"] += 1
+            record("submit", index=int(idx), in_flight=len(pending))
+        if training is None and new_results:
+            # Views of the rows stored so far; later appends never touch them.
+            training = asyncio.ensure_future(_call(train_fn, *store.arrays(x_columns, y_columns)))
+            new_results = 0
+            record("train_start", n_train=len(store))
+        if not pending and training is None:
+            break
+        waiting = set(pending) | ({training} if training is not None else set())
+        done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task is training:
+                training = None
+                try:
+                    model = task.result()
+                except Exception as e:
+                    stats["train_failures"] += 1
+                    record("train_failed", error=str(e))
+                    print(f"Training failed ({e}); keeping the previous model until the next result.")
+                    continue
+                stats["trainings"] += 1
+                record("train_done", n_train=len(model.data[0]) if model_type == 'gp' else None)
+                if monitor is not None:
+                    metrics = await _call(partial(monitor.update, model, model_type, X_pool, X_holdout, y_holdout))
+                    monitor.print_status()
+                    if metrics["converged"] and not stop:
+                        print(f"Surrogate converged after {stats['completed']} new simulations; "
+                              f"collecting {len(pending)} in-flight job(s).")
+                        stop = True
+                continue
+            point, idx = pending.pop(task)
+            try:
+                value = task.result()
+            except Exception as e:
+                stats["failed"] += 1
+                record("failed", index=int(idx), error=str(e))
+                print(f"Labelling candidate {idx} failed: {e}")
+                continue
+            store.append(np.concatenate([point.ravel(), np.asarray(value, dtype=float).ravel()]))
+            stats["completed"] += 1
+            new_results += 1
+            record("result", index=int(idx), in_flight=len(pending))
+    stats["elapsed"] = time.time() - started
+    X_train, y_train = store.arrays(x_columns, y_columns)
+    return model, X_train.copy(), y_train.copy(), stats
+
+def run_pipelined_campaign(*args, **kwargs):
+    """
+    Blocking entry point for run_async_campaign (same arguments and return).
+    """
+    return asyncio.run(run_async_campaign(*args, **kwargs))
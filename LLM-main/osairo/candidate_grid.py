@@ -0,0 +1,146 @@
+import json
+import numpy as np
+from .config import SCORING_CHUNK_SIZE
+
+class GridAxis:
+    """
+    One axis of a candidate grid: an (n_points, n_columns) array of values.
+    Numeric axes have one column; a categorical axis can carry several
+    columns per category (e.g. the descriptors of a framework), with labels
+    naming each category.
+    """
+
+    def __init__(self, name, values, columns=None, labels=None):
+        values = np.asarray(values, dtype=float)
+        self.values = values.reshape(len(values), -1)
+        self.name = name
+        self.columns = list(columns) if columns is not None else (
+            [name] if self.values.shape[1] == 1 else [f"{name}_{i}" for i in range(self.values.shape[1])])
+        self.labels = list(labels) if labels is not None else None
+        if len(self.columns) != self.values.shape[1]:
+            raise ValueError(f"Axis '{name}' has {self.values.shape[1]} value columns but {len(self.columns)} names.")
+
+    def __len__(self):
+        return len(self.values)
+
+    def coordinate(self, i):
+        if self.labels is not None:
+            return self.labels[i]
+        row = self.values[i]
+        return float(row[0]) if len(row) == 1 else {c: float(v) for c, v in zip(self.columns, row)}
+
+def linear_axis(name, start, stop, num):
+    return GridAxis(name, np.linspace(start, stop, num))
+
+def log_axis(name, start, stop, num):
+    return GridAxis(name, np.geomspace(start, stop, num))
+
+def categorical_axis(name, values, columns=None, labels=None):
+    return GridAxis(name, values, columns, labels)
+
+def _axis_from_spec(spec):
+    name = spec["name"]
+    if "values" in spec:
+        return categorical_axis(name, spec["values"], spec.get("columns"), spec.get("labels"))
+    if spec.get("scale", "linear") == "log":
+        return log_axis(name, spec["start"], spec["stop"], spec["num"])
+    return linear_axis(name, spec["start"], spec["stop"], spec["num"])
+
+class CandidateGrid:
+    """
+    Lazy Cartesian product of grid axes.
+    Behaves like a read-only 2-D array for the operations the scoring code
+    uses (len, shape, slicing, integer and index-array lookup), but rows are
+    only built for the indices requested, so a pool of billions of points
+    costs nothing until a chunk of it is scored. Row i corresponds to the
+    C-order (last axis fastest) multi-index np.unravel_index(i, grid.dims).
+    Converting the whole grid to an array is refused above max_dense_rows.
+    """
+
+    max_dense_rows = SCORING_CHUNK_SIZE
+
+    def __init__(self, axes):
+        if not axes:
+            raise ValueError("A candidate grid needs at least one axis.")
+        self.axes = list(axes)
+        self.dims = tuple(len(axis) for axis in self.axes)
+        self.columns = [c for axis in self.axes for c in axis.columns]
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Build a grid from a dict {"axes": [...]}. Each axis is either
+        {"name", "start", "stop", "num", "scale": "linear"|"log"} or
+        {"name", "values", "columns"?, "labels"?} for categorical axes.
+        """
+        return cls([_axis_from_spec(axis) for axis in spec["axes"]])
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path) as f:
+            return cls.from_spec(json.load(f))
+
+    def __len__(self):
+        return int(np.prod(self.dims, dtype=np.int64))
+
+    @property
+    def size(self):
+        return len(self)
+
+    @property
+    def shape(self):
+        return (len(self), len(self.columns))
+
+    @property
+    def ndim(self):
+        return 2
+
+    def rows(self, indices):
+        """
+        Build the feature rows for an array of flat indices.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        multi = np.unravel_index(indices, self.dims)
+        return np.concatenate([axis.values[i] for axis, i in zip(self.axes, multi)], axis=1)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.rows(np.arange(*key.indices(len(self)), dtype=np.int64))
+        if np.isscalar(key):
+            key = int(key)
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError(f"Index {key} out of range for grid of {len(self)} points.")
+            return self.rows([key])[0]
+        key = np.asarray(key)
+        if key.dtype == bool:
+            key = np.flatnonzero(key)
+        return self.rows(np.where(key < 0, key + len(self), key))
+
+    def __array__(self, dtype=None, copy=None):
+        # Implicit conversion (np.asarray(grid) in code unaware of grids) must
+        # not silently build the whole Cartesian product.
+        if len(self) > self.max_dense_rows:
+            raise ValueError(f"Refusing to materialize a candidate grid of {len(self):,} points "
+                             f"(limit {self.max_dense_rows:,}); score it with grid.chunks() or "
+                             f"build rows explicitly with grid[start:stop].")
+        X = self.rows(np.arange(len(self), dtype=np.int64))
+        return X if dtype is None else X.astype(dtype)
+
+    def chunks(self, chunk_size=SCORING_CHUNK_SIZE):
+        """
+        Yield (start, rows) for consecutive chunks of the grid.
+        """
+        for start in range(0, len(self), chunk_size):
+            yield start, self[start:start + chunk_size]
+
+    def coordinates(self, index):
+        """
+        Map a flat index back to {axis name: value or category label}.
+        """
+        multi = np.unravel_index(int(index), self.dims)
+        return {axis.name: axis.coordinate(int(i)) for axis, i in zip(self.axes, multi)}
+
+    def describe(self):
+        return " x ".join(f"{axis.name}[{len(axis)}]" for axis in self.axes) + f" = {len(self):,} points"
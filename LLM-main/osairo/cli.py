@@ -2,11 +2,18 @@ import click
 import sys
 import re
 import os
-from .data_manager import load_csv
-from .model_manager import train_model
+from .data_manager import load_csv, load_cif, sample_candidate_pool
+from .feature_index import FeatureIndex
+from .candidate_grid import CandidateGrid
+from .model_manager import PoolExhausted, fit_model
+from .model_store import load_model
+from .preprocessing import FeaturePipeline
+from .script_templates import TemplateStore
+from .supercell import raspa_unit_cells
 from .active_learning import active_learning_cycle
-from .config import DEFAULT_RESPONSES_FOLDER
+from .config import DEFAULT_RESPONSES_FOLDER, DEFAULT_MODEL_CACHE, DEFAULT_TEMPLATE_FOLDER
 from .knowledge_mode import knowledge_chat_session
+from .profiling import enable_profiling, print_report, export
 
 def colorful_print(msg, color="white", bold=False):
     click.secho(msg, fg=color, bold=bold)
@@ -36,8 +43,27 @@ def parse_feature_input(df, prompt_text):
             continue
         return cols
 
-@click.command()
-def run_cli():
+def load_or_train_model(model_type, X, y, model_config=None):
+    """
+    Interactive layer over fit_model: offer to load a saved model once, else
+    train (or reuse the cached model) and report the training stats.
+    """
+    load_option = click.prompt("Do you want to load an existing model? (yes/no)", default="no")
+    if load_option.lower() in ["yes", "y"]:
+        model_path = click.prompt("Enter the file path to load the model", default="")
+        try:
+            model = load_model(model_path, model_type)
+            colorful_print("Model loaded successfully.", "green")
+            return model
+        except Exception as e:
+            colorful_print(f"Error loading model: {e}. Training a new model.", "red")
+    model, stats = fit_model(model_type, X, y, cache_dir=DEFAULT_MODEL_CACHE, config=model_config,
+                             pipeline=FeaturePipeline())
+    source = "cache" if stats["cached"] else f"trained in {stats['train_time_s']:.2f}s"
+    colorful_print(f"{model_type.upper()} model on {stats['n_train']} points ({source}).", "green")
+    return model
+
+def interactive_session():
     greet_user()
     
     # Load training CSV data or CIF file.
@@ -104,9 +130,10 @@ Symmetry operations: {len(cif_data['symmetry_ops'])} operations
     
     # Choose model type and optionally load an existing model.
     model_type = None
+    model_config = None
     if df is not None:
         while model_type not in ["gp", "nn"]:
-            val = click.prompt(click.style("Choose model type ('gp' or 'nn') or 'chat', 'help', 'exit':", fg="bright_magenta"))
+            val = click.prompt(click.style("Choose model type ('gp' or 'nn'), 'cv' to cross-validate candidates, or 'chat', 'help', 'exit':", fg="bright_magenta"))
             cmd = val.lower().strip()
             if cmd in ["exit", "quit"]:
                 colorful_print("Exiting.", "red")
@@ -115,7 +142,24 @@ Symmetry operations: {len(cif_data['symmetry_ops'])} operations
                 knowledge_chat_session()
                 continue
             if cmd in ["help", "?"]:
-                colorful_print("Type 'gp' for Gaussian Process or 'nn' for Neural Network.", "yellow")
+                colorful_print("Type 'gp' for Gaussian Process, 'nn' for Neural Network, or 'cv' to compare GP kernels and NN sizes by k-fold cross-validation.", "yellow")
+                continue
+            if cmd == "cv":
+                from .model_selection import cross_validate, select_model, print_cv_report
+                while True:
+                    target = click.prompt("Target RMSE (press Enter to pick the most accurate model)", default="", show_default=False).strip()
+                    try:
+                        target_rmse = float(target) if target else None
+                        break
+                    except ValueError:
+                        colorful_print("Enter a number in target units (e.g. 0.1), or press Enter.", "red")
+                colorful_print("Running k-fold cross-validation...", "bright_cyan")
+                summary = cross_validate(X, y)
+                chosen = select_model(summary, target_rmse)
+                print_cv_report(summary, chosen)
+                colorful_print(f"Selected {chosen['name']}.", "green")
+                model_type = chosen["model_type"]
+                model_config = chosen["config"]
                 continue
             if cmd in ["gp", "nn"]:
                 model_type = cmd
@@ -126,30 +170,18 @@ Symmetry operations: {len(cif_data['symmetry_ops'])} operations
         model_type = "gulp"
     
     if df is not None:
-        load_option = click.prompt("Do you want to load an existing model? (yes/no)", default="no")
-        if load_option.lower() in ["yes", "y"]:
-            model_path = click.prompt("Enter the file path to load the model", default="")
-            try:
-                import pickle
-                with open(model_path, "rb") as f:
-                    model = pickle.load(f)
-                colorful_print("Model loaded successfully.", "green")
-            except Exception as e:
-                colorful_print(f"Error loading model: {e}. Training a new model.", "red")
-                model = train_model(model_type, X, y)
-        else:
-            model = train_model(model_type, X, y)
+        model = load_or_train_model(model_type, X, y, model_config)
     else:
         # For CIF files, no model needed
         model = None
     
     if df is not None:
         # Load unlabeled CSV data and ask for testing feature columns.
-        colorful_print("Now select an unlabeled dataset (or type 'skip' to use a default subset).", "bright_cyan")
+        colorful_print("Now select an unlabeled dataset (or type 'skip' to sample a default pool).", "bright_cyan")
         X_unlabeled = None
         df_unlab = None
         while X_unlabeled is None:
-            raw = click.prompt(click.style("Enter path to unlabeled CSV, 'skip', 'help', 'chat', 'exit':", fg="bright_magenta"), default="")
+            raw = click.prompt(click.style("Enter path to unlabeled CSV or grid spec (.json), 'skip', 'help', 'chat', 'exit':", fg="bright_magenta"), default="")
             cmd = raw.lower().strip()
             if cmd in ["exit", "quit"]:
                 colorful_print("Exiting.", "red")
@@ -158,15 +190,31 @@ Symmetry operations: {len(cif_data['symmetry_ops'])} operations
                 knowledge_chat_session()
                 continue
             if cmd in ["help", "?"]:
-                colorful_print("Provide a valid CSV file with the same input features, or 'skip' to use the first 5 rows.", "yellow")
+                colorful_print("Provide a valid CSV file with the same input features, a JSON grid spec with one axis per input feature "
+                               "(e.g. {\"axes\": [{\"name\": \"pressure\", \"start\": 1e3, \"stop\": 1e7, \"num\": 50, \"scale\": \"log\"}, "
+                               "{\"name\": \"temperature\", \"values\": [273, 298, 323]}]}), "
+                               "or 'skip' to sample candidates within the training range.", "yellow")
                 continue
             if cmd in ["skip", ""]:
-                X_unlabeled = X[:5]
+                X_unlabeled = sample_candidate_pool(X)
                 df_unlab = None
-                colorful_print("Using first 5 rows of training data as unlabeled set.", "yellow")
+                colorful_print(f"Sampled {len(X_unlabeled)} candidates within the training data range.", "yellow")
                 break
             if cmd.startswith("load "):
                 raw = raw[5:].strip()
+            if raw.strip().lower().endswith(".json"):
+                try:
+                    grid = CandidateGrid.from_json(raw.strip())
+                except (OSError, ValueError, KeyError) as e:
+                    colorful_print(f"Failed to load grid spec: {e}. Try again.", "red")
+                    continue
+                if grid.columns != list(input_features):
+                    colorful_print(f"ERROR: Grid columns {grid.columns} must match the input features {list(input_features)} in order. Try again.", "red")
+                    continue
+                X_unlabeled = grid
+                df_unlab = None
+                colorful_print(f"Lazy candidate grid: {grid.describe()}", "yellow")
+                break
             df_unlab = load_csv(raw)
             if df_unlab is None:
                 colorful_print("Failed to load unlabeled CSV. Try again.", "red")
@@ -210,6 +258,17 @@ Symmetry operations: {len(cif_data['symmetry_ops'])} operations
     if df is not None:
         base_simulation_parameters = ""  # No detailed simulation parameters are requested here.
         
+        # RASPA needs enough unit cells for the minimum-image convention at the force-field cutoff.
+        if simulation_type.lower() in ["raspa", "gcmc", "montecarlo"]:
+            framework_cif = click.prompt(click.style("Enter framework CIF to size UnitCells for a 12 Å cutoff (press Enter to skip):", fg="bright_magenta"), default="", show_default=False).strip()
+            framework = load_cif(framework_cif) if framework_cif else None
+            if framework is not None and len(framework['cell_params']) == 6:
+                unit_cells = raspa_unit_cells(framework['cell_params'], cutoff=12.0)
+                base_simulation_parameters += f"UnitCells {unit_cells} (minimum for a 12 Angstrom cutoff)\n"
+                colorful_print(f"UnitCells {unit_cells} for {framework['filename']}", "green")
+            elif framework_cif:
+                colorful_print("Could not read cell parameters from that CIF; UnitCells left to the script generator.", "yellow")
+        
         # Job system.
         job_system = click.prompt(click.style("Enter job system (UGE or Slurm) or 'chat', 'exit':", fg="bright_magenta"), default="UGE")
         if job_system.lower() in ["exit", "quit"]:
@@ -232,16 +291,23 @@ Symmetry operations: {len(cif_data['symmetry_ops'])} operations
         
         from .active_learning import active_learning_cycle
         colorful_print("\n=== Running Active Learning Cycle ===", "bright_green")
-        uncertain_point, sim_script, job_script = active_learning_cycle(
-            model=model,
-            model_type=model_type,
-            X_unlabeled=X_unlabeled,
-            simulation_type=simulation_type,
-            simulation_parameters=base_simulation_parameters,
-            job_system=job_system,
-            job_params=job_params,
-            folder=output_folder
-        )
+        try:
+            uncertain_point, sim_script, job_script = active_learning_cycle(
+                model=model,
+                model_type=model_type,
+                X_unlabeled=X_unlabeled,
+                simulation_type=simulation_type,
+                simulation_parameters=base_simulation_parameters,
+                job_system=job_system,
+                job_params=job_params,
+                folder=output_folder,
+                labeled_index=FeatureIndex(X) if X_unlabeled.shape[1] == X.shape[1] else None,
+                templates=TemplateStore(DEFAULT_TEMPLATE_FOLDER)
+            )
+        except PoolExhausted:
+            colorful_print("All candidates are already labelled; nothing left to simulate. "
+                           "Add new candidate points or widen the candidate grid.", "yellow")
+            return
     else:
         # For CIF files, generate GULP files directly
         folder_prompt = click.prompt(click.style("Enter folder name to save generated scripts (default: 'responses'):", fg="bright_magenta"), default="", show_default=False)
@@ -252,7 +318,13 @@ Symmetry operations: {len(cif_data['symmetry_ops'])} operations
         
         # Generate GULP input file using proper generator
         from .gulp_generator import generate_gulp_input_from_cif, generate_job_script
-        gulp_file_path = generate_gulp_input_from_cif(cif_file_path, output_folder)
+        cutoff_raw = click.prompt(click.style("Enter a cutoff in Å to expand to the minimum supercell (press Enter to keep the CIF cell):", fg="bright_magenta"), default="", show_default=False).strip()
+        try:
+            cutoff = float(cutoff_raw) if cutoff_raw else None
+        except ValueError:
+            colorful_print("Invalid cutoff; keeping the CIF cell.", "yellow")
+            cutoff = None
+        gulp_file_path = generate_gulp_input_from_cif(cif_file_path, output_folder, cutoff=cutoff)
         
         # Generate job script
         file_name = cif_data['filename']
@@ -267,16 +339,82 @@ Symmetry operations: {len(cif_data['symmetry_ops'])} operations
         colorful_print(f"Chosen uncertain point: {uncertain_point}", "white")
         colorful_print(f"Simulation script saved as: {sim_script}", "white")
         colorful_print(f"Job script saved as: {job_script}", "white")
-        colorful_print("\nSubmit the job externally and retrieve the new results when ready.", "yellow")
+        run_generated_job(os.path.join(output_folder or DEFAULT_RESPONSES_FOLDER, job_script), job_system)
     else:
         colorful_print("\n=== GULP Files Generated ===", "bright_yellow", bold=True)
         colorful_print(f"GULP input file saved as: {sim_script}", "white")
         colorful_print(f"Job script saved as: {job_script}", "white")
         colorful_print("\nDownload both files and submit the job on your HPC cluster.", "yellow")
         colorful_print("The job will calculate the lattice energy of your zeolite structure.", "cyan")
+        run_generated_job(os.path.join(output_folder, job_script), "Slurm")
     
     colorful_print("Thank you for using osairo! Goodbye!\n", "bright_cyan", bold=True)
 
+def run_job_locally(job_script_path):
+    """
+    Run a generated job script with the local executor, wait for it and
+    harvest its outputs.
+    """
+    from .local_executor import LocalExecutor, COMPLETED
+    folder = os.path.dirname(job_script_path) or "."
+    executor = LocalExecutor(state_file=os.path.join(folder, "local_jobs.json"))
+    job_id = executor.submit(job_script_path)
+    colorful_print(f"Running local job {job_id} ({os.path.basename(job_script_path)})...", "yellow")
+    status = executor.wait([job_id])[job_id]
+    executor.shutdown()
+    colorful_print(f"Local job {job_id} finished: {status}", "green" if status == COMPLETED else "red")
+    if status == COMPLETED:
+        for row in executor.harvest(state_file=os.path.join(folder, "harvest_state.json")):
+            colorful_print(f"  {row}", "white")
+
+def submit_job(job_script_path, job_system):
+    """
+    Submit a generated job script with sbatch/qsub and optionally wait for it
+    (batched, backed-off status polling) and harvest its outputs.
+    """
+    from .scheduler import SchedulerClient, FINISHED
+    from .local_executor import COMPLETED
+    folder = os.path.dirname(job_script_path) or "."
+    client = SchedulerClient("slurm" if job_system.lower() == "slurm" else "uge",
+                             state_file=os.path.join(folder, "scheduler_jobs.json"))
+    try:
+        job_id = client.submit(job_script_path)
+    except (RuntimeError, OSError) as e:
+        colorful_print(f"Submission failed: {e}", "red")
+        return
+    colorful_print(f"Submitted job {job_id}; tracked in {client.state_file}", "green")
+    if not click.confirm(click.style("Wait for the job and harvest its results?", fg="bright_magenta"), default=False):
+        return
+    status = client.wait([job_id], on_change=lambda s: colorful_print(f"Job {job_id}: {s[job_id]}", "white"))[job_id]
+    if status in (COMPLETED, FINISHED):
+        for row in client.harvest(state_file=os.path.join(folder, "harvest_state.json")):
+            colorful_print(f"  {row}", "white")
+
+def run_generated_job(job_script_path, job_system):
+    choice = click.prompt(click.style("Run the job now? ('submit' via sbatch/qsub, 'local' on this workstation, Enter to skip)", fg="bright_magenta"),
+                          default="", show_default=False).strip().lower()
+    if choice == "submit":
+        submit_job(job_script_path, job_system)
+    elif choice == "local":
+        run_job_locally(job_script_path)
+
+@click.command()
+@click.option("--profile", is_flag=True, help="Print a per-stage timing breakdown on exit.")
+@click.option("--profile-output", default=None,
+              help="Export profiling spans to this file (.json, or .otlp.json for OpenTelemetry).")
+def run_cli(profile, profile_output):
+    profiling = profile or bool(profile_output)
+    if profiling:
+        enable_profiling()
+    try:
+        interactive_session()
+    finally:
+        if profiling:
+            print_report()
+            if profile_output:
+                export(profile_output)
+                colorful_print(f"Profile exported to {profile_output}", "white")
+
 def main():
     run_cli()
 
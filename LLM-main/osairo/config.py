@@ -1,4 +1,5 @@
 import os
+from contextlib import contextmanager
 
 # Optionally read the OpenAI API key from an environment variable
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
@@ -6,4 +7,50 @@ OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 # Default folder for responses
 DEFAULT_RESPONSES_FOLDER = "responses"
 
+# Folder for saved models, keyed by a hash of training data and model config
+DEFAULT_MODEL_CACHE = "model_cache"
+
+# Folder for simulation-input templates captured from LLM-generated scripts
+DEFAULT_TEMPLATE_FOLDER = "templates"
+
+# Extra directories (os.pathsep-separated) searched for force-field JSON files
+FORCEFIELD_PATH = os.environ.get("OSAIRO_FORCEFIELD_PATH", "")
+
+# Folder for a persistent cache of parsed CIF structures, in the XDG cache
+# directory by default; OSAIRO_STRUCTURE_CACHE overrides it ("" or "off" disables it)
+STRUCTURE_CACHE = os.environ.get(
+    "OSAIRO_STRUCTURE_CACHE",
+    os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache"), "osairo", "structures"))
+if STRUCTURE_CACHE.strip().lower() in ("", "off"):
+    STRUCTURE_CACHE = ""
+
+# Number of candidate rows transformed and scored at once
+SCORING_CHUNK_SIZE = 100000
+
+# Thread-count variables pinned in worker processes
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                   "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS")
+
+@contextmanager
+def worker_threads(threads):
+    """
+    Pin BLAS/TensorFlow to `threads` threads in the worker processes started
+    inside the block. The variables are set in this process, whose numpy is
+    already loaded, so that spawned workers inherit them before their own
+    imports; the previous values are restored on exit. Keep the process pool
+    inside the block, since workers may be started lazily.
+    """
+    saved = {var: os.environ.get(var) for var in THREAD_ENV_VARS + ("TF_CPP_MIN_LOG_LEVEL",)}
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
 # Add more global configuration parameters as needed...
@@ -0,0 +1,132 @@
+import json
+import numpy as np
+from .model_manager import predict_mean_variance, combine_target_variances
+
+class ConvergenceMonitor:
+    """
+    Track surrogate convergence across active-learning cycles and decide when
+    to stop spending simulation time.
+    Metrics recorded per cycle:
+      - max_variance / mean_variance: predictive variance over the pool
+        (summed over targets), GP models only.
+      - prediction_change: largest change of the held-out predictions since the
+        previous cycle, relative to their range.
+      - weighted_error: precision-weighted MAE on a labelled held-out set
+        (errors where the model claims to be confident count more).
+    The campaign has converged once every configured threshold (None = not
+    used) has been met for `patience` consecutive cycles. update() raises
+    ValueError if a configured threshold cannot be computed from its inputs
+    (e.g. the default prediction_change_tol without a held-out set).
+    """
+
+    def __init__(self, max_variance_tol=None, mean_variance_tol=None, prediction_change_tol=0.01,
+                 weighted_error_tol=None, patience=2, min_cycles=1):
+        self.max_variance_tol = max_variance_tol
+        self.mean_variance_tol = mean_variance_tol
+        self.prediction_change_tol = prediction_change_tol
+        self.weighted_error_tol = weighted_error_tol
+        self.patience = patience
+        self.min_cycles = min_cycles
+        self.history = []
+        self._previous_holdout_mean = None
+
+    def _thresholds(self):
+        return {
+            "max_variance": self.max_variance_tol,
+            "mean_variance": self.mean_variance_tol,
+            "prediction_change": self.prediction_change_tol,
+            "weighted_error": self.weighted_error_tol,
+        }
+
+    def update(self, model, model_type, X_pool, X_holdout=None, y_holdout=None):
+        """
+        Evaluate the current model and record one cycle of metrics.
+        Returns the metrics dict (including 'converged').
+        """
+        self._check_evaluable(model_type, X_pool, X_holdout, y_holdout)
+        metrics = {"cycle": len(self.history) + 1}
+        if model_type == 'gp' and X_pool is not None and len(X_pool):
+            _, variance = predict_mean_variance(model, X_pool, model_type)
+            score = combine_target_variances(variance)
+            metrics["max_variance"] = float(score.max())
+            metrics["mean_variance"] = float(score.mean())
+        if X_holdout is not None and len(X_holdout):
+            mean, variance = predict_mean_variance(model, X_holdout, model_type)
+            mean = np.asarray(mean, dtype=float)
+            if self._previous_holdout_mean is not None:
+                scale = np.ptp(self._previous_holdout_mean) or 1.0
+                metrics["prediction_change"] = float(np.max(np.abs(mean - self._previous_holdout_mean)) / scale)
+            self._previous_holdout_mean = mean
+            if y_holdout is not None:
+                error = np.abs(mean - np.asarray(y_holdout, dtype=float).reshape(mean.shape))
+                if variance is not None:
+                    weights = 1.0 / np.maximum(np.asarray(variance, dtype=float), 1e-12)
+                    metrics["weighted_error"] = float(np.sum(weights * error) / np.sum(weights))
+                else:
+                    metrics["weighted_error"] = float(error.mean())
+        metrics["criteria_met"] = self._criteria_met(metrics)
+        self.history.append(metrics)
+        metrics["converged"] = self.converged
+        return metrics
+
+    def _check_evaluable(self, model_type, X_pool, X_holdout, y_holdout):
+        """
+        Raise if a configured threshold can never be evaluated with these
+        inputs; the campaign could otherwise never converge.
+        """
+        has_pool = model_type == 'gp' and X_pool is not None and len(X_pool) > 0
+        has_holdout = X_holdout is not None and len(X_holdout) > 0
+        available = {
+            "max_variance": has_pool,
+            "mean_variance": has_pool,
+            "prediction_change": has_holdout,
+            "weighted_error": has_holdout and y_holdout is not None,
+        }
+        missing = [name for name, tol in self._thresholds().items() if tol is not None and not available[name]]
+        if missing:
+            raise ValueError(
+                f"Convergence metrics {missing} cannot be computed: max/mean_variance need a GP model and "
+                f"a candidate pool, prediction_change needs X_holdout, weighted_error needs X_holdout and "
+                f"y_holdout. Pass those or set the tolerance to None (e.g. "
+                f"ConvergenceMonitor(prediction_change_tol=None, max_variance_tol=...)).")
+
+    def _criteria_met(self, metrics):
+        active = {name: tol for name, tol in self._thresholds().items() if tol is not None}
+        if not active:
+            return False
+        for name, tol in active.items():
+            # A metric that could not be computed this cycle does not count as met.
+            if name not in metrics or metrics[name] > tol:
+                return False
+        return True
+
+    @property
+    def converged(self):
+        if len(self.history) < max(self.min_cycles, self.patience):
+            return False
+        return all(entry["criteria_met"] for entry in self.history[-self.patience:])
+
+    def should_stop(self):
+        return self.converged
+
+    def print_status(self):
+        if not self.history:
+            print("No convergence data recorded.")
+            return
+        last = self.history[-1]
+        parts = [f"cycle {last['cycle']}"]
+        for name, tol in self._thresholds().items():
+            if name in last:
+                target = f" (tol {tol:g})" if tol is not None else ""
+                parts.append(f"{name}={last[name]:.4g}{target}")
+        parts.append("CONVERGED" if self.converged else "not converged")
+        print(" | ".join(parts))
+
+    def save(self, path):
+        """
+        Write thresholds and per-cycle history as JSON.
+        """
+        with open(path, "w") as f:
+            json.dump({"thresholds": self._thresholds(), "patience": self.patience,
+                       "history": self.history}, f, indent=2)
+        return path
@@ -1,4 +1,4 @@
-import pandas as pd
+import numpy as np
 import re
 
 def load_csv(filepath: str):
@@ -6,6 +6,7 @@ def load_csv(filepath: str):
     Load a CSV file and return a DataFrame.
     If loading fails, print an error and return None.
     """
+    import pandas as pd
     try:
         df = pd.read_csv(filepath)
         print("CSV loaded successfully.")
@@ -15,60 +16,101 @@ def load_csv(filepath: str):
         print(f"Error loading CSV: {e}")
         return None
 
-def load_cif(filepath: str):
+def sample_candidate_pool(X, n_samples=1000, seed=0):
+    """
+    Build a default unlabeled pool by sampling uniformly inside the range of
+    the training inputs. Positive columns spanning at least two decades
+    (e.g., pressure) are sampled log-uniformly, the same columns the
+    FeaturePipeline log-scales.
+    """
+    from .preprocessing import log_scale_columns
+    X = np.asarray(X, dtype=float)
+    rng = np.random.default_rng(seed)
+    low, high = X.min(axis=0), X.max(axis=0)
+    u = rng.random((n_samples, X.shape[1]))
+    log_cols = log_scale_columns(X)
+    pool = low + u * (high - low)
+    if log_cols.any():
+        log_low, log_high = np.log10(low[log_cols]), np.log10(high[log_cols])
+        pool[:, log_cols] = 10.0 ** (log_low + u[:, log_cols] * (log_high - log_low))
+    return pool
+
+def _parse_cif(content):
+    """
+    Regex CIF parser behind load_cif, returning the arrays stored in the
+    structure cache (cell parameters and symmetry operations go in meta).
+    """
+    # Extract cell parameters
+    cell_params = {}
+    cell_patterns = {
+        'a': r'_cell_length_a\s+([\d.]+)',
+        'b': r'_cell_length_b\s+([\d.]+)',
+        'c': r'_cell_length_c\s+([\d.]+)',
+        'alpha': r'_cell_angle_alpha\s+([\d.]+)',
+        'beta': r'_cell_angle_beta\s+([\d.]+)',
+        'gamma': r'_cell_angle_gamma\s+([\d.]+)'
+    }
+    
+    for param, pattern in cell_patterns.items():
+        match = re.search(pattern, content)
+        if match:
+            cell_params[param] = float(match.group(1))
+    
+    # Extract atomic coordinates
+    labels, species, frac_coords = [], [], []
+    coord_section = re.search(r'loop_\s*_atom_site_label.*?(?=\n\n|\Z)', content, re.DOTALL)
+    if coord_section:
+        lines = coord_section.group(0).split('\n')
+        for line in lines:
+            if line.strip() and not line.startswith('_') and not line.startswith('loop_'):
+                parts = line.split()
+                if len(parts) >= 4:
+                    labels.append(parts[0])
+                    species.append(parts[1])
+                    frac_coords.append((float(parts[2]), float(parts[3]), float(parts[4])))
+    
+    # Extract symmetry operations
+    symmetry_ops = []
+    sym_section = re.search(r'loop_\s*_symmetry_equiv_pos_as_xyz.*?(?=\n\n|\Z)', content, re.DOTALL)
+    if sym_section:
+        lines = sym_section.group(0).split('\n')
+        for line in lines:
+            if line.strip() and not line.startswith('_') and not line.startswith('loop_'):
+                symmetry_ops.append(line.strip().strip("'"))
+    
+    if len(cell_params) == 6:
+        from .supercell import lattice_matrix
+        lattice = lattice_matrix(*(cell_params[k] for k in ('a', 'b', 'c', 'alpha', 'beta', 'gamma')))
+    else:
+        lattice = np.zeros((3, 3))
+    return {
+        'lattice': lattice,
+        'frac_coords': np.array(frac_coords, dtype=float).reshape(-1, 3),
+        'species': species,
+        'labels': labels,
+        'meta': {'cell_params': cell_params, 'symmetry_ops': symmetry_ops},
+    }
+
+def load_cif(filepath: str, cache=None):
     """
     Load a CIF file and extract cell parameters and atomic coordinates.
+    Parsed files are kept in the structure cache (see osairo.structure_cache;
+    cache=False skips it), so repeated screening runs do not parse again; if
+    the cache is unusable the file is parsed directly.
     """
+    from .structure_cache import load_parsed
     try:
-        with open(filepath, 'r') as f:
-            content = f.read()
-        
-        # Extract cell parameters
-        cell_params = {}
-        cell_patterns = {
-            'a': r'_cell_length_a\s+([\d.]+)',
-            'b': r'_cell_length_b\s+([\d.]+)',
-            'c': r'_cell_length_c\s+([\d.]+)',
-            'alpha': r'_cell_angle_alpha\s+([\d.]+)',
-            'beta': r'_cell_angle_beta\s+([\d.]+)',
-            'gamma': r'_cell_angle_gamma\s+([\d.]+)'
-        }
-        
-        for param, pattern in cell_patterns.items():
-            match = re.search(pattern, content)
-            if match:
-                cell_params[param] = float(match.group(1))
-        
-        # Extract atomic coordinates
-        atoms = []
-        coord_section = re.search(r'loop_\s*_atom_site_label.*?(?=\n\n|\Z)', content, re.DOTALL)
-        if coord_section:
-            lines = coord_section.group(0).split('\n')
-            for line in lines:
-                if line.strip() and not line.startswith('_') and not line.startswith('loop_'):
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        atoms.append({
-                            'label': parts[0],
-                            'element': parts[1],
-                            'x': float(parts[2]),
-                            'y': float(parts[3]),
-                            'z': float(parts[4])
-                        })
-        
-        # Extract symmetry operations
-        symmetry_ops = []
-        sym_section = re.search(r'loop_\s*_symmetry_equiv_pos_as_xyz.*?(?=\n\n|\Z)', content, re.DOTALL)
-        if sym_section:
-            lines = sym_section.group(0).split('\n')
-            for line in lines:
-                if line.strip() and not line.startswith('_') and not line.startswith('loop_'):
-                    symmetry_ops.append(line.strip().strip("'"))
-        
+        structure = load_parsed(filepath, 'cif', _parse_cif, cache)
+        labels, species, frac = structure.labels, structure.species, structure.frac_coords
+        meta = structure.meta
+        atoms = [
+            {'label': str(label), 'element': str(element), 'x': float(x), 'y': float(y), 'z': float(z)}
+            for label, element, (x, y, z) in zip(labels, species, frac.tolist())
+        ]
         return {
-            'cell_params': cell_params,
+            'cell_params': dict(meta['cell_params']),
             'atoms': atoms,
-            'symmetry_ops': symmetry_ops,
+            'symmetry_ops': list(meta['symmetry_ops']),
             'filename': filepath.split('/')[-1].replace('.cif', '')
         }
     except Exception as e:
@@ -0,0 +1,76 @@
+import numpy as np
+
+class FeatureIndex:
+    """
+    Membership index over quantized feature vectors.
+    Each row is rounded to a fixed number of significant digits and encoded as
+    an exact integer key (mantissa, exponent per feature); keys are kept in a
+    sorted array so whole candidate pools are checked in one vectorized
+    searchsorted pass.
+    """
+
+    def __init__(self, X=None, significant_digits=8):
+        self.significant_digits = significant_digits
+        self._keys = None
+        self._width = None
+        if X is not None and len(X):
+            self.add(X)
+
+    def __len__(self):
+        return 0 if self._keys is None else len(self._keys)
+
+    def _encode(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        abs_x = np.abs(X)
+        exponent = np.zeros(X.shape, dtype=np.int64)
+        nonzero = abs_x > 0
+        exponent[nonzero] = np.floor(np.log10(abs_x[nonzero])).astype(np.int64)
+        mantissa = np.rint(X * 10.0 ** (self.significant_digits - 1 - exponent)).astype(np.int64)
+        # Rounding can carry into the next decade (e.g., 9.99999999 -> 10.0000000).
+        carry = np.abs(mantissa) >= 10 ** self.significant_digits
+        mantissa[carry] //= 10
+        exponent[carry] += 1
+        keys = np.empty((X.shape[0], 2 * X.shape[1]), dtype=np.int64)
+        keys[:, 0::2] = mantissa
+        keys[:, 1::2] = exponent
+        width = keys.shape[1] * keys.itemsize
+        if self._width is None:
+            self._width = width
+        elif width != self._width:
+            raise ValueError("Feature dimension does not match the index.")
+        return np.ascontiguousarray(keys).view(np.dtype((np.void, width))).ravel()
+
+    def add(self, X):
+        """
+        Add feature rows (e.g., training points or newly selected candidates).
+        """
+        keys = self._encode(X)
+        if self._keys is not None:
+            keys = np.concatenate([self._keys, keys])
+        self._keys = np.unique(keys)
+
+    def contains(self, X):
+        """
+        Return a boolean array: True where a row is already in the index.
+        """
+        keys = self._encode(X)
+        if self._keys is None:
+            return np.zeros(len(keys), dtype=bool)
+        pos = np.searchsorted(self._keys, keys)
+        pos[pos == len(self._keys)] = 0
+        return self._keys[pos] == keys
+
+    def candidate_mask(self, X, drop_duplicates=True):
+        """
+        Return a boolean mask of rows worth scoring: rows not already in the
+        index and, if drop_duplicates, only the first copy of repeated rows.
+        """
+        mask = ~self.contains(X)
+        if drop_duplicates:
+            _, first = np.unique(self._encode(X), return_index=True)
+            unique = np.zeros(len(mask), dtype=bool)
+            unique[first] = True
+            mask &= unique
+        return mask
@@ -0,0 +1,111 @@
+import os
+import json
+import glob
+from .config import FORCEFIELD_PATH
+
+BUILTIN_FORCEFIELD_DIR = os.path.join(os.path.dirname(__file__), "forcefield_data")
+DEFAULT_FORCEFIELD = "zeolite_shell"
+
+# name -> ForceField, filled on first lookup
+_REGISTRY = {}
+
+def _format_params(params):
+    return " ".join(str(p) for p in params)
+
+class ForceField:
+    """
+    Species (label, element, core/shel, charge) and potential terms (GULP
+    keyword, species pair/triple, parameters) loaded from a JSON file.
+    Only the species and terms whose elements are all present in a structure
+    are emitted; the result is cached per composition, so bulk generation
+    over many frameworks builds each block once.
+    """
+
+    def __init__(self, name, species, terms, description=""):
+        self.name = name
+        self.description = description
+        self.species = list(species)
+        self.terms = list(terms)
+        self._element_of = {(s["label"], s["type"]): s["element"] for s in self.species}
+        self._blocks = {}
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        name = data.get("name") or os.path.splitext(os.path.basename(path))[0]
+        return cls(name, data["species"], data.get("terms", []), data.get("description", ""))
+
+    @property
+    def elements(self):
+        return sorted({s["element"] for s in self.species})
+
+    def _term_elements(self, term):
+        elements = set()
+        for entry in term["species"]:
+            label, kind = entry.split()
+            elements.add(self._element_of.get((label, kind[:4]), label))
+        return elements
+
+    def species_for(self, elements):
+        """
+        Species entries (in file order) for the given elements.
+        """
+        elements = set(elements)
+        return [s for s in self.species if s["element"] in elements]
+
+    def gulp_lines(self, elements=None):
+        """
+        'species' block and potential terms for the elements present, as
+        GULP input lines (each term under its own keyword line).
+        """
+        key = frozenset(elements) if elements is not None else frozenset(self.elements)
+        if key not in self._blocks:
+            lines = ["species"]
+            lines += [f"{s['label']} {s['type']} {s['charge']:.5f}" for s in self.species_for(key)]
+            for term in self.terms:
+                if self._term_elements(term) <= key:
+                    lines.append(term["kind"])
+                    lines.append(f"{' '.join(term['species'])} {_format_params(term['params'])}")
+            self._blocks[key] = lines
+        return list(self._blocks[key])
+
+    def missing_elements(self, elements):
+        return sorted(set(elements) - set(self.elements))
+
+def _search_dirs():
+    dirs = [d for d in FORCEFIELD_PATH.split(os.pathsep) if d]
+    return dirs + [BUILTIN_FORCEFIELD_DIR]
+
+def list_forcefields():
+    """
+    Names of the force fields found in FORCEFIELD_PATH and the built-in library.
+    """
+    names = set(_REGISTRY)
+    for directory in _search_dirs():
+        names.update(os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(directory, "*.json")))
+    return sorted(names)
+
+def register_forcefield(forcefield):
+    _REGISTRY[forcefield.name] = forcefield
+    return forcefield
+
+def get_forcefield(name=DEFAULT_FORCEFIELD):
+    """
+    Return a force field by name (or path to a JSON file), loading it once;
+    user directories in OSAIRO_FORCEFIELD_PATH take precedence over the
+    built-in library.
+    """
+    if name in _REGISTRY:
+        return _REGISTRY[name]
+    if name.endswith(".json") and os.path.exists(name):
+        forcefield = ForceField.from_file(name)
+        _REGISTRY[name] = forcefield
+        return forcefield
+    for directory in _search_dirs():
+        path = os.path.join(directory, f"{name}.json")
+        if os.path.exists(path):
+            forcefield = ForceField.from_file(path)
+            _REGISTRY[name] = forcefield
+            return forcefield
+    raise ValueError(f"Unknown force field '{name}'. Available: {list_forcefields()}.")
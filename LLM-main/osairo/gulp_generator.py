@@ -1,13 +1,16 @@
 import os
-from pymatgen.core.structure import Structure
+import numpy as np
 
-def generate_gulp_input_from_cif(cif_file_path, output_directory=None):
+def generate_gulp_input_from_cif(cif_file_path, output_directory=None, cutoff=None, forcefield="zeolite_shell"):
     """
     Generate GULP input file from CIF file following the exact template.
     
     Args:
         cif_file_path: Path to the CIF file
         output_directory: Directory to save the .gin file (default: same as CIF)
+        cutoff: If given (Å), write the smallest supercell whose perpendicular
+            widths are at least 2 * cutoff instead of the CIF unit cell
+        forcefield: Name or JSON path of the force field (see osairo.forcefields)
     """
     # Extract the base file name (without extension) to use for output files
     file_name = os.path.splitext(os.path.basename(cif_file_path))[0]
@@ -16,68 +19,56 @@ def generate_gulp_input_from_cif(cif_file_path, output_directory=None):
     if output_directory is None:
         output_directory = os.path.dirname(cif_file_path)
     
-    # Read the structure from the CIF file
-    structure = Structure.from_file(cif_file_path)
+    # Read the structure from the CIF file; pymatgen only parses files missing
+    # from the structure cache
+    from .structure_cache import load_structure
+    structure = load_structure(cif_file_path)
     
-    # Define species and potentials for the GULP input
-    species = [
-        'species',
-        'Si core 4.0000',
-        'Al core 3.0000',
-        'Na core 1.0000',
-        'O2 core 0.86902',
-        'O2 shel -2.86902',
-    ]
+    # Species and potential terms come from the force-field library, restricted
+    # to the elements present in this structure
+    from .forcefields import get_forcefield
+    ff = get_forcefield(forcefield)
+    symbols = structure.species
+    present = set(symbols.tolist())
+    missing = ff.missing_elements(present)
+    if missing:
+        print(f"WARNING: force field '{ff.name}' has no parameters for {missing}; those atoms are omitted")
     
-    potentials = [
-        'buck',
-        'O2 shel O2 shel 22764.000 0.14900 27.87900 0.0 12.0',
-        'buck',
-        'Si core O2 shel 1283.907 0.32052 10.66158 0.0 10.0',
-        'buck',
-        'Al core O2 shel 1460.300 0.29912 0.00000 0.0 10.0',
-        'buck',
-        'Na core O2 shel 1226.840 0.30650 0.00000 0.0 10.0',
-        'buck',
-        'Na core Na core 7895.400 0.17090 0.00000 0.0 10.0',
-        'three',
-        'Si core O2 shel O2 shel 2.09724 109.47 1.9 1.9 3.5',
-        'three',
-        'Al core O2 shel O2 shel 2.09724 109.47 1.9 1.9 3.5',
-        'spring',
-        'O2 shel 74.92',
-    ]
+    # Expand to the minimum supercell for the potential cutoff if requested
+    from .supercell import build_supercell, minimum_supercell
+    matrix = structure.lattice
+    frac = structure.frac_coords
+    repeats = minimum_supercell(matrix, cutoff) if cutoff else np.ones(3, dtype=int)
+    if repeats.prod() > 1:
+        matrix, frac, symbols = build_supercell(matrix, frac, symbols, repeats)
+        print(f'Using a {repeats[0]}x{repeats[1]}x{repeats[2]} supercell for a {cutoff} Å cutoff')
+    cell = structure.cell_params
+    a, b, c = np.array([cell['a'], cell['b'], cell['c']]) * repeats
     
     # Build the GULP input file content
     gulp_input_str = 'opti conp\n'
     gulp_input_str += 'cell\n'
-    gulp_input_str += f'{structure.lattice.a} {structure.lattice.b} {structure.lattice.c} '
-    gulp_input_str += f'{structure.lattice.alpha} {structure.lattice.beta} {structure.lattice.gamma}\n'
+    gulp_input_str += f'{a} {b} {c} '
+    gulp_input_str += f"{cell['alpha']} {cell['beta']} {cell['gamma']}\n"
     gulp_input_str += 'frac\n'
     
-    # Add fractional coordinates for core atoms (Si, Al, Na)
-    for site in structure:
-        if site.specie.symbol in ['Si', 'Al', 'Na']:
-            frac_coords = [f'{coord:.6f}' for coord in site.frac_coords]
-            gulp_input_str += f'{site.specie.symbol} core {frac_coords[0]} {frac_coords[1]} {frac_coords[2]}\n'
-    
-    # Add fractional coordinates for oxygen atoms (core and shell)
-    for site in structure:
-        if site.specie.symbol == 'O':
-            frac_coords = [f'{coord:.6f}' for coord in site.frac_coords]
-            gulp_input_str += f'{site.specie.symbol}2 core {frac_coords[0]} {frac_coords[1]} {frac_coords[2]}\n'
-    for site in structure:
-        if site.specie.symbol == 'O':
-            frac_coords = [f'{coord:.6f}' for coord in site.frac_coords]
-            gulp_input_str += f'{site.specie.symbol}2 shel {frac_coords[0]} {frac_coords[1]} {frac_coords[2]}\n'
+    # Add fractional coordinates in force-field species order (cores, then O cores, then O shells)
+    for entry in ff.species_for(present):
+        mask = symbols == entry['element']
+        gulp_input_str += ''.join(f"{entry['label']} {entry['type']} {x:.6f} {y:.6f} {z:.6f}\n"
+                                  for x, y, z in frac[mask])
     
     # Append species and potentials information
-    gulp_input_str += '\n'.join(species) + '\n'
-    gulp_input_str += '\n'.join(potentials) + '\n'
+    gulp_input_str += '\n'.join(ff.gulp_lines(present)) + '\n'
     
     # Specify the output dump file
     gulp_input_str += f'dump {file_name}.gout\n'
     
+    # Check the input offline before it is queued
+    from .script_validation import validate_script
+    for issue in validate_script("gulp", gulp_input_str):
+        print(f"WARNING: {issue}")
+    
     # Save the GULP input file in the output directory
     gulp_input_file_path = os.path.join(output_directory, f'{file_name}.gin')
     os.makedirs(output_directory, exist_ok=True)  # Ensure directory exists
@@ -1,11 +1,12 @@
-from langchain_openai import ChatOpenAI
 from .config import OPENAI_API_KEY
+from .profiling import invoke_llm
 
 def generate_job_script(job_system, simulation_script_filename, job_params=None):
     """
     Generate an HPC job submission script for UGE or Slurm using ChatOpenAI.
     The script is simple and ready for submission.
     """
+    from langchain_openai import ChatOpenAI
     chat = ChatOpenAI(api_key=OPENAI_API_KEY, temperature=0.7)
 
     job_params_str = job_params if job_params else ""
@@ -50,5 +51,5 @@ def generate_job_script(job_system, simulation_script_filename, job_params=None)
         {"role": "user", "content": user_message}
     ]
     
-    response = chat.invoke(messages)
+    response = invoke_llm(chat, messages, "job_script")
     return response.content
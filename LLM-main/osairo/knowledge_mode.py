@@ -1,7 +1,6 @@
 import sys
-from langchain_openai import ChatOpenAI
-from langchain.schema import SystemMessage, HumanMessage, AIMessage
 from .config import OPENAI_API_KEY
+from .profiling import invoke_llm
 
 def knowledge_chat_session():
     """
@@ -10,6 +9,8 @@ def knowledge_chat_session():
     - Type 'exit' or 'quit' to end chat mode.
     Designed for scientific Q&A.
     """
+    from langchain_openai import ChatOpenAI
+    from langchain.schema import SystemMessage, HumanMessage, AIMessage
     chat = ChatOpenAI(
         api_key=OPENAI_API_KEY,
         temperature=0.7
@@ -47,7 +48,7 @@ def knowledge_chat_session():
 
         messages.append(HumanMessage(content=user_input))
         try:
-            response = chat.invoke(messages)
+            response = invoke_llm(chat, messages, "chat")
         except Exception as e:
             print("Error during chat invocation:", e)
             continue
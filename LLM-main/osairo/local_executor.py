@@ -0,0 +1,331 @@
+import os
+import re
+import sys
+import json
+import time
+import signal
+import itertools
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+# Job states, named after the Slurm ones.
+PENDING, RUNNING, COMPLETED, FAILED, TIMEOUT, CANCELLED = (
+    "PENDING", "RUNNING", "COMPLETED", "FAILED", "TIMEOUT", "CANCELLED")
+FINAL_STATES = {COMPLETED, FAILED, TIMEOUT, CANCELLED}
+
+# Runs in the child before exec: applies the rlimits, then replaces itself with the job.
+_LIMIT_WRAPPER = (
+    "import os, sys, resource\n"
+    "mem, cpu = int(sys.argv[1]), int(sys.argv[2])\n"
+    "if mem > 0: resource.setrlimit(resource.RLIMIT_AS, (mem, mem))\n"
+    "if cpu > 0: resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu))\n"
+    "os.execvp(sys.argv[3], sys.argv[3:])\n"
+)
+
+_SIZE_UNITS = {"k": 1 / 1024, "m": 1, "g": 1024, "t": 1024 * 1024}
+
+def _memory_mb(text):
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)b?\s*$", text, re.IGNORECASE)
+    if not match:
+        return None
+    return float(match.group(1)) * _SIZE_UNITS[(match.group(2) or "m").lower()]
+
+def _seconds(text):
+    """
+    Slurm/UGE time limits: [days-]hh:mm:ss, mm:ss, or minutes (Slurm) / seconds (h_rt).
+    """
+    days = 0
+    if "-" in text:
+        day_part, text = text.split("-", 1)
+        days = int(day_part)
+    parts = [float(p) for p in text.split(":")]
+    if len(parts) == 3:
+        seconds = parts[0] * 3600 + parts[1] * 60 + parts[2]
+    elif len(parts) == 2:
+        seconds = parts[0] * 60 + parts[1]
+    else:
+        seconds = parts[0]
+    return days * 86400 + seconds
+
+def parse_job_resources(script_text):
+    """
+    Read the resource requests a local run should honour from #SBATCH / #$
+    directives: cpus, memory_mb (total), walltime_s, output and error paths.
+    """
+    resources = {}
+    mem_per_cpu = None
+    for line in script_text.splitlines():
+        line = line.strip()
+        if line.startswith("#SBATCH"):
+            for option, value in re.findall(r"(--?[\w-]+)(?:[= ]\s*([^-\s]\S*))?", line[len("#SBATCH"):]):
+                if option in ("-n", "--ntasks", "-c", "--cpus-per-task") and value:
+                    resources["cpus"] = max(resources.get("cpus", 1), int(value))
+                elif option in ("-t", "--time") and value:
+                    resources["walltime_s"] = _seconds(value) * (60 if value.isdigit() else 1)
+                elif option == "--mem" and value:
+                    resources["memory_mb"] = _memory_mb(value)
+                elif option == "--mem-per-cpu" and value:
+                    mem_per_cpu = _memory_mb(value)
+                elif option in ("-o", "--output") and value:
+                    resources["output"] = value
+                elif option in ("-e", "--error") and value:
+                    resources["error"] = value
+        elif line.startswith("#$"):
+            body = line[2:].strip()
+            match = re.match(r"-pe\s+\S+\s+(\d+)", body)
+            if match:
+                resources["cpus"] = int(match.group(1))
+            for key, value in re.findall(r"(h_rt|h_vmem|mem_free)=([^,\s]+)", body):
+                if key == "h_rt":
+                    resources["walltime_s"] = _seconds(value)
+                else:
+                    mem_per_cpu = _memory_mb(value)
+            match = re.match(r"-o\s+(\S+)", body)
+            if match:
+                resources["output"] = match.group(1)
+            match = re.match(r"-e\s+(\S+)", body)
+            if match:
+                resources["error"] = match.group(1)
+    if mem_per_cpu and "memory_mb" not in resources:
+        resources["memory_mb"] = mem_per_cpu * resources.get("cpus", 1)
+    return resources
+
+class LocalExecutor:
+    """
+    Workstation stand-in for UGE/Slurm: runs generated job scripts with bash
+    on a bounded pool, at most total_cpus CPUs busy at once, each job limited
+    to the CPUs, memory (RLIMIT_AS) and wall time its #SBATCH / #$ directives
+    request (capped by the max_* arguments). Array tasks get SLURM_ARRAY_TASK_ID
+    and SGE_TASK_ID. Status is tracked per job and, with state_file, persisted
+    as JSON after every change. A job that cannot be started (e.g. its output
+    directory does not exist) ends FAILED with the reason in job["failure"].
+    """
+
+    def __init__(self, total_cpus=None, max_memory_mb=None, max_walltime_s=None, state_file=None,
+                 enforce_memory=True):
+        self.total_cpus = total_cpus or os.cpu_count() or 1
+        self.max_memory_mb = max_memory_mb
+        self.max_walltime_s = max_walltime_s
+        self.state_file = state_file
+        self.enforce_memory = enforce_memory
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._cpus_free = threading.Condition(self._lock)
+        self._free = self.total_cpus
+        self._processes = {}
+        self._futures = {}
+        self._pool = ThreadPoolExecutor(max_workers=self.total_cpus)
+
+    def submit(self, script_path, cwd=None, env=None, array_task_id=None):
+        """
+        Queue a job script; returns its job id.
+        """
+        script_path = os.path.abspath(script_path)
+        with open(script_path) as f:
+            resources = parse_job_resources(f.read())
+        cpus = min(int(resources.get("cpus", 1)), self.total_cpus)
+        memory_mb = resources.get("memory_mb")
+        if self.max_memory_mb:
+            memory_mb = min(memory_mb or self.max_memory_mb, self.max_memory_mb)
+        walltime_s = resources.get("walltime_s")
+        if self.max_walltime_s:
+            walltime_s = min(walltime_s or self.max_walltime_s, self.max_walltime_s)
+        with self._lock:
+            job_id = str(next(self._ids))
+            self.jobs[job_id] = {
+                "job_id": job_id,
+                "script": script_path,
+                "cwd": os.path.abspath(cwd or os.path.dirname(script_path)),
+                "array_task_id": array_task_id,
+                "cpus": cpus,
+                "memory_mb": memory_mb,
+                "walltime_s": walltime_s,
+                "output": resources.get("output"),
+                "error": resources.get("error"),
+                "env": dict(env or {}),
+                "status": PENDING,
+                "returncode": None,
+                "failure": None,
+                "submitted": time.time(),
+                "started": None,
+                "finished": None,
+            }
+        self._save_state()
+        self._futures[job_id] = self._pool.submit(self._run, job_id)
+        return job_id
+
+    def submit_array(self, script_path, task_ids, cwd=None, env=None):
+        """
+        Queue one job per array task id (like sbatch --array / qsub -t).
+        """
+        return [self.submit(script_path, cwd, env, array_task_id=task_id) for task_id in task_ids]
+
+    def submit_manifest(self, manifest_path):
+        """
+        Queue the jobs listed in a manifest: a JSON list of {"script", "cwd"?,
+        "env"?, "array"?: [task ids]} objects, or a text file with one script
+        path per line. Relative paths are resolved against the manifest.
+        """
+        base = os.path.dirname(os.path.abspath(manifest_path))
+        with open(manifest_path) as f:
+            text = f.read()
+        if text.lstrip().startswith("["):
+            entries = json.loads(text)
+        else:
+            entries = [{"script": line.strip()} for line in text.splitlines()
+                       if line.strip() and not line.lstrip().startswith("#")]
+        job_ids = []
+        for entry in entries:
+            script = os.path.join(base, entry["script"])
+            cwd = os.path.join(base, entry["cwd"]) if entry.get("cwd") else None
+            if entry.get("array"):
+                job_ids += self.submit_array(script, entry["array"], cwd, entry.get("env"))
+            else:
+                job_ids.append(self.submit(script, cwd, entry.get("env")))
+        return job_ids
+
+    def _run(self, job_id):
+        job = self.jobs[job_id]
+        with self._cpus_free:
+            while self._free < job["cpus"] and job["status"] == PENDING:
+                self._cpus_free.wait()
+            if job["status"] != PENDING:
+                return job
+            self._free -= job["cpus"]
+            job["status"] = RUNNING
+            job["started"] = time.time()
+        self._save_state()
+        try:
+            self._execute(job)
+        except Exception as e:
+            # The job could not be started (e.g. its output directory is missing).
+            with self._lock:
+                job["failure"] = f"{type(e).__name__}: {e}"
+                if job["status"] != CANCELLED:
+                    job["status"] = FAILED
+        finally:
+            with self._cpus_free:
+                self._free += job["cpus"]
+                job["finished"] = time.time()
+                self._cpus_free.notify_all()
+            self._save_state()
+        return job
+
+    def _execute(self, job):
+        name = os.path.splitext(os.path.basename(job["script"]))[0]
+        suffix = f".{job['array_task_id']}" if job["array_task_id"] is not None else ""
+        env = dict(os.environ, **job["env"])
+        env.update({
+            "OMP_NUM_THREADS": str(job["cpus"]),
+            "SLURM_JOB_ID": job["job_id"], "JOB_ID": job["job_id"],
+            "SLURM_CPUS_PER_TASK": str(job["cpus"]), "NSLOTS": str(job["cpus"]),
+            "SLURM_SUBMIT_DIR": job["cwd"], "SGE_O_WORKDIR": job["cwd"],
+        })
+        if job["array_task_id"] is not None:
+            env["SLURM_ARRAY_TASK_ID"] = env["SGE_TASK_ID"] = str(job["array_task_id"])
+        memory = int(job["memory_mb"] * 1024 * 1024) if job["memory_mb"] and self.enforce_memory else 0
+        cpu_seconds = int(job["walltime_s"] * job["cpus"]) + 1 if job["walltime_s"] else 0
+        command = [sys.executable, "-c", _LIMIT_WRAPPER, str(memory), str(cpu_seconds), "bash", job["script"]]
+        stdout_path = os.path.join(job["cwd"], job["output"] or f"{name}{suffix}.o{job['job_id']}")
+        stderr_path = os.path.join(job["cwd"], job["error"] or f"{name}{suffix}.e{job['job_id']}")
+        with open(stdout_path, "w") as out, open(stderr_path, "w") as err:
+            process = subprocess.Popen(command, cwd=job["cwd"], env=env, stdout=out, stderr=err,
+                                       start_new_session=True)
+            with self._lock:
+                self._processes[job["job_id"]] = process
+                cancelled = job["status"] == CANCELLED
+            if cancelled:
+                # cancel() ran between the job starting and its process being registered.
+                self._kill(process, signal.SIGTERM)
+            try:
+                returncode = process.wait(timeout=job["walltime_s"])
+            except subprocess.TimeoutExpired:
+                self._kill(process, signal.SIGKILL)
+                process.wait()
+                with self._lock:
+                    if job["status"] != CANCELLED:
+                        job["status"] = TIMEOUT
+                return
+            finally:
+                with self._lock:
+                    self._processes.pop(job["job_id"], None)
+        with self._lock:
+            job["returncode"] = returncode
+            if job["status"] != CANCELLED:
+                job["status"] = COMPLETED if returncode == 0 else FAILED
+
+    @staticmethod
+    def _kill(process, sig):
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self.jobs[job_id]
+            if job["status"] in FINAL_STATES:
+                return job["status"]
+            job["status"] = CANCELLED
+            process = self._processes.get(job_id)
+            self._cpus_free.notify_all()
+        if process is not None:
+            self._kill(process, signal.SIGTERM)
+        self._save_state()
+        return CANCELLED
+
+    def status(self, job_id):
+        return self.jobs[job_id]["status"]
+
+    def statuses(self, job_ids=None):
+        job_ids = self.jobs if job_ids is None else job_ids
+        return {job_id: self.jobs[job_id]["status"] for job_id in job_ids}
+
+    def summary(self):
+        counts = {}
+        for job in self.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
+
+    def wait(self, job_ids=None, timeout=None):
+        """
+        Block until the jobs finish (or timeout seconds pass); returns their statuses.
+        """
+        job_ids = list(self.jobs) if job_ids is None else list(job_ids)
+        deadline = None if timeout is None else time.time() + timeout
+        for job_id in job_ids:
+            remaining = None if deadline is None else max(deadline - time.time(), 0)
+            try:
+                self._futures[job_id].result(timeout=remaining)
+            except FutureTimeoutError:
+                break
+        return self.statuses(job_ids)
+
+    def harvest(self, state_file=None, patterns=None, processes=None):
+        """
+        Parse the outputs of completed jobs with the result harvester.
+        """
+        from .result_harvester import harvest_results
+        directories = sorted({job["cwd"] for job in self.jobs.values() if job["status"] == COMPLETED})
+        if not directories:
+            return []
+        return harvest_results(directories, state_file=state_file, patterns=patterns, processes=processes)
+
+    def shutdown(self, cancel_pending=False):
+        if cancel_pending:
+            for job_id, job in list(self.jobs.items()):
+                if job["status"] == PENDING:
+                    self.cancel(job_id)
+        self._pool.shutdown(wait=True)
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        with self._lock:
+            snapshot = json.dumps(list(self.jobs.values()), indent=2)
+        tmp = f"{self.state_file}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(snapshot)
+        os.replace(tmp, self.state_file)
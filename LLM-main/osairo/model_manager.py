@@ -1,70 +1,261 @@
 import numpy as np
+from .profiling import span, traced
+from .config import SCORING_CHUNK_SIZE
+from .candidate_grid import CandidateGrid
 
-def train_gaussian_process(X_train, y_train):
+# GP kernels selectable by name (gpflow class names).
+GP_KERNELS = {
+    'matern52': 'Matern52',
+    'matern32': 'Matern32',
+    'rbf': 'SquaredExponential',
+    'rationalquadratic': 'RationalQuadratic',
+}
+
+class PoolExhausted(ValueError):
+    """
+    Raised when no unlabelled, unselected candidate is left to pick.
+    """
+
+def _fit_pipeline(pipeline, X_train, y_train):
+    """
+    Fit the normalization pipeline (if any) and return transformed (X, y).
+    """
+    if pipeline is None:
+        return X_train, y_train
+    pipeline.fit(X_train, y_train)
+    return pipeline.transform(X_train), pipeline.transform_targets(y_train)
+
+@traced("train.gp")
+def train_gaussian_process(X_train, y_train, pipeline=None, kernel='matern52'):
     """
     Train a Gaussian Process regression model using GPFlow.
     Lazy-import GPFlow to reduce overhead if not needed.
+    A multi-column y (several targets, e.g., adsorbates) is modelled as
+    independent outputs sharing one kernel, so a single Cholesky factorization
+    serves all targets.
+    kernel is one of GP_KERNELS ('matern52', 'matern32', 'rbf',
+    'rationalquadratic').
+    If a FeaturePipeline is given it is fitted on the training data, applied
+    before training and attached to the model as model.osairo_pipeline.
     """
     import gpflow
-    kernel = gpflow.kernels.Matern52()
-    model = gpflow.models.GPR(data=(X_train, y_train), kernel=kernel)
+    y_train = np.asarray(y_train, dtype=float)
+    if y_train.ndim == 1:
+        y_train = y_train.reshape(-1, 1)
+    X_train, y_train = _fit_pipeline(pipeline, X_train, y_train)
+    if kernel.lower() not in GP_KERNELS:
+        raise ValueError(f"Unknown kernel. Choose one of {sorted(GP_KERNELS)}.")
+    gp_kernel = getattr(gpflow.kernels, GP_KERNELS[kernel.lower()])()
+    model = gpflow.models.GPR(data=(X_train, y_train), kernel=gp_kernel)
     opt = gpflow.optimizers.Scipy()
     opt.minimize(model.training_loss, variables=model.trainable_variables)
+    model.osairo_pipeline = pipeline
     print("Gaussian Process model trained.")
     return model
 
-def train_neural_network(X_train, y_train, epochs=100):
+@traced("train.nn")
+def train_neural_network(X_train, y_train, epochs=100, pipeline=None, hidden_units=(64, 64)):
     """
     Train a simple feedforward neural network using TensorFlow/Keras.
     Lazy-import TensorFlow if needed.
+    hidden_units sets the width of each hidden ReLU layer.
+    If a FeaturePipeline is given it is fitted, applied before training and
+    attached to the model as model.osairo_pipeline.
     """
     import tensorflow as tf
-    model = tf.keras.Sequential([
-        tf.keras.layers.Dense(64, activation='relu', input_shape=(X_train.shape[1],)),
-        tf.keras.layers.Dense(64, activation='relu'),
-        tf.keras.layers.Dense(y_train.shape[1])
-    ])
+    X_train, y_train = _fit_pipeline(pipeline, X_train, y_train)
+    layers = [tf.keras.layers.Input(shape=(X_train.shape[1],))]
+    layers += [tf.keras.layers.Dense(units, activation='relu') for units in hidden_units]
+    layers.append(tf.keras.layers.Dense(y_train.shape[1]))
+    model = tf.keras.Sequential(layers)
     model.compile(optimizer='adam', loss='mse')
     model.fit(X_train, y_train, epochs=epochs, verbose=0)
+    model.osairo_pipeline = pipeline
     print("Neural network model trained.")
     return model
 
-def train_model(model_type: str, X_train, y_train):
+def fit_model(model_type: str, X_train, y_train, cache_dir=None, config=None, pipeline=None):
     """
-    Train a model based on model_type: 'gp' or 'nn', or load an existing model if desired.
+    Train a model based on model_type: 'gp' or 'nn'. Never prompts, so it can
+    be scripted, run in worker processes and benchmarked.
+    If cache_dir is given, a model previously trained on identical data and
+    config is loaded instead of retrained, and new models are saved there.
+    pipeline (a FeaturePipeline) normalizes inputs/targets and is stored with
+    the model.
+    Returns (model, stats) with stats holding model_type, n_train, n_features,
+    n_targets, cached, train_time_s, saved_path and, for GP models,
+    log_marginal_likelihood.
     """
+    import time
+    from .model_store import save_model, load_cached_model, cached_model_path
     model_type = model_type.lower().strip()
-    load_option = input("Do you want to load an existing model? (yes/no) [no]: ").strip().lower()
-    if load_option in ["yes", "y"]:
-        path = input("Enter the file path to load the model: ").strip()
-        try:
-            import pickle
-            with open(path, "rb") as f:
-                model = pickle.load(f)
-            print("Model loaded successfully.")
-            return model
-        except Exception as e:
-            print(f"Error loading model: {e}. Proceeding to train a new model.")
+    if model_type not in ['gp', 'nn']:
+        raise ValueError("Unknown model type. Choose 'gp' or 'nn'.")
+    y_shape = np.shape(y_train)
+    stats = {
+        "model_type": model_type,
+        "n_train": len(X_train),
+        "n_features": np.shape(X_train)[1] if len(np.shape(X_train)) > 1 else 1,
+        "n_targets": y_shape[1] if len(y_shape) > 1 else 1,
+        "cached": False,
+        "train_time_s": 0.0,
+        "saved_path": None,
+    }
+    key_config = dict(config or {})
+    if pipeline is not None:
+        key_config["pipeline"] = pipeline.config()
+    model = None
+    if cache_dir:
+        model = load_cached_model(cache_dir, model_type, X_train, y_train, key_config)
+        if model is not None:
+            print("Loaded cached model trained on identical data and config.")
+            stats["cached"] = True
+    if model is None:
+        start = time.perf_counter()
+        if model_type == 'gp':
+            model = train_gaussian_process(X_train, y_train, pipeline=pipeline, **(config or {}))
+        else:
+            model = train_neural_network(X_train, y_train, pipeline=pipeline, **(config or {}))
+        stats["train_time_s"] = time.perf_counter() - start
+        if cache_dir:
+            path = save_model(model, model_type, cached_model_path(cache_dir, model_type, X_train, y_train, key_config))
+            stats["saved_path"] = path
+            print(f"Model saved to {path}")
     if model_type == 'gp':
-        return train_gaussian_process(X_train, y_train)
-    elif model_type == 'nn':
-        return train_neural_network(X_train, y_train)
+        stats["log_marginal_likelihood"] = float(model.log_marginal_likelihood().numpy())
+    return model, stats
+
+def train_model(model_type: str, X_train, y_train, cache_dir=None, config=None, pipeline=None):
+    """
+    fit_model() without the stats: returns only the trained (or cached) model.
+    """
+    return fit_model(model_type, X_train, y_train, cache_dir=cache_dir, config=config, pipeline=pipeline)[0]
+
+def combine_target_variances(variance, rule='sum', weights=None):
+    """
+    Reduce an (n_points, n_targets) predictive variance to one score per point.
+    rule: 'sum' (total variance), 'mean', 'max' (most uncertain target) or
+    'geomean'. Optional per-target weights are applied first.
+    """
+    variance = np.asarray(variance, dtype=float)
+    if variance.ndim == 1:
+        return variance
+    if weights is not None:
+        variance = variance * np.asarray(weights, dtype=float).reshape(1, -1)
+    if variance.shape[1] == 1:
+        return variance[:, 0]
+    if rule == 'sum':
+        return variance.sum(axis=1)
+    elif rule == 'mean':
+        return variance.mean(axis=1)
+    elif rule == 'max':
+        return variance.max(axis=1)
+    elif rule == 'geomean':
+        return np.exp(np.log(np.maximum(variance, 1e-300)).mean(axis=1))
     else:
-        raise ValueError("Unknown model type. Choose 'gp' or 'nn'.")
+        raise ValueError("Unknown target rule. Choose 'sum', 'mean', 'max' or 'geomean'.")
+
+def predict_mean_variance(model, X, model_type='gp', chunk_size=SCORING_CHUNK_SIZE, precision='float64'):
+    """
+    Predict in chunks, applying the model's stored normalization pipeline to
+    each chunk and mapping results back to the original target units.
+    precision='float32' scores GP models through a cached float32 predictor
+    (see osairo.precision) and feeds NN models float32 inputs.
+    Returns (mean, variance) as NumPy arrays; variance is None for NN models.
+    """
+    pipeline = getattr(model, "osairo_pipeline", None)
+    predictor = None
+    if precision == 'float32' and model_type == 'gp':
+        from .precision import float32_predictor
+        predictor = float32_predictor(model)
+    means, variances = [], []
+    for start in range(0, len(X), chunk_size):
+        chunk = X[start:start + chunk_size]
+        if pipeline is not None:
+            chunk = pipeline.transform(chunk)
+        if precision == 'float32':
+            chunk = np.asarray(chunk, dtype=np.float32)
+        if model_type == 'gp':
+            mean, variance = (predictor or model).predict_f(chunk)
+            variance = np.asarray(variance)
+            if pipeline is not None:
+                variance = pipeline.inverse_transform_variance(variance)
+            variances.append(variance)
+        else:
+            mean = model.predict(chunk, verbose=0)
+        mean = np.asarray(mean)
+        if pipeline is not None:
+            mean = pipeline.inverse_transform_targets(mean)
+        means.append(mean)
+    mean = np.concatenate(means) if means else np.empty((0, 1))
+    variance = (np.concatenate(variances) if variances else np.empty((0, 1))) if model_type == 'gp' else None
+    return mean, variance
 
-def get_most_uncertain_point(model, X_unlabeled, model_type='gp'):
+def get_most_uncertain_point(model, X_unlabeled, model_type='gp', exclude=None,
+                             target_rule='sum', target_weights=None, acquisition='variance',
+                             acquisition_params=None, precision='float64', n_workers=None):
     """
     Identify the most uncertain data point from the unlabeled set.
-    For GP models, use the maximum predictive variance.
+    For GP models, use the maximum predictive variance; with several targets
+    the per-target variances are combined with target_rule/target_weights
+    (see combine_target_variances). Other acquisition rules ('ucb', 'ei',
+    'ivr', 'cost_aware', or any registered in osairo.acquisition) are
+    evaluated chunk by chunk over the pool. precision='float32' scores with
+    the reduced-precision GP path once its ranking has been checked against
+    float64 on a sample. With n_workers > 1 the pool is split into shards
+    scored in parallel processes (see osairo.sharded_scoring). X_unlabeled
+    may be a lazy CandidateGrid, which is scored chunk by chunk without ever
+    being materialized.
     For NN models, choose a random point as a placeholder.
-    Returns (point, index, uncertainty).
+    If exclude (a FeatureIndex of labelled/already-selected points) is given,
+    those rows and duplicate candidates are filtered out before scoring.
+    Returns (point, index, uncertainty), with index into X_unlabeled.
+    Raises PoolExhausted when no candidate is left.
     """
+    lazy = isinstance(X_unlabeled, CandidateGrid)
+    candidates = None
+    X_candidates = X_unlabeled
+    if exclude is not None and not lazy:
+        candidates = np.flatnonzero(exclude.candidate_mask(X_unlabeled))
+        if candidates.size == 0:
+            raise PoolExhausted("All candidate points are already labelled or selected.")
+        X_candidates = X_unlabeled[candidates]
+    # A lazy grid is never materialized; labelled points are masked chunk by chunk instead.
+    chunk_exclude = exclude if lazy else None
     if model_type == 'gp':
-        mean, variance = model.predict_f(X_unlabeled)
-        idx = int(np.argmax(variance))
-        return X_unlabeled[idx], idx, float(variance[idx])
+        from .acquisition import select_best
+        params = dict(acquisition_params or {})
+        params.setdefault("target_rule", target_rule)
+        params.setdefault("target_weights", target_weights)
+        if precision == 'float32':
+            from .precision import verified_float32
+            if not verified_float32(model, X_candidates, acquisition, params):
+                precision = 'float64'
+        with span("score.acquisition", n_candidates=len(X_candidates), acquisition=acquisition,
+                  precision=precision, n_workers=n_workers or 1):
+            if n_workers and n_workers > 1:
+                from .sharded_scoring import score_sharded
+                top, top_scores = score_sharded(model, X_candidates, 'gp', top_k=1, n_workers=n_workers,
+                                                acquisition=acquisition, precision=precision,
+                                                exclude=chunk_exclude, **params)
+                best, score = int(top[0]), float(top_scores[0])
+            else:
+                best, score = select_best(model, X_candidates, acquisition, 'gp', precision=precision,
+                                          exclude=chunk_exclude, **params)
+        if best < 0 or not np.isfinite(score):
+            raise PoolExhausted("All candidate points are already labelled or selected.")
+        idx = int(candidates[best]) if candidates is not None else int(best)
+        return X_unlabeled[idx], idx, score
     elif model_type == 'nn':
-        idx = np.random.choice(range(X_unlabeled.shape[0]))
+        if candidates is not None:
+            idx = int(np.random.choice(candidates))
+        else:
+            for _ in range(1000):
+                idx = int(np.random.randint(len(X_unlabeled)))
+                if chunk_exclude is None or not chunk_exclude.contains(X_unlabeled[idx:idx + 1])[0]:
+                    break
+            else:
+                raise PoolExhausted("Could not draw an unlabelled candidate point.")
         return X_unlabeled[idx], idx, None
     else:
         raise ValueError("Model type must be 'gp' or 'nn'.")
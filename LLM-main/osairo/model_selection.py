@@ -0,0 +1,109 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .config import worker_threads
+
+# Surrogate candidates compared by cross_validate.
+DEFAULT_CANDIDATES = [
+    {"name": "gp-matern52", "model_type": "gp", "config": {"kernel": "matern52"}},
+    {"name": "gp-rbf", "model_type": "gp", "config": {"kernel": "rbf"}},
+    {"name": "gp-rationalquadratic", "model_type": "gp", "config": {"kernel": "rationalquadratic"}},
+    {"name": "nn-32x32", "model_type": "nn", "config": {"hidden_units": [32, 32]}},
+    {"name": "nn-64x64", "model_type": "nn", "config": {"hidden_units": [64, 64]}},
+    {"name": "nn-128x128x128", "model_type": "nn", "config": {"hidden_units": [128, 128, 128]}},
+]
+
+def kfold_splits(n_samples, k=5, seed=0):
+    """
+    Return a list of k test-index arrays for a shuffled k-fold split.
+    The split is a seeded permutation, so every candidate and every re-run
+    with the same seed is scored on exactly the same folds.
+    """
+    order = np.random.default_rng(seed).permutation(n_samples)
+    return np.array_split(order, k)
+
+def _evaluate_fold(task):
+    """
+    Worker: train one candidate on one fold and score it on the held-out rows.
+    """
+    from .model_manager import train_gaussian_process, train_neural_network, predict_mean_variance
+    from .preprocessing import FeaturePipeline
+    name, model_type, config, normalize, X_train, y_train, X_test, y_test = task
+    pipeline = FeaturePipeline() if normalize else None
+    start = time.perf_counter()
+    if model_type == 'gp':
+        model = train_gaussian_process(X_train, y_train, pipeline=pipeline, **config)
+    else:
+        model = train_neural_network(X_train, y_train, pipeline=pipeline, **config)
+    train_s = time.perf_counter() - start
+    start = time.perf_counter()
+    mean, _ = predict_mean_variance(model, X_test, model_type)
+    predict_s = time.perf_counter() - start
+    error = np.asarray(mean).reshape(y_test.shape) - y_test
+    return name, float(np.sqrt(np.mean(error ** 2))), float(np.mean(np.abs(error))), train_s, predict_s
+
+def cross_validate(X, y, candidates=None, k=5, seed=0, processes=None, normalize=True):
+    """
+    Run k-fold cross-validation for every candidate, with all (candidate, fold)
+    fits spread over a process pool.
+    Returns one summary dict per candidate: rmse/mae (mean over folds),
+    rmse_std, train_s and predict_s (mean per fold), sorted by rmse.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float).reshape(len(X), -1)
+    candidates = candidates or DEFAULT_CANDIDATES
+    folds = kfold_splits(len(X), k, seed)
+    tasks = []
+    for candidate in candidates:
+        for test_idx in folds:
+            train_mask = np.ones(len(X), dtype=bool)
+            train_mask[test_idx] = False
+            tasks.append((candidate["name"], candidate["model_type"], dict(candidate.get("config", {})),
+                          normalize, X[train_mask], y[train_mask], X[test_idx], y[test_idx]))
+
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    threads = max(1, (os.cpu_count() or 1) // processes)
+    # 'spawn' avoids forking a parent that may already hold TensorFlow state; the
+    # thread limits are set before the workers start, as they import numpy first.
+    ctx = multiprocessing.get_context("spawn")
+    with worker_threads(threads), ProcessPoolExecutor(max_workers=processes, mp_context=ctx) as pool:
+        fold_results = list(pool.map(_evaluate_fold, tasks))
+
+    summary = []
+    for candidate in candidates:
+        rows = [r for r in fold_results if r[0] == candidate["name"]]
+        rmse = np.array([r[1] for r in rows])
+        summary.append({
+            "name": candidate["name"],
+            "model_type": candidate["model_type"],
+            "config": dict(candidate.get("config", {})),
+            "rmse": float(rmse.mean()),
+            "rmse_std": float(rmse.std()),
+            "mae": float(np.mean([r[2] for r in rows])),
+            "train_s": float(np.mean([r[3] for r in rows])),
+            "predict_s": float(np.mean([r[4] for r in rows])),
+        })
+    return sorted(summary, key=lambda entry: entry["rmse"])
+
+def select_model(summary, target_rmse=None):
+    """
+    Pick the cheapest candidate (lowest training time) whose CV RMSE meets
+    target_rmse; without a target, or if none meets it, the most accurate.
+    """
+    if target_rmse is not None:
+        meeting = [entry for entry in summary if entry["rmse"] <= target_rmse]
+        if meeting:
+            return min(meeting, key=lambda entry: entry["train_s"])
+    return min(summary, key=lambda entry: entry["rmse"])
+
+def print_cv_report(summary, chosen=None):
+    """
+    Print error versus training time for every candidate.
+    """
+    print(f"\n{'candidate':<26}{'RMSE':>12}{'+/-':>10}{'MAE':>12}{'train s':>10}{'predict s':>11}")
+    for entry in summary:
+        marker = "  <- selected" if chosen is not None and entry["name"] == chosen["name"] else ""
+        print(f"{entry['name']:<26}{entry['rmse']:>12.4g}{entry['rmse_std']:>10.2g}{entry['mae']:>12.4g}"
+              f"{entry['train_s']:>10.2f}{entry['predict_s']:>11.3f}{marker}")
@@ -0,0 +1,173 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+# Bump when the on-disk layout changes so stale cache entries are ignored.
+FORMAT_VERSION = 1
+
+def model_cache_key(model_type, X_train, y_train, config=None):
+    """
+    Content hash of the training data, feature layout and model configuration.
+    Identical inputs always map to the same key, so a cached model can be
+    reused instead of retrained.
+    """
+    h = hashlib.sha256()
+    h.update(f"osairo-model-v{FORMAT_VERSION}:{model_type}".encode())
+    for arr in (X_train, y_train):
+        arr = np.ascontiguousarray(arr, dtype=np.float64)
+        h.update(str(arr.shape).encode())
+        h.update(arr.tobytes())
+    h.update(json.dumps(config or {}, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:32]
+
+def _pipeline_arrays(model):
+    pipeline = getattr(model, "osairo_pipeline", None)
+    if pipeline is None:
+        return {}
+    return {f"pipeline:{name}": value for name, value in pipeline.to_arrays().items()}
+
+def _load_pipeline(archive):
+    from .preprocessing import FeaturePipeline
+    arrays = {name.split(":", 1)[1]: archive[name] for name in archive.files if name.startswith("pipeline:")}
+    return FeaturePipeline.from_arrays(arrays) if arrays else None
+
+def _save_gp(model, path):
+    import gpflow
+    X, Y = (np.asarray(d) for d in model.data)
+    parameters = gpflow.utilities.parameter_dict(model)
+    params = {name.lstrip("."): np.asarray(p.numpy()) for name, p in parameters.items()}
+    # Unconstrained values round-trip exactly, including parameters sitting on
+    # their lower bound (e.g. the 1e-6 noise floor), where inverting the
+    # transform of the constrained value gives -inf.
+    unconstrained = {name.lstrip("."): np.asarray(p.unconstrained_variable.numpy())
+                     for name, p in parameters.items()}
+    np.savez(
+        path + ".npz",
+        format_version=FORMAT_VERSION,
+        model_type="gp",
+        kernel=type(model.kernel).__name__,
+        param_names=np.array(list(params)),
+        X=X,
+        Y=Y,
+        **{f"param:{name}": value for name, value in params.items()},
+        **{f"uparam:{name}": value for name, value in unconstrained.items()},
+        **_pipeline_arrays(model),
+    )
+    return path + ".npz"
+
+def _load_gp(path):
+    import gpflow
+    with np.load(path, allow_pickle=False) as archive:
+        X, Y = archive["X"], archive["Y"]
+        kernel_name = str(archive["kernel"])
+        params = {str(n): archive[f"param:{n}"] for n in archive["param_names"]}
+        unconstrained = {str(n): archive[f"uparam:{n}"] for n in archive["param_names"]
+                         if f"uparam:{n}" in archive.files}
+        pipeline = _load_pipeline(archive)
+    kernel_kwargs = {
+        name.split(".", 1)[1]: value
+        for name, value in params.items()
+        if name.startswith("kernel.") and name.count(".") == 1
+    }
+    kernel = getattr(gpflow.kernels, kernel_name)(**kernel_kwargs)
+    model = gpflow.models.GPR(data=(X, Y), kernel=kernel)
+    if unconstrained:
+        parameters = gpflow.utilities.parameter_dict(model)
+        for name, value in unconstrained.items():
+            parameters["." + name].unconstrained_variable.assign(value)
+    else:
+        gpflow.utilities.multiple_assign(model, {"." + name: value for name, value in params.items()})
+    model.osairo_pipeline = pipeline
+    return model
+
+def _save_nn(model, path):
+    with open(path + ".json", "w") as f:
+        f.write(model.to_json())
+    model.save_weights(path + ".weights.h5")
+    arrays = _pipeline_arrays(model)
+    if arrays:
+        np.savez(path + ".pipeline.npz", **arrays)
+    return path + ".weights.h5"
+
+def _load_nn(path):
+    import tensorflow as tf
+    with open(path + ".json", "r") as f:
+        model = tf.keras.models.model_from_json(f.read())
+    model.load_weights(path + ".weights.h5")
+    model.compile(optimizer='adam', loss='mse')
+    model.osairo_pipeline = None
+    if os.path.exists(path + ".pipeline.npz"):
+        with np.load(path + ".pipeline.npz", allow_pickle=False) as archive:
+            model.osairo_pipeline = _load_pipeline(archive)
+    return model
+
+def _base_path(path):
+    for suffix in (".npz", ".weights.h5", ".json"):
+        if path.endswith(suffix):
+            return path[:-len(suffix)]
+    return path
+
+def save_model(model, model_type, path):
+    """
+    Save a trained model without pickling.
+    GP: kernel/likelihood parameters plus training arrays in '<path>.npz'.
+    NN: architecture in '<path>.json' and Keras weights in '<path>.weights.h5'.
+    A fitted normalization pipeline is stored with the model either way.
+    Returns the path of the main file written.
+    """
+    path = _base_path(path)
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    model_type = model_type.lower().strip()
+    if model_type == 'gp':
+        return _save_gp(model, path)
+    elif model_type == 'nn':
+        return _save_nn(model, path)
+    else:
+        raise ValueError("Unknown model type. Choose 'gp' or 'nn'.")
+
+def load_model(path, model_type=None):
+    """
+    Load a model written by save_model. The model type is inferred from the
+    files present if not given. Legacy pickles (.pkl/.pickle) are still read.
+    """
+    if path.endswith((".pkl", ".pickle")):
+        import pickle
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    path = _base_path(path)
+    if model_type is None:
+        if os.path.exists(path + ".npz"):
+            model_type = 'gp'
+        elif os.path.exists(path + ".weights.h5"):
+            model_type = 'nn'
+        else:
+            raise FileNotFoundError(f"No saved model found at {path}")
+    if model_type == 'gp':
+        return _load_gp(path + ".npz")
+    elif model_type == 'nn':
+        return _load_nn(path)
+    else:
+        raise ValueError("Unknown model type. Choose 'gp' or 'nn'.")
+
+def cached_model_path(cache_dir, model_type, X_train, y_train, config=None):
+    """
+    Return the base path of the cache entry for this model/data combination.
+    """
+    key = model_cache_key(model_type, X_train, y_train, config)
+    return os.path.join(cache_dir, f"{model_type}_{key}")
+
+def load_cached_model(cache_dir, model_type, X_train, y_train, config=None):
+    """
+    Return the cached model for this data/config, or None on a cache miss.
+    """
+    path = cached_model_path(cache_dir, model_type, X_train, y_train, config)
+    try:
+        return load_model(path, model_type)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error loading cached model: {e}. Retraining.")
+        return None
@@ -0,0 +1,137 @@
+import numpy as np
+
+def _stationary_kernel(name, variance, lengthscales, alpha=None):
+    """
+    Return k(A, B) for a gpflow stationary kernel, evaluated in the dtype of
+    the inputs. Inputs are divided by the lengthscales before the distance is
+    formed, so the squared distance is computed on O(1) numbers.
+    """
+    def squared_distance(A, B):
+        A = A / lengthscales
+        B = B / lengthscales
+        r2 = (A * A).sum(axis=1)[:, None] + (B * B).sum(axis=1)[None, :] - 2.0 * (A @ B.T)
+        return np.maximum(r2, 0.0)
+
+    def kernel(A, B):
+        r2 = squared_distance(A, B)
+        if name == "SquaredExponential":
+            return variance * np.exp(-0.5 * r2)
+        if name == "RationalQuadratic":
+            return variance * (1.0 + r2 / (2.0 * alpha)) ** (-alpha)
+        r = np.sqrt(r2)
+        if name == "Matern12":
+            return variance * np.exp(-r)
+        if name == "Matern32":
+            s = np.sqrt(3.0).astype(r.dtype) * r
+            return variance * (1.0 + s) * np.exp(-s)
+        if name == "Matern52":
+            s = np.sqrt(5.0).astype(r.dtype) * r
+            return variance * (1.0 + s + s * s / 3.0) * np.exp(-s)
+        raise ValueError(f"Float32 prediction does not support kernel {name}.")
+    return kernel
+
+class Float32GPPredictor:
+    """
+    Reduced-precision prediction path for a trained gpflow GPR.
+    Everything that needs float64 for stability (the Cholesky factor of
+    K + noise*I, its inverse and the weights alpha = K^-1 Y) is computed once
+    in float64; scoring then only does float32 matrix products, which halves
+    memory traffic on large candidate pools. The noise is floored at
+    jitter * kernel variance and variances are clamped at a small positive
+    floor to absorb float32 cancellation; check_ranking_agreement measures
+    what that costs against float64 for the acquisition in use.
+    """
+
+    def __init__(self, model, jitter=1e-5):
+        from scipy.linalg import cholesky, cho_solve, solve_triangular
+        kernel = model.kernel
+        name = type(kernel).__name__
+        X, Y = (np.asarray(d, dtype=np.float64) for d in model.data)
+        noise = float(model.likelihood.variance.numpy())
+        # float32 cannot resolve a posterior built on a near-singular K, so the
+        # noise is floored relative to the signal variance before factorizing.
+        noise = max(noise, jitter * float(kernel.variance.numpy()))
+        K = kernel(X).numpy() + noise * np.eye(len(X))
+        L = cholesky(K, lower=True)
+        alpha = cho_solve((L, True), Y)
+        L_inv = solve_triangular(L, np.eye(len(X)), lower=True)
+        self.kernel_variance = np.float32(kernel.variance.numpy())
+        self.X_train = X.astype(np.float32)
+        self.alpha = alpha.astype(np.float32)
+        self.L_inv_T = np.ascontiguousarray(L_inv.T).astype(np.float32)
+        self.kernel = _stationary_kernel(
+            name,
+            self.kernel_variance,
+            np.asarray(kernel.lengthscales.numpy(), dtype=np.float32),
+            np.float32(kernel.alpha.numpy()) if hasattr(kernel, "alpha") else None,
+        )
+        self.variance_floor = np.float32(1e-6) * self.kernel_variance
+        # (acquisition, params) -> check_ranking_agreement result
+        self.agreement = {}
+
+    def predict_f(self, X):
+        """
+        Latent mean and variance (float32) in the model's training space.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        Kxn = self.kernel(X, self.X_train)
+        mean = Kxn @ self.alpha
+        V = Kxn @ self.L_inv_T
+        variance = np.maximum(self.kernel_variance - (V * V).sum(axis=1), self.variance_floor)
+        return mean, np.repeat(variance[:, None], self.alpha.shape[1], axis=1)
+
+def float32_predictor(model):
+    """
+    Return the cached float32 predictor for a GP model, building it on first use.
+    """
+    predictor = getattr(model, "osairo_float32_predictor", None)
+    if predictor is None:
+        predictor = Float32GPPredictor(model)
+        model.osairo_float32_predictor = predictor
+    return predictor
+
+def check_ranking_agreement(model, X, acquisition='variance', acquisition_params=None, sample_size=2000,
+                            top_k=20, seed=0):
+    """
+    Compare float32 against float64 rankings of the acquisition score in use
+    (which for ucb/ei depends on the predicted mean as well as the variance)
+    on a random sample of X.
+    Returns a dict with the Spearman rank correlation, top-k overlap fraction,
+    whether the argmax agrees, and the largest score error relative to the
+    largest float64 score.
+    """
+    from .acquisition import score_candidates
+    params = dict(acquisition_params or {})
+    rng = np.random.default_rng(seed)
+    idx = rng.choice(len(X), size=min(sample_size, len(X)), replace=False)
+    sample = X[np.sort(idx)]
+    s64 = score_candidates(model, sample, acquisition, 'gp', precision='float64', **params)
+    s32 = score_candidates(model, sample, acquisition, 'gp', precision='float32', **params)
+    rank64 = np.argsort(np.argsort(s64))
+    rank32 = np.argsort(np.argsort(s32))
+    spearman = float(np.corrcoef(rank64, rank32)[0, 1]) if len(sample) > 1 else 1.0
+    k = min(top_k, len(sample))
+    overlap = len(set(np.argsort(-s64)[:k]) & set(np.argsort(-s32)[:k])) / k
+    return {
+        "acquisition": acquisition,
+        "spearman": spearman,
+        "top_k_overlap": overlap,
+        "argmax_agrees": bool(np.argmax(s64) == np.argmax(s32)),
+        "max_relative_error": float(np.max(np.abs(s32 - s64)) / max(float(np.max(np.abs(s64))), 1e-300)),
+    }
+
+def verified_float32(model, X, acquisition='variance', acquisition_params=None, min_overlap=0.8, **kwargs):
+    """
+    Check ranking agreement once per model and acquisition setting; return
+    True if float32 scoring is safe to use, otherwise print a warning and
+    return False.
+    """
+    predictor = float32_predictor(model)
+    key = (acquisition, repr(sorted((acquisition_params or {}).items())))
+    agreement = predictor.agreement.get(key)
+    if agreement is None:
+        agreement = check_ranking_agreement(model, X, acquisition, acquisition_params, **kwargs)
+        predictor.agreement[key] = agreement
+        if agreement["top_k_overlap"] < min_overlap:
+            print(f"Float32 ranking disagrees with float64 ({agreement}); scoring in float64.")
+    return agreement["top_k_overlap"] >= min_overlap
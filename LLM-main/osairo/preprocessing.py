@@ -0,0 +1,137 @@
+import numpy as np
+
+# A strictly positive column whose max/min reaches this ratio is treated as
+# log-scaled (e.g. pressure), both when sampling candidate pools and when
+# normalizing inputs.
+LOG_MIN_RATIO = 100.0
+
+def log_scale_columns(X, min_ratio=LOG_MIN_RATIO):
+    """
+    Boolean mask of columns of X that are strictly positive and span at least
+    min_ratio between their smallest and largest value.
+    """
+    X = np.asarray(X, dtype=float)
+    low, high = X.min(axis=0), X.max(axis=0)
+    return (low > 0) & (high >= min_ratio * np.where(low > 0, low, np.inf))
+
+class FeaturePipeline:
+    """
+    Fitted input/target transform stored alongside a trained model.
+    Inputs: optional log10 of pressure-like columns (strictly positive and
+    spanning LOG_MIN_RATIO or more), standardization, then optional PCA.
+    Targets: per-column standardization, inverted on predictions so means and
+    variances come back in the original units.
+    """
+
+    def __init__(self, log_columns='auto', standardize=True, pca_components=None,
+                 standardize_targets=True, log_min_ratio=LOG_MIN_RATIO):
+        self.log_columns = log_columns
+        self.standardize = standardize
+        self.pca_components = pca_components
+        self.standardize_targets = standardize_targets
+        self.log_min_ratio = log_min_ratio
+        self.fitted = False
+
+    def config(self):
+        """
+        Constructor settings, used as part of the model cache key.
+        """
+        return {
+            "log_columns": self.log_columns if isinstance(self.log_columns, str) else list(self.log_columns),
+            "standardize": self.standardize,
+            "pca_components": self.pca_components,
+            "standardize_targets": self.standardize_targets,
+            "log_min_ratio": self.log_min_ratio,
+        }
+
+    def fit(self, X, y=None):
+        X = np.asarray(X, dtype=float)
+        n_features = X.shape[1]
+        if isinstance(self.log_columns, str) and self.log_columns == 'auto':
+            self.log_mask_ = log_scale_columns(X, self.log_min_ratio)
+        else:
+            self.log_mask_ = np.zeros(n_features, dtype=bool)
+            self.log_mask_[list(self.log_columns or [])] = True
+        Z = self._log(X)
+        if self.standardize:
+            self.x_mean_ = Z.mean(axis=0)
+            self.x_std_ = Z.std(axis=0)
+            self.x_std_[self.x_std_ == 0] = 1.0
+        else:
+            self.x_mean_ = np.zeros(n_features)
+            self.x_std_ = np.ones(n_features)
+        Z = (Z - self.x_mean_) / self.x_std_
+        self.components_ = None
+        if self.pca_components:
+            # Principal axes of the standardized inputs; a float keeps enough
+            # components to explain that fraction of the variance.
+            _, s, vt = np.linalg.svd(Z - Z.mean(axis=0), full_matrices=False)
+            if isinstance(self.pca_components, float):
+                explained = np.cumsum(s ** 2) / np.sum(s ** 2)
+                k = int(np.searchsorted(explained, self.pca_components) + 1)
+            else:
+                k = int(self.pca_components)
+            self.components_ = vt[:min(k, vt.shape[0])].T
+        if y is not None and self.standardize_targets:
+            y = np.asarray(y, dtype=float).reshape(len(X), -1)
+            self.y_mean_ = y.mean(axis=0)
+            self.y_std_ = y.std(axis=0)
+            self.y_std_[self.y_std_ == 0] = 1.0
+        else:
+            self.y_mean_ = np.zeros(1)
+            self.y_std_ = np.ones(1)
+        self.fitted = True
+        return self
+
+    def _log(self, X):
+        if not self.log_mask_.any():
+            return X.copy()
+        Z = X.copy()
+        Z[:, self.log_mask_] = np.log10(np.maximum(Z[:, self.log_mask_], np.finfo(float).tiny))
+        return Z
+
+    def transform(self, X):
+        """
+        Transform inputs (vectorized over the whole array).
+        """
+        Z = (self._log(np.asarray(X, dtype=float)) - self.x_mean_) / self.x_std_
+        if self.components_ is not None:
+            Z = Z @ self.components_
+        return Z
+
+    def transform_targets(self, y):
+        y = np.asarray(y, dtype=float)
+        return (y - self.y_mean_) / self.y_std_
+
+    def inverse_transform_targets(self, mean):
+        return np.asarray(mean) * self.y_std_ + self.y_mean_
+
+    def inverse_transform_variance(self, variance):
+        return np.asarray(variance) * self.y_std_ ** 2
+
+    def to_arrays(self):
+        """
+        Fitted state as a dict of NumPy arrays (for .npz storage).
+        """
+        arrays = {
+            "log_mask": self.log_mask_,
+            "x_mean": self.x_mean_,
+            "x_std": self.x_std_,
+            "y_mean": self.y_mean_,
+            "y_std": self.y_std_,
+        }
+        if self.components_ is not None:
+            arrays["components"] = self.components_
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        pipeline = cls()
+        pipeline.log_mask_ = np.asarray(arrays["log_mask"], dtype=bool)
+        pipeline.x_mean_ = np.asarray(arrays["x_mean"])
+        pipeline.x_std_ = np.asarray(arrays["x_std"])
+        pipeline.y_mean_ = np.asarray(arrays["y_mean"])
+        pipeline.y_std_ = np.asarray(arrays["y_std"])
+        pipeline.components_ = np.asarray(arrays["components"]) if "components" in arrays else None
+        pipeline.fitted = True
+        return pipeline
@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+# Profiling is off by default; span() is then a near no-op.
+_ENABLED = False
+_SPANS = []
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+def enable_profiling(enabled=True):
+    global _ENABLED
+    _ENABLED = enabled
+
+def is_enabled():
+    return _ENABLED
+
+def reset():
+    with _LOCK:
+        _SPANS.clear()
+
+def get_spans():
+    with _LOCK:
+        return list(_SPANS)
+
+def _new_id(n_bytes):
+    return os.urandom(n_bytes).hex()
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time a stage of the active-learning cycle.
+    Nested spans record their parent, so the report can show where a cycle's
+    wall-clock time goes. Yields the attribute dict so callers can attach
+    results (e.g., token counts) while the span is open.
+    """
+    if not _ENABLED:
+        yield attributes
+        return
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    parent = stack[-1] if stack else None
+    record = {
+        "name": name,
+        "trace_id": parent["trace_id"] if parent else _new_id(16),
+        "span_id": _new_id(8),
+        "parent_id": parent["span_id"] if parent else None,
+        "start_ns": time.time_ns(),
+        "attributes": attributes,
+    }
+    stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        record["duration_s"] = time.perf_counter() - start
+        record["end_ns"] = record["start_ns"] + int(record["duration_s"] * 1e9)
+        stack.pop()
+        with _LOCK:
+            _SPANS.append(record)
+
+def traced(name):
+    """
+    Decorator form of span().
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _token_usage(response):
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage:
+        return usage.get("input_tokens"), usage.get("output_tokens")
+    meta = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+    return meta.get("prompt_tokens"), meta.get("completion_tokens")
+
+def invoke_llm(chat, messages, stage):
+    """
+    Call chat.invoke(messages) inside an 'llm.<stage>' span, recording latency
+    and prompt/completion token counts when the provider reports them.
+    """
+    with span(f"llm.{stage}") as attrs:
+        response = chat.invoke(messages)
+        prompt_tokens, completion_tokens = _token_usage(response)
+        if prompt_tokens is not None:
+            attrs["llm.prompt_tokens"] = prompt_tokens
+        if completion_tokens is not None:
+            attrs["llm.completion_tokens"] = completion_tokens
+    return response
+
+def stage_report(spans=None):
+    """
+    Aggregate spans per stage name: count, total/mean/max seconds and tokens.
+    """
+    spans = get_spans() if spans is None else spans
+    stages = {}
+    for record in spans:
+        entry = stages.setdefault(record["name"], {
+            "count": 0, "total_s": 0.0, "max_s": 0.0,
+            "prompt_tokens": 0, "completion_tokens": 0,
+        })
+        entry["count"] += 1
+        entry["total_s"] += record["duration_s"]
+        entry["max_s"] = max(entry["max_s"], record["duration_s"])
+        entry["prompt_tokens"] += record["attributes"].get("llm.prompt_tokens", 0) or 0
+        entry["completion_tokens"] += record["attributes"].get("llm.completion_tokens", 0) or 0
+    for entry in stages.values():
+        entry["mean_s"] = entry["total_s"] / entry["count"]
+    return stages
+
+def print_report(spans=None):
+    """
+    Print a per-stage timing breakdown, slowest stage first.
+    """
+    stages = stage_report(spans)
+    if not stages:
+        print("No profiling data recorded.")
+        return
+    print("\n=== Profile (per stage) ===")
+    print(f"{'stage':<32}{'count':>7}{'total s':>11}{'mean s':>10}{'max s':>10}{'tok in':>9}{'tok out':>9}")
+    for name, e in sorted(stages.items(), key=lambda item: -item[1]["total_s"]):
+        print(f"{name:<32}{e['count']:>7}{e['total_s']:>11.3f}{e['mean_s']:>10.3f}{e['max_s']:>10.3f}"
+              f"{e['prompt_tokens']:>9}{e['completion_tokens']:>9}")
+
+def export_json(path, spans=None):
+    """
+    Write raw spans and the per-stage summary as JSON.
+    """
+    spans = get_spans() if spans is None else spans
+    with open(path, "w") as f:
+        json.dump({"spans": spans, "stages": stage_report(spans)}, f, indent=2, default=str)
+    return path
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def export_otlp_json(path, spans=None, service_name="osairo"):
+    """
+    Write spans in the OpenTelemetry OTLP/JSON trace format, so they can be
+    loaded by any OTLP-compatible collector or viewer for offline analysis.
+    """
+    spans = get_spans() if spans is None else spans
+    otlp_spans = []
+    for record in spans:
+        otlp_span = {
+            "traceId": record["trace_id"],
+            "spanId": record["span_id"],
+            "name": record["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(record["start_ns"]),
+            "endTimeUnixNano": str(record["end_ns"]),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in record["attributes"].items()],
+        }
+        if record["parent_id"]:
+            otlp_span["parentSpanId"] = record["parent_id"]
+        otlp_spans.append(otlp_span)
+    payload = {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+        "scopeSpans": [{"scope": {"name": "osairo.profiling"}, "spans": otlp_spans}],
+    }]}
+    with open(path, "w") as f:
+        json.dump(payload, f)
+    return path
+
+def export(path, spans=None):
+    """
+    Export spans to path; '.otlp.json' selects the OpenTelemetry format.
+    """
+    if path.endswith(".otlp.json"):
+        return export_otlp_json(path, spans)
+    return export_json(path, spans)
@@ -0,0 +1,230 @@
+import os
+import re
+import json
+import fnmatch
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+# File patterns scanned per simulation code.
+DEFAULT_PATTERNS = {
+    "raspa": ["*.data"],
+    "gulp": ["*.gout"],
+}
+
+_NUMBER = r"([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)"
+_RASPA_COMPONENT = re.compile(r"^\s*Component\s+(\d+)\s+\[([^\]]+)\]")
+_RASPA_LOADING = re.compile(
+    r"Average loading (absolute|excess) \[mol/kg framework\]\s+" + _NUMBER + r"\s+\+/-\s+" + _NUMBER
+)
+_RASPA_PRESSURE = re.compile(r"(?:External\s+)?Pressure:\s+" + _NUMBER + r"\s+\[Pa\]", re.IGNORECASE)
+_RASPA_TEMPERATURE = re.compile(r"(?:External\s+)?Temperature:\s+" + _NUMBER + r"\s+\[K\]", re.IGNORECASE)
+_GULP_ENERGY = [
+    re.compile(r"Final energy\s*=\s*" + _NUMBER + r"\s*eV"),
+    re.compile(r"Total lattice energy\s*=\s*" + _NUMBER + r"\s*eV"),
+    re.compile(r"^\s*totalenergy\s+" + _NUMBER, re.MULTILINE),
+]
+_GULP_FINAL_CELL = re.compile(
+    r"Final cell parameters.*?\n-+\n(.*?)\n-+", re.DOTALL
+)
+_GULP_CELL_LINE = re.compile(r"^\s*(a|b|c|alpha|beta|gamma)\s+" + _NUMBER, re.MULTILINE)
+_GULP_DUMP_CELL = re.compile(r"^\s*cell\s*\n\s*" + r"\s+".join([_NUMBER] * 6), re.MULTILINE)
+
+def parse_raspa_output(text):
+    """
+    Parse a RASPA output file and return a dict with the external pressure,
+    temperature and average absolute/excess loadings (mol/kg) per component.
+    Returns None if no loadings are found (e.g., the run has not finished).
+    """
+    row = {}
+    component = None
+    for line in text.splitlines():
+        match = _RASPA_COMPONENT.match(line)
+        if match:
+            component = match.group(2).strip()
+            continue
+        match = _RASPA_LOADING.search(line)
+        if match and component is not None:
+            kind, value, error = match.groups()
+            row[f"loading_{kind}_{component}"] = float(value)
+            row[f"loading_{kind}_{component}_err"] = float(error)
+    if not row:
+        return None
+    pressure = _RASPA_PRESSURE.search(text)
+    if pressure:
+        row["pressure"] = float(pressure.group(1))
+    temperature = _RASPA_TEMPERATURE.search(text)
+    if temperature:
+        row["temperature"] = float(temperature.group(1))
+    return row
+
+def parse_gulp_output(text):
+    """
+    Parse a GULP output (or dump) file and return a dict with the final lattice
+    energy (eV) and the optimized cell parameters.
+    Returns None if no final energy is found.
+    """
+    row = {}
+    for pattern in _GULP_ENERGY:
+        matches = pattern.findall(text)
+        if matches:
+            row["lattice_energy"] = float(matches[-1])
+            break
+    if not row:
+        return None
+    block = _GULP_FINAL_CELL.search(text)
+    if block:
+        for name, value in _GULP_CELL_LINE.findall(block.group(1)):
+            row[name] = float(value)
+    else:
+        cells = _GULP_DUMP_CELL.findall(text)
+        if cells:
+            for name, value in zip(["a", "b", "c", "alpha", "beta", "gamma"], cells[-1]):
+                row[name] = float(value)
+    return row
+
+PARSERS = {
+    "raspa": parse_raspa_output,
+    "gulp": parse_gulp_output,
+}
+
+def _parse_file(task):
+    """
+    Worker: read, hash and parse one output file.
+    Returns (path, sha1, row); row is None when the file could not be parsed.
+    """
+    path, kind = task
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return path, None, None
+    digest = hashlib.sha1(raw).hexdigest()
+    row = PARSERS[kind](raw.decode("utf-8", errors="replace"))
+    if row is not None:
+        row["source_file"] = path
+    return path, digest, row
+
+def load_harvest_state(state_file):
+    """
+    Load the {path: {'mtime', 'size', 'sha1'}} record of already-parsed files.
+    """
+    if not state_file or not os.path.exists(state_file):
+        return {}
+    try:
+        with open(state_file, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error loading harvest state: {e}. Starting fresh.")
+        return {}
+
+def save_harvest_state(state, state_file):
+    """
+    Atomically write the harvest state to disk.
+    """
+    folder = os.path.dirname(state_file)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp_path = state_file + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_file)
+
+def find_output_files(directories, patterns=None):
+    """
+    Recursively scan directories and return a list of (path, kind) tuples,
+    where kind is the parser ('raspa' or 'gulp') matching the file name.
+    """
+    patterns = patterns or DEFAULT_PATTERNS
+    if isinstance(directories, str):
+        directories = [directories]
+    found = []
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                for kind, globs in patterns.items():
+                    if any(fnmatch.fnmatch(name, g) for g in globs):
+                        found.append((os.path.join(root, name), kind))
+                        break
+    return found
+
+def harvest_results(directories, state_file=None, patterns=None, processes=None, chunksize=32):
+    """
+    Scan output directories and parse every new or modified RASPA/GULP output
+    file across a process pool.
+    Files whose mtime and size match the harvest state are skipped without
+    being read; files that changed on disk but hash to the same content are
+    not parsed again. Returns a list of parsed row dicts.
+    """
+    state = load_harvest_state(state_file)
+    tasks = []
+    stats = {}
+    for path, kind in find_output_files(directories, patterns):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        previous = state.get(path)
+        if previous and previous["mtime"] == st.st_mtime and previous["size"] == st.st_size:
+            continue
+        stats[path] = (st.st_mtime, st.st_size)
+        tasks.append((path, kind))
+
+    if not tasks:
+        print("No new simulation outputs found.")
+        return []
+
+    processes = processes or os.cpu_count() or 1
+    pool = None
+    if processes == 1 or len(tasks) <= chunksize:
+        results = map(_parse_file, tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=processes)
+        results = pool.map(_parse_file, tasks, chunksize=chunksize)
+
+    rows = []
+    try:
+        for path, digest, row in results:
+            if digest is None:
+                continue
+            previous = state.get(path)
+            mtime, size = stats[path]
+            state[path] = {"mtime": mtime, "size": size, "sha1": digest}
+            if previous and previous.get("sha1") == digest:
+                continue
+            if row is None:
+                # Unfinished or unparseable run; retry once it changes on disk.
+                state.pop(path)
+                continue
+            rows.append(row)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if state_file:
+        save_harvest_state(state, state_file)
+    print(f"Harvested {len(rows)} new results from {len(tasks)} changed files.")
+    return rows
+
+def append_harvested_results(df, rows, column_map=None):
+    """
+    Append harvested rows to the training DataFrame in a single batch.
+    column_map renames parsed keys (e.g., 'loading_absolute_CO2') to training
+    column names. df may be a DataFrame or a TrainingStore; when it already
+    has columns, keys that do not correspond to one of them are dropped, and
+    a TrainingStore only receives numeric values (source_file is left out).
+    """
+    from .active_learning import update_training_data
+    from .training_store import TrainingStore
+    column_map = column_map or {}
+    columns = set(df.columns)
+    numeric_only = isinstance(df, TrainingStore)
+    batch = []
+    for row in rows:
+        renamed = {column_map.get(key, key): value for key, value in row.items()}
+        if columns:
+            renamed = {key: value for key, value in renamed.items() if key in columns}
+        if numeric_only:
+            renamed = {key: value for key, value in renamed.items()
+                       if isinstance(value, (int, float)) and not isinstance(value, bool)}
+        batch.append(renamed)
+    return update_training_data(df, batch)
@@ -0,0 +1,304 @@
+import os
+import re
+import json
+import time
+import shlex
+import getpass
+import threading
+import subprocess
+from .local_executor import PENDING, RUNNING, COMPLETED, FAILED, TIMEOUT, CANCELLED
+
+# Left the queue without an accounting record of how it ended.
+FINISHED = "FINISHED"
+FINAL_STATES = {COMPLETED, FAILED, TIMEOUT, CANCELLED, FINISHED}
+
+# Default commands per scheduler; each can be overridden (e.g. with fake binaries in tests).
+SCHEDULER_COMMANDS = {
+    "slurm": {
+        "submit": "sbatch --parsable",
+        "status": "squeue -h -o '%i %T' -u {user}",
+        "accounting": "sacct -n -P -X -o JobID,State -j {job_ids}",
+    },
+    "uge": {
+        "submit": "qsub",
+        "status": "qstat -u {user}",
+        "accounting": None,
+    },
+}
+
+_SLURM_STATES = {
+    "PENDING": PENDING, "CONFIGURING": PENDING, "REQUEUED": PENDING, "SUSPENDED": PENDING,
+    "RUNNING": RUNNING, "COMPLETING": RUNNING, "STAGE_OUT": RUNNING,
+    "COMPLETED": COMPLETED, "TIMEOUT": TIMEOUT, "DEADLINE": TIMEOUT, "CANCELLED": CANCELLED,
+    "FAILED": FAILED, "NODE_FAIL": FAILED, "OUT_OF_MEMORY": FAILED, "BOOT_FAIL": FAILED, "PREEMPTED": FAILED,
+}
+
+def _uge_state(code):
+    if "E" in code:
+        return FAILED
+    if "d" in code:
+        return CANCELLED
+    if "r" in code or "t" in code:
+        return RUNNING
+    return PENDING
+
+def _slurm_state(text):
+    return _SLURM_STATES.get(text.split()[0].rstrip("+").upper(), PENDING) if text.strip() else PENDING
+
+# Which task state stands for an array job: while any task is queued the job
+# is still active; once all have ended, any failure marks the whole job.
+_LISTED_PRECEDENCE = (RUNNING, PENDING, FAILED, TIMEOUT, CANCELLED, COMPLETED, FINISHED)
+_FINAL_PRECEDENCE = (FAILED, TIMEOUT, CANCELLED, RUNNING, PENDING, COMPLETED, FINISHED)
+
+def _worst(a, b, precedence):
+    return a if precedence.index(a) <= precedence.index(b) else b
+
+def base_job_id(job_id):
+    """
+    Array job id of a task listed as "123_4", "123_[2-10]" (Slurm) or "123.4" (UGE).
+    """
+    return re.split(r"[_.]", job_id, maxsplit=1)[0]
+
+def states_by_job(states, precedence=_LISTED_PRECEDENCE):
+    """
+    Reduce per-task states to one state per base job id, taking the first
+    state in precedence among the tasks.
+    """
+    jobs = {}
+    for job_id, state in states.items():
+        base = base_job_id(job_id)
+        jobs[base] = _worst(jobs[base], state, precedence) if base in jobs else state
+    return jobs
+
+def parse_submit_output(scheduler, text):
+    """
+    Job id from sbatch --parsable ("123" or "123;cluster") or qsub
+    ("Your job 123 (...) has been submitted", "Your job-array 123.1-10:1 ...").
+    """
+    if scheduler == "slurm":
+        match = re.search(r"^\s*(\d+(?:_\d+)?)", text)
+    else:
+        match = re.search(r"Your job(?:-array)?\s+(\d+)", text) or re.search(r"^\s*(\d+)", text)
+    if not match:
+        raise RuntimeError(f"Could not read a job id from submission output: {text.strip()!r}")
+    return match.group(1)
+
+def parse_status_output(scheduler, text):
+    """
+    Map job id -> state from one squeue/qstat listing. Slurm array tasks keep
+    their "123_4" ids; UGE lists every task of an array under the job id, so
+    those lines are merged (see states_by_job).
+    """
+    states = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts or not parts[0][:1].isdigit():
+            continue
+        if scheduler == "slurm" and len(parts) >= 2:
+            state = _slurm_state(parts[1])
+        elif scheduler == "uge" and len(parts) >= 5:
+            state = _uge_state(parts[4])
+        else:
+            continue
+        job_id = parts[0]
+        states[job_id] = _worst(states[job_id], state, _LISTED_PRECEDENCE) if job_id in states else state
+    return states
+
+def parse_accounting_output(text):
+    """
+    Map job id -> final state from sacct -P output (JobID|State).
+    """
+    states = {}
+    for line in text.splitlines():
+        parts = line.strip().split("|")
+        if len(parts) >= 2 and parts[0]:
+            states[parts[0]] = _slurm_state(parts[1])
+    return states
+
+class SchedulerClient:
+    """
+    Submit job scripts with sbatch/qsub and track them with one batched
+    squeue/qstat listing per poll, whatever the number of jobs. Statuses are
+    cached between polls; the poll interval starts at min_interval, grows by
+    `backoff` after every poll in which nothing changed (or the scheduler
+    command failed) up to max_interval, and resets when a job changes state.
+    Jobs that leave the listing get their final state from one batched
+    accounting call (sacct) where available, otherwise FINISHED. Array jobs
+    are tracked by their base id and stay active while any task is listed.
+    Commands are templates ({user}, {job_ids}) so fake schedulers can stand
+    in for tests. Safe to share between threads: concurrent polls run one
+    scheduler query per interval, not one each.
+    """
+
+    def __init__(self, scheduler="slurm", submit_cmd=None, status_cmd=None, accounting_cmd=None, user=None,
+                 min_interval=10.0, max_interval=300.0, backoff=2.0, command_timeout=60.0, state_file=None):
+        scheduler = scheduler.lower()
+        if scheduler in ("sge", "uge", "qsub"):
+            scheduler = "uge"
+        if scheduler not in SCHEDULER_COMMANDS:
+            raise ValueError(f"Unknown scheduler '{scheduler}'. Choose one of {sorted(SCHEDULER_COMMANDS)}.")
+        defaults = SCHEDULER_COMMANDS[scheduler]
+        self.scheduler = scheduler
+        self.submit_cmd = submit_cmd or defaults["submit"]
+        self.status_cmd = status_cmd or defaults["status"]
+        self.accounting_cmd = accounting_cmd if accounting_cmd is not None else defaults["accounting"]
+        self.user = user or getpass.getuser()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.command_timeout = command_timeout
+        self.state_file = state_file
+        self.interval = min_interval
+        self.queries = 0
+        self._last_poll = None
+        self.jobs = self._load_state()
+        # _lock guards self.jobs; _poll_lock makes the interval check and its query one step.
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+
+    def _command(self, template, **fields):
+        fields.setdefault("user", self.user)
+        return [part.format(**fields) for part in shlex.split(template)]
+
+    def _run(self, command, cwd=None):
+        result = subprocess.run(command, cwd=cwd, capture_output=True, text=True, timeout=self.command_timeout)
+        if result.returncode != 0:
+            raise RuntimeError(f"{command[0]} failed ({result.returncode}): {result.stderr.strip()}")
+        return result.stdout
+
+    def submit(self, script_path, extra_args=(), cwd=None):
+        """
+        Submit a job script; returns the scheduler's job id.
+        """
+        script_path = os.path.abspath(script_path)
+        cwd = os.path.abspath(cwd or os.path.dirname(script_path))
+        command = self._command(self.submit_cmd) + list(extra_args) + [script_path]
+        job_id = parse_submit_output(self.scheduler, self._run(command, cwd=cwd))
+        with self._lock:
+            self.jobs[job_id] = {"job_id": job_id, "script": script_path, "cwd": cwd,
+                                 "status": PENDING, "submitted": time.time(), "updated": time.time()}
+            # New work: check on it soon.
+            self.interval = self.min_interval
+        self._save_state()
+        return job_id
+
+    def poll(self, force=False):
+        """
+        Refresh statuses with one scheduler query if the current interval has
+        elapsed (or force); returns {job_id: status} for all tracked jobs.
+        Callers that arrive while another thread is querying wait for it and
+        then see the refreshed statuses instead of querying again.
+        """
+        with self._poll_lock:
+            changed = self._poll(force)
+        if changed:
+            self._save_state()
+        return self.statuses()
+
+    def _poll(self, force):
+        with self._lock:
+            active = [job_id for job_id, job in self.jobs.items() if job["status"] not in FINAL_STATES]
+        now = time.time()
+        due = self._last_poll is None or now - self._last_poll >= self.interval
+        if not active or not (force or due):
+            return False
+        self._last_poll = now
+        try:
+            self.queries += 1
+            tasks = parse_status_output(self.scheduler, self._run(self._command(self.status_cmd)))
+            listed = {**states_by_job(tasks), **tasks}
+            gone = [job_id for job_id in active if job_id not in listed]
+            final = {}
+            if gone and self.accounting_cmd:
+                self.queries += 1
+                records = parse_accounting_output(
+                    self._run(self._command(self.accounting_cmd, job_ids=",".join(gone))))
+                final = {**states_by_job(records, _FINAL_PRECEDENCE), **records}
+        except (RuntimeError, OSError, subprocess.TimeoutExpired) as e:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+            print(f"Scheduler query failed ({e}); retrying in {self.interval:.0f}s.")
+            return False
+        changed = False
+        with self._lock:
+            for job_id in active:
+                if job_id in listed:
+                    status = listed[job_id]
+                else:
+                    status = final.get(job_id, FINISHED)
+                    if status in (PENDING, RUNNING):
+                        # Accounting lags the queue; the job has left it, so it ended.
+                        status = FINISHED
+                job = self.jobs[job_id]
+                if status != job["status"]:
+                    job["status"], job["updated"] = status, now
+                    changed = True
+            self.interval = self.min_interval if changed else min(self.interval * self.backoff, self.max_interval)
+        return changed
+
+    def status(self, job_id):
+        """
+        Cached status of one job (refreshed by poll).
+        """
+        return self.jobs[job_id]["status"]
+
+    def statuses(self, job_ids=None):
+        with self._lock:
+            job_ids = list(self.jobs) if job_ids is None else job_ids
+            return {job_id: self.jobs[job_id]["status"] for job_id in job_ids}
+
+    def summary(self):
+        counts = {}
+        with self._lock:
+            for job in self.jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
+
+    def wait(self, job_ids=None, timeout=None, on_change=None, sleep=time.sleep):
+        """
+        Poll until the jobs reach a final state or timeout seconds pass.
+        on_change(statuses) is called whenever a status changes.
+        """
+        job_ids = list(self.statuses()) if job_ids is None else list(job_ids)
+        deadline = None if timeout is None else time.time() + timeout
+        previous = self.statuses(job_ids)
+        while True:
+            self.poll()
+            current = self.statuses(job_ids)
+            if current != previous and on_change is not None:
+                on_change(current)
+            previous = current
+            if all(status in FINAL_STATES for status in current.values()):
+                return current
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                return current
+            next_poll = self._last_poll + self.interval - time.time()
+            sleep(max(0.0, next_poll if remaining is None else min(next_poll, remaining)))
+
+    def harvest(self, state_file=None, patterns=None, processes=None):
+        """
+        Parse outputs of jobs that have left the queue with the result harvester.
+        """
+        from .result_harvester import harvest_results
+        with self._lock:
+            directories = sorted({job["cwd"] for job in self.jobs.values()
+                                  if job["status"] in (COMPLETED, FINISHED)})
+        if not directories:
+            return []
+        return harvest_results(directories, state_file=state_file, patterns=patterns, processes=processes)
+
+    def _load_state(self):
+        if self.state_file and os.path.exists(self.state_file):
+            with open(self.state_file) as f:
+                return {job["job_id"]: job for job in json.load(f)}
+        return {}
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        with self._lock:
+            snapshot = json.dumps(list(self.jobs.values()), indent=2)
+        tmp = f"{self.state_file}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(snapshot)
+        os.replace(tmp, self.state_file)
@@ -0,0 +1,140 @@
+import re
+import json
+
+class PatchError(ValueError):
+    """
+    Raised when an LLM-proposed patch cannot be parsed or does not apply.
+    """
+
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,\d+)? \+\d+(?:,\d+)? @@")
+_FENCE_RE = re.compile(r"^```[\w-]*\s*\n(.*?)\n?```\s*$", re.DOTALL)
+
+def number_lines(script):
+    """
+    Prefix every line with its 1-based number, as shown to the LLM so it can
+    address lines in its edits.
+    """
+    lines = script.splitlines()
+    width = len(str(len(lines)))
+    return "\n".join(f"{i:>{width}}| {line}" for i, line in enumerate(lines, 1))
+
+def _strip_fence(text):
+    text = text.strip()
+    match = _FENCE_RE.match(text)
+    return match.group(1) if match else text
+
+def _join(lines, like):
+    return "\n".join(lines) + ("\n" if like.endswith("\n") else "")
+
+def parse_unified_diff(text):
+    """
+    Return the hunks of a unified diff as [{"old_start", "lines": [(tag, text)]}].
+    File headers are ignored; a bare empty line inside a hunk is read as an
+    empty context line (LLMs often drop the leading space).
+    """
+    hunks, current = [], None
+    for line in text.splitlines():
+        match = _HUNK_RE.match(line)
+        if match:
+            current = {"old_start": int(match.group(1)), "lines": []}
+            hunks.append(current)
+            continue
+        if current is None or line.startswith("\\"):
+            continue
+        tag = line[:1] or " "
+        if tag not in " +-":
+            raise PatchError(f"Unexpected line in diff hunk: {line!r}")
+        current["lines"].append((tag, line[1:]))
+    if not hunks:
+        raise PatchError("No diff hunks found.")
+    return hunks
+
+def _locate(lines, block, expected, start):
+    """
+    Position of block in lines at or after start, preferring the match nearest
+    to the line number the diff claims (LLM line numbers drift).
+    """
+    if not block:
+        return min(max(expected, start), len(lines))
+    target = [line.rstrip() for line in block]
+    stripped = [line.rstrip() for line in lines]
+    matches = [i for i in range(start, len(lines) - len(block) + 1)
+               if stripped[i:i + len(block)] == target]
+    if not matches:
+        raise PatchError(f"Hunk context not found near line {expected + 1}: {block[0]!r}")
+    return min(matches, key=lambda i: abs(i - expected))
+
+def apply_unified_diff(script, diff_text):
+    """
+    Apply a unified diff to script. Hunks are applied in line-number order and
+    may not overlap; their context/removed lines must match the script
+    (trailing whitespace ignored).
+    """
+    lines = script.splitlines()
+    out, pos = [], 0
+    for hunk in sorted(parse_unified_diff(diff_text), key=lambda h: h["old_start"]):
+        old = [text for tag, text in hunk["lines"] if tag != "+"]
+        new = [text for tag, text in hunk["lines"] if tag != "-"]
+        # "-N,0" (pure insertion) means after line N; otherwise the block starts at line N.
+        expected = hunk["old_start"] if not old else hunk["old_start"] - 1
+        at = _locate(lines, old, expected, pos)
+        out.extend(lines[pos:at])
+        out.extend(new)
+        pos = at + len(old)
+    out.extend(lines[pos:])
+    return _join(out, script)
+
+def apply_line_edits(script, edits):
+    """
+    Apply JSON line edits (1-based, inclusive line numbers):
+      {"action": "replace", "start": 3, "end": 4, "text": "..."}
+      {"action": "delete", "start": 7, "end": 7}
+      {"action": "insert", "after": 10, "text": "..."}   (after=0 inserts at the top)
+    Edits may not overlap; they are applied bottom-up so numbers refer to the
+    original script.
+    """
+    lines = script.splitlines()
+    spans = []
+    for edit in edits:
+        action = edit.get("action")
+        if action == "insert":
+            start = end = int(edit["after"])
+            if not 0 <= start <= len(lines):
+                raise PatchError(f"Insert position {start} outside script of {len(lines)} lines.")
+        elif action in ("replace", "delete"):
+            start, end = int(edit["start"]) - 1, int(edit.get("end", edit["start"]))
+            if not 0 <= start < end <= len(lines):
+                raise PatchError(f"Line range {start + 1}-{end} outside script of {len(lines)} lines.")
+        else:
+            raise PatchError(f"Unknown edit action {action!r}.")
+        text = edit.get("text", "") if action != "delete" else ""
+        spans.append((start, end, text.splitlines() if action != "delete" else []))
+    spans.sort(key=lambda s: (s[0], s[1]))
+    for (_, end, _), (start, _, _) in zip(spans, spans[1:]):
+        if start < end:
+            raise PatchError("Line edits overlap.")
+    for start, end, new in reversed(spans):
+        lines[start:end] = new
+    return _join(lines, script)
+
+def apply_patch(script, response_text):
+    """
+    Apply an LLM edit response, either a JSON list of line edits or a unified
+    diff (optionally inside a code fence). Raises PatchError if it does not
+    parse or apply cleanly.
+    """
+    text = _strip_fence(response_text)
+    if text.startswith(("[", "{")):
+        try:
+            edits = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise PatchError(f"Invalid JSON edits: {e}") from e
+        if isinstance(edits, dict):
+            edits = edits.get("edits", [edits])
+        try:
+            return apply_line_edits(script, edits)
+        except PatchError:
+            raise
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise PatchError(f"Malformed line edit: {e}") from e
+    return apply_unified_diff(script, text)
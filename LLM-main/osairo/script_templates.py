@@ -0,0 +1,202 @@
+import os
+import re
+import json
+import hashlib
+import numpy as np
+
+_SLOT_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+def _rules(*rules):
+    return [(re.compile(pattern, re.IGNORECASE), slots) for pattern, slots in rules]
+
+# Per simulation type: (line pattern, slot name for each captured group).
+# Only literal values are turned into slots; references such as ${T} or v_T are left alone.
+# Groups sharing a slot (Tstart/Tstop, per-group ref_t) are only templated when their values are equal.
+SLOT_RULES = {
+    "raspa": _rules(
+        (r"^\s*ExternalPressure\s+(\S+)", ("pressure",)),
+        (r"^\s*ExternalTemperature\s+(\S+)", ("temperature",)),
+        (r"^\s*FrameworkName\s+(\S+)", ("framework",)),
+        (r"^\s*UnitCells\s+(\d+\s+\d+\s+\d+)", ("unit_cells",)),
+        (r"^\s*NumberOfCycles\s+(\S+)", ("cycles",)),
+    ),
+    "lammps": _rules(
+        (r"^\s*variable\s+(?:T|temp|temperature)\s+equal\s+(\S+)", ("temperature",)),
+        (r"^\s*variable\s+(?:P|press|pressure)\s+equal\s+(\S+)", ("pressure",)),
+        (r"^\s*velocity\s+\S+\s+create\s+(\S+)", ("temperature",)),
+        (r"^\s*fix\s+.*?\btemp\s+(\S+)\s+(\S+)", ("temperature", "temperature")),
+        (r"^\s*fix\s+.*?\b(?:iso|aniso)\s+(\S+)\s+(\S+)", ("pressure", "pressure")),
+        (r"^\s*run\s+(\d+)", ("steps",)),
+    ),
+    "gromacs": _rules(
+        (r"^\s*ref[_-]t\s*=\s*([^\s;]+)(?:[ \t]+([^\s;]+))?(?:[ \t]+([^\s;]+))?", ("temperature",) * 3),
+        (r"^\s*ref[_-]p\s*=\s*([^\s;]+)(?:[ \t]+([^\s;]+))?(?:[ \t]+([^\s;]+))?", ("pressure",) * 3),
+        (r"^\s*gen[_-]temp\s*=\s*([^\s;]+)", ("temperature",)),
+        (r"^\s*nsteps\s*=\s*([^\s;]+)", ("steps",)),
+    ),
+}
+SLOT_RULES["gcmc"] = SLOT_RULES["montecarlo"] = SLOT_RULES["raspa"]
+SLOT_RULES["gromacs md"] = SLOT_RULES["gromacs"]
+
+def format_value(value):
+    """
+    Format a slot value for a simulation input (integers without a decimal point).
+    """
+    if isinstance(value, str):
+        return value
+    value = float(value)
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else f"{value:.10g}"
+
+def _capture_line(line, rules):
+    captured = {}
+    for pattern, slots in rules:
+        match = pattern.match(line)
+        if not match:
+            continue
+        values = {}
+        for group, slot in enumerate(slots, 1):
+            value = match.group(group)
+            if value is not None:
+                values.setdefault(slot, set()).add(value)
+        if any(len(distinct) > 1 for distinct in values.values()):
+            # e.g. a ramped thermostat (Tstart != Tstop): one slot would flatten it.
+            continue
+        parts, last = [], 0
+        for group, slot in enumerate(slots, 1):
+            value = match.group(group)
+            if value is None or value.startswith(("$", "v_", "{{")):
+                continue
+            parts.append(line[last:match.start(group)])
+            parts.append("{{" + slot + "}}")
+            last = match.end(group)
+            captured.setdefault(slot, value)
+        line = "".join(parts) + line[last:]
+    return line, captured
+
+class ScriptTemplate:
+    """
+    A simulation input with named {{slot}} placeholders and the seed script's
+    values as defaults. Rendering a point is a single regex substitution, so
+    scripts for many selected points come out in milliseconds with the same
+    structure as the seed.
+    """
+
+    def __init__(self, simulation_type, text, defaults=None, context=""):
+        self.simulation_type = simulation_type
+        self.text = text
+        self.defaults = dict(defaults or {})
+        self.context = context
+
+    @property
+    def slots(self):
+        return sorted(set(_SLOT_RE.findall(self.text)))
+
+    def covers(self, values):
+        """
+        True if every value of the point has a slot and every slot without a
+        seed value gets one. Slots the point does not vary (e.g. the
+        temperature of a pressure isotherm) keep the seed's value: they are
+        part of the fixed setup the template is keyed on.
+        """
+        slots = set(self.slots)
+        return (bool(values) and set(values) <= slots
+                and all(slot in values or slot in self.defaults for slot in slots))
+
+    def render(self, values=None, **kwargs):
+        """
+        Fill the slots from values/kwargs, falling back to the seed values.
+        """
+        merged = {**self.defaults, **(values or {}), **kwargs}
+        missing = [slot for slot in self.slots if slot not in merged]
+        if missing:
+            raise ValueError(f"No value for template slots {missing}.")
+        return _SLOT_RE.sub(lambda m: format_value(merged[m.group(1)]), self.text)
+
+    def to_dict(self):
+        return {"simulation_type": self.simulation_type, "text": self.text, "defaults": self.defaults,
+                "context": self.context}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["simulation_type"], data["text"], data.get("defaults"), data.get("context", ""))
+
+def capture_template(simulation_type, script, context=""):
+    """
+    Turn a generated (or user-edited) script into a ScriptTemplate: known
+    state-point lines for the simulation type become slots, and any {{name}}
+    placeholders already in the script are kept as required slots.
+    context records the fixed simulation setup (framework, molecule,
+    ensemble, ...) the script was generated for.
+    """
+    rules = SLOT_RULES.get(simulation_type.lower(), [])
+    lines, defaults = [], {}
+    for line in script.splitlines(keepends=True):
+        body = line.rstrip("\r\n")
+        templated, captured = _capture_line(body, rules)
+        lines.append(templated + line[len(body):])
+        for slot, value in captured.items():
+            defaults.setdefault(slot, value)
+    return ScriptTemplate(simulation_type, "".join(lines), defaults, context)
+
+def point_values(point, columns):
+    """
+    Map a selected point onto slot names, e.g. columns "pressure, temperature".
+    """
+    if isinstance(columns, str):
+        columns = columns.split(",")
+    names = [str(c).strip().lower().replace(" ", "_") for c in columns]
+    return dict(zip(names, np.atleast_1d(np.asarray(point)).tolist()))
+
+def render_scripts(template, points, columns, folder, name_format="{simulation_type}_simulation_{index}.input",
+                   indices=None):
+    """
+    Render and write one script per row of points; returns the file paths.
+    """
+    os.makedirs(folder, exist_ok=True)
+    indices = range(len(points)) if indices is None else indices
+    paths = []
+    for index, point in zip(indices, points):
+        path = os.path.join(folder, name_format.format(simulation_type=template.simulation_type, index=index))
+        with open(path, "w") as f:
+            f.write(template.render(point_values(point, columns)))
+        paths.append(path)
+    return paths
+
+def _context_key(context):
+    return hashlib.sha1(" ".join(context.split()).encode()).hexdigest()[:12] if context.strip() else ""
+
+class TemplateStore:
+    """
+    One template per simulation type and fixed simulation setup (the context
+    string: framework, molecule, ensemble, unit cells, ...), stored as JSON
+    in a folder and cached in memory after the first load. A different
+    setup never reuses another setup's template.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._cache = {}
+
+    def _path(self, simulation_type, context=""):
+        name = re.sub(r"\W+", "_", simulation_type.lower())
+        key = _context_key(context)
+        return os.path.join(self.folder, f"{name}_{key}.json" if key else f"{name}.json")
+
+    def get(self, simulation_type, context=""):
+        path = self._path(simulation_type, context)
+        if path not in self._cache:
+            if not os.path.exists(path):
+                return None
+            with open(path) as f:
+                self._cache[path] = ScriptTemplate.from_dict(json.load(f))
+        return self._cache[path]
+
+    def save(self, template):
+        os.makedirs(self.folder, exist_ok=True)
+        path = self._path(template.simulation_type, template.context)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(template.to_dict(), f, indent=2)
+        os.replace(tmp, path)
+        self._cache[path] = template
+        return path
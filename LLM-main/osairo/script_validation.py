@@ -0,0 +1,185 @@
+import re
+
+# simulation type (lower case) -> fn(script) returning a list of issue strings
+VALIDATORS = {}
+
+def register_validator(*simulation_types):
+    """
+    Decorator registering an offline validator for one or more simulation types.
+    """
+    def decorator(func):
+        for name in simulation_types:
+            VALIDATORS[name] = func
+        return func
+    return decorator
+
+def _lines(script, comment_chars="#"):
+    """
+    Non-empty lines with comments stripped. Each format has its own comment
+    characters (LAMMPS/RASPA '#', GROMACS ';', GULP '#' and '!'), so a value
+    containing another format's marker is kept intact.
+    """
+    splitter = re.compile("[" + re.escape(comment_chars) + "]")
+    out = []
+    for line in script.splitlines():
+        line = splitter.split(line, maxsplit=1)[0].strip()
+        if line:
+            out.append(line)
+    return out
+
+def _is_number(token):
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+def _common_issues(script):
+    issues = []
+    if not script.strip():
+        return ["Script is empty."]
+    if "```" in script:
+        issues.append("Script contains markdown code fences (```); output plain text only.")
+    first = script.strip().splitlines()[0].strip().lower()
+    if first.startswith(("here is", "here's", "sure", "below is", "certainly")):
+        issues.append(f"Script starts with commentary ({first[:40]!r}) instead of input commands.")
+    return issues
+
+@register_validator("raspa", "gcmc", "montecarlo")
+def validate_raspa(script):
+    issues = []
+    keys = {}
+    for line in _lines(script):
+        parts = line.split()
+        keys.setdefault(parts[0].lower(), parts[1:])
+    for key in ("SimulationType", "NumberOfCycles", "ExternalTemperature", "ExternalPressure"):
+        if key.lower() not in keys:
+            issues.append(f"Missing required RASPA keyword {key}.")
+    for key in ("NumberOfCycles", "NumberOfInitializationCycles", "PrintEvery", "ExternalTemperature",
+                "ExternalPressure", "CutOff"):
+        values = keys.get(key.lower())
+        if values is not None and not (values and all(_is_number(v) for v in values)):
+            issues.append(f"{key} must be numeric, got {' '.join(values) or 'nothing'}.")
+    if "framework" in keys:
+        if "frameworkname" not in keys:
+            issues.append("Framework section without FrameworkName.")
+        if "box" in keys:
+            issues.append("Box section present together with a Framework (MOF); remove the Box section.")
+        unit_cells = keys.get("unitcells")
+        if unit_cells is not None and (len(unit_cells) != 3 or not all(v.isdigit() for v in unit_cells)):
+            issues.append("UnitCells must be three positive integers.")
+    component = [v.lower() for v in keys.get("component", [])]
+    if "component" not in keys or ("moleculename" not in keys and "moleculename" not in component):
+        issues.append("No Component with a MoleculeName defined.")
+    if "swapprobability" in keys:
+        create = keys.get("createnumberofmolecules")
+        if create and create[0] not in ("0", "0.0"):
+            issues.append("CreateNumberOfMolecules should be 0 for a GCMC (swap) simulation.")
+    return issues
+
+@register_validator("lammps")
+def validate_lammps(script):
+    issues = []
+    commands = {}
+    for line in _lines(script):
+        parts = line.split()
+        commands.setdefault(parts[0].lower(), []).append(parts[1:])
+    for command in ("units", "atom_style", "pair_style", "thermo", "dump"):
+        if command not in commands:
+            issues.append(f"Missing LAMMPS command '{command}'.")
+    pair_styles = [args[0].lower() for args in commands.get("pair_style", []) if args]
+    if "pair_coeff" not in commands and not set(pair_styles) <= {"none", "zero"}:
+        issues.append("pair_style given but no pair_coeff lines.")
+    if not ({"read_data", "read_restart", "create_box"} & set(commands)):
+        issues.append("No simulation box: need read_data, read_restart or region + create_box.")
+    if "create_box" in commands and "region" not in commands:
+        issues.append("create_box used without a region definition.")
+    if not ({"run", "minimize", "rerun"} & set(commands)):
+        issues.append("No run or minimize command.")
+    if any(not args for args in commands.get("run", [])):
+        issues.append("run needs a step count.")
+    return issues
+
+@register_validator("gromacs", "gromacs md")
+def validate_gromacs(script):
+    issues = []
+    params = {}
+    for line in _lines(script, ";"):
+        if "=" in line:
+            key, value = line.split("=", 1)
+            params[key.strip().lower().replace("-", "_")] = value.split()
+    for key in ("integrator", "nsteps"):
+        if key not in params:
+            issues.append(f"Missing .mdp parameter {key}.")
+    integrator = (params.get("integrator") or [""])[0].lower()
+    if integrator in ("md", "md-vv", "md-vv-avek", "sd", "bd") and "dt" not in params:
+        issues.append(f"Integrator {integrator} needs dt.")
+    tcoupl = (params.get("tcoupl") or ["no"])[0].lower()
+    if tcoupl != "no" and integrator not in ("sd", "bd"):
+        groups = len(params.get("tc_grps", []))
+        for key in ("tc_grps", "tau_t", "ref_t"):
+            if key not in params:
+                issues.append(f"tcoupl = {tcoupl} needs {key}.")
+            elif groups and len(params[key]) != groups:
+                issues.append(f"{key} has {len(params[key])} values for {groups} tc-grps.")
+    pcoupl = (params.get("pcoupl") or ["no"])[0].lower()
+    if pcoupl != "no":
+        for key in ("tau_p", "ref_p", "compressibility"):
+            if key not in params:
+                issues.append(f"pcoupl = {pcoupl} needs {key}.")
+    return issues
+
+_GULP_BLOCKS = {"cell", "vectors", "frac", "fractional", "cart", "cartesian", "species", "buck", "buckingham",
+                "three", "spring", "lennard", "morse", "harm", "harmonic", "dump", "output", "name", "end"}
+
+@register_validator("gulp", "zeolite")
+def validate_gulp(script):
+    issues = []
+    lines = _lines(script, "#!")
+    if not lines:
+        return issues
+    lowered = [line.lower() for line in lines]
+    if not any(line.split()[0] in ("cell", "vectors") for line in lowered):
+        issues.append("Missing cell (or vectors) block.")
+    if "cell" in lowered:
+        values = lines[lowered.index("cell") + 1].split() if lowered.index("cell") + 1 < len(lines) else []
+        if len(values) < 6 or not all(_is_number(v) for v in values[:6]):
+            issues.append("cell must be followed by a b c alpha beta gamma.")
+    if not any(line.split()[0] in ("frac", "fractional", "cart", "cartesian") for line in lowered):
+        issues.append("Missing fractional/cartesian coordinate block.")
+    if not any(line.startswith("dump") for line in lowered):
+        issues.append("Missing 'dump <name>.gout' line.")
+    # Species named in coordinates must be declared in the species block.
+    declared, used, block = set(), set(), None
+    for line in lines:
+        parts = line.split()
+        head = parts[0].lower()
+        if head in _GULP_BLOCKS:
+            block = head
+            continue
+        if block in ("frac", "fractional", "cart", "cartesian") and len(parts) >= 4:
+            label = parts[0]
+            kind = parts[1].lower() if parts[1].lower() in ("core", "shel", "shell") else "core"
+            used.add((label, kind[:4]))
+            coords = [p for p in parts[1:] if _is_number(p)][:3]
+            if len(coords) < 3:
+                issues.append(f"Coordinate line without three numbers: {line!r}.")
+        elif block == "species" and len(parts) >= 3:
+            declared.add((parts[0], parts[1].lower()[:4]))
+    if declared:
+        undeclared = sorted(f"{label} {kind}" for label, kind in used - declared)
+        if undeclared:
+            issues.append(f"Species used in coordinates but not in species block: {', '.join(undeclared)}.")
+    return issues
+
+def validate_script(simulation_type, script):
+    """
+    Run the offline checks for simulation_type; returns a list of issues
+    (empty if the script looks submittable). Unknown types get only the
+    generic checks (empty output, code fences, leading commentary).
+    """
+    issues = _common_issues(script)
+    validator = VALIDATORS.get(simulation_type.lower())
+    if validator is not None and script.strip():
+        issues += validator(script)
+    return issues
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .config import SCORING_CHUNK_SIZE, worker_threads
+from .candidate_grid import CandidateGrid
+
+# Per-worker state, set once by _init_worker.
+_WORKER = {}
+
+def _init_worker(model_path, model_type, pool_path, acquisition, precision, exclude, params):
+    from .model_store import load_model
+    from .acquisition import get_acquisition
+    model = load_model(model_path, model_type)
+    X = np.load(pool_path, mmap_mode="r") if isinstance(pool_path, str) else pool_path
+    entry = get_acquisition(acquisition)
+    state = entry["prepare"](model, X, **params) if entry["prepare"] else None
+    _WORKER.update(model=model, model_type=model_type, X=X, acquisition=acquisition,
+                   precision=precision, exclude=exclude, params=params, state=state)
+
+def _score_shard(bounds):
+    """
+    Worker: score rows [start, stop) and return that shard's local top-k.
+    """
+    from .acquisition import score_candidates
+    start, stop, top_k = bounds
+    w = _WORKER
+    X = np.asarray(w["X"][start:stop])
+    scores = score_candidates(w["model"], X, w["acquisition"], w["model_type"],
+                              precision=w["precision"], state=w["state"], exclude=w["exclude"], **w["params"])
+    k = min(top_k, len(scores))
+    local = np.argpartition(-scores, k - 1)[:k]
+    return local + start, scores[local]
+
+def merge_top_k(results, top_k):
+    """
+    Merge per-shard (indices, scores) into the global top-k, best first.
+    """
+    indices = np.concatenate([r[0] for r in results])
+    scores = np.concatenate([r[1] for r in results])
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    return indices[order], scores[order]
+
+def score_sharded(model, X_unlabeled, model_type='gp', top_k=1, n_workers=None, shard_size=None,
+                  acquisition='variance', precision='float64', exclude=None, **params):
+    """
+    Score a large candidate pool across a process pool and return the global
+    top-k as (indices, scores), best first.
+    model may be a trained model or a path written by model_store.save_model;
+    X_unlabeled may be an array, a np.memmap, a path to a .npy file or a
+    CandidateGrid. Each
+    worker loads the model once and memory-maps the pool, so shards are read
+    from the page cache instead of being pickled to every worker. Worker
+    start-up (TensorFlow import, model load) takes seconds, so this only pays
+    off for pools that take longer than that to score serially. Acquisition
+    params must be picklable (a module-level cost_fn rather than a closure).
+    """
+    from .model_store import save_model
+    tmp_dir = tempfile.mkdtemp(prefix="osairo_shards_")
+    try:
+        if isinstance(model, str):
+            model_path = model
+        else:
+            model_path = save_model(model, model_type, os.path.join(tmp_dir, "model"))
+        if isinstance(X_unlabeled, (str, CandidateGrid)):
+            # A lazy grid is pickled as its axes; workers build their shards' rows.
+            pool_path = X_unlabeled
+        elif isinstance(X_unlabeled, np.memmap) and X_unlabeled.filename and X_unlabeled.filename.endswith(".npy"):
+            pool_path = X_unlabeled.filename
+        else:
+            pool_path = os.path.join(tmp_dir, "pool.npy")
+            np.save(pool_path, np.asarray(X_unlabeled))
+        n_rows = len(np.load(pool_path, mmap_mode="r") if isinstance(pool_path, str) else pool_path)
+
+        n_workers = n_workers or os.cpu_count() or 1
+        # Several shards per worker keeps the pool busy when shards finish unevenly.
+        shard_size = shard_size or max(1, min(SCORING_CHUNK_SIZE, -(-n_rows // (4 * n_workers))))
+        bounds = [(start, min(start + shard_size, n_rows), top_k) for start in range(0, n_rows, shard_size)]
+        threads = max(1, (os.cpu_count() or 1) // n_workers)
+        ctx = multiprocessing.get_context("spawn")
+        # Set in the parent: a spawned worker imports numpy before any initializer runs.
+        with worker_threads(threads), \
+                ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx, initializer=_init_worker,
+                                    initargs=(model_path, model_type, pool_path, acquisition, precision,
+                                              exclude, params)) as pool:
+            results = list(pool.map(_score_shard, bounds))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return merge_top_k(results, top_k)
@@ -1,6 +1,9 @@
 # osairo/simulation_scripts.py
-from langchain_openai import ChatOpenAI
 from .config import OPENAI_API_KEY
+from .profiling import invoke_llm
+from .script_patch import PatchError, apply_patch, number_lines
+from .script_validation import validate_script
+from .forcefields import get_forcefield
 import click
 
 def generate_simulation_script(simulation_type, simulation_parameters):
@@ -8,6 +11,7 @@ def generate_simulation_script(simulation_type, simulation_parameters):
     Generate a submission-ready simulation input script using ChatOpenAI.
     The script is formatted for submission (e.g., a clean RASPA GCMC script with no Box section if a MOF is used).
     """
+    from langchain_openai import ChatOpenAI
     chat = ChatOpenAI(api_key=OPENAI_API_KEY, temperature=0.0)
 
     # Extensive system message covering common simulation types.
@@ -54,6 +58,8 @@ def generate_simulation_script(simulation_type, simulation_parameters):
             "Output the script in plain text with no extra commentary."
         )
     elif simulation_type.lower() in ["gulp", "zeolite"]:
+        # Same species/potential parameters as the CIF -> GULP generator.
+        forcefield_lines = "\n".join(get_forcefield().gulp_lines())
         system_message = (
             "You are an expert in GULP (General Utility Lattice Program) for zeolite simulations. "
             "Generate a complete GULP input file (.gin) from CIF data. "
@@ -61,21 +67,11 @@ def generate_simulation_script(simulation_type, simulation_parameters):
             "opti conp\n"
             "cell\n"
             "[a] [b] [c] [alpha] [beta] [gamma]\n"
-            "fractional\n"
-            "[symmetry-expanded atomic coordinates with core/shel for O atoms]\n"
-            "species\n"
-            "Si core 4.0000\n"
-            "O core 0.8690\n"
-            "O shel -2.8690\n"
-            "buck\n"
-            "Si core O shel 1283.037674 0.320500 10.660000 0.0 10.0\n"
-            "buck\n"
-            "O shel O shel 22764.0 0.149 27.88 0.0 12.0\n"
-            "spring\n"
-            "O 74.92\n"
-            "three\n"
-            "Si core O shel O shel 2.097240 109.470000 1.8000 1.8000 3.2000 0 0\n"
+            "frac\n"
+            "[symmetry-expanded atomic coordinates, with O2 core and O2 shel lines for O atoms]\n"
+            f"{forcefield_lines}\n"
             "dump [filename].gout\n\n"
+            "Keep only the species and potential lines for elements present in the structure. "
             "Apply symmetry operations to expand asymmetric unit to full unit cell. "
             "Output the complete .gin file in plain text."
         )
@@ -97,23 +93,72 @@ def generate_simulation_script(simulation_type, simulation_parameters):
         {"role": "user", "content": user_message}
     ]
 
-    response = chat.invoke(messages)
+    response = invoke_llm(chat, messages, "simulation_script")
     return response.content
 
-def interactive_generate_simulation_script(simulation_type, simulation_parameters):
+def request_script_patch(chat, current_script, modifications):
+    """
+    Ask the LLM for a unified diff implementing the modifications instead of
+    the whole script, and apply it locally. Only the changed lines come back,
+    so long inputs are edited with a fraction of the output tokens.
+    Returns the updated script, or None if the patch does not apply.
+    """
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "You are an assistant that helps update simulation input scripts. The current script is shown with line numbers "
+                "('N| ' prefixes, which are not part of the script). Reply ONLY with a unified diff against the script: "
+                "'@@ -start,count +start,count @@' hunk headers using those line numbers, two lines of unchanged context around each change, "
+                "'-' for removed lines, '+' for added lines, and no line-number prefixes, file headers or commentary."
+            )
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Current script:\n{number_lines(current_script)}\n"
+                f"Requested modifications:\n{modifications}\n"
+                "Provide the unified diff."
+            )
+        }
+    ]
+    response = invoke_llm(chat, messages, "simulation_script_patch")
+    try:
+        return apply_patch(current_script, response.content)
+    except PatchError as e:
+        click.echo(f"Patch did not apply ({e}); regenerating the full script.")
+        return None
+
+def prompt_ensemble():
+    """
+    Ask which ensemble to simulate (e.g., 'NVT', 'NPT', 'μVT').
+    """
+    return click.prompt("Enter ensemble type for simulation (e.g., 'NVT', 'NPT', 'μVT')", default="NVT").strip()
+
+def ensemble_parameters(ensemble):
+    """
+    Parameter lines for an ensemble: μVT becomes a Monte Carlo run with 1000
+    initialization cycles; any other ensemble is passed on by name.
+    """
+    if ensemble.lower() in ["μvt", "muvt", "mu vt"]:
+        return "\nSimulationType MonteCarlo\nNumberOfInitializationCycles 1000\n"
+    return f"\nEnsemble: {ensemble}\n"
+
+def interactive_generate_simulation_script(simulation_type, simulation_parameters, edit_mode="patch", ensemble=None):
     """
     Generate an initial sample simulation input script and allow interactive modification.
     First, prompt for the simulation ensemble (e.g., 'NVT', 'NPT', 'μVT'). If the ensemble is μVT, automatically add parameters so that:
       - SimulationType becomes "MonteCarlo"
       - NumberOfInitializationCycles is set to 1000.
     Then generate the sample script, display it (without extra headings), and allow iterative modifications via a chat interface.
+    With edit_mode="patch" each modification is requested as a diff and applied locally (see request_script_patch),
+    falling back to regenerating the whole script when the diff does not apply; edit_mode="full" always regenerates.
+    Pass ensemble when it has already been asked for; it is only prompted when None.
     Return the final script.
     """
-    ensemble = click.prompt("Enter ensemble type for simulation (e.g., 'NVT', 'NPT', 'μVT')", default="NVT")
-    if ensemble.lower() in ["μvt", "muvt", "mu vt"]:
-        simulation_parameters += "\nSimulationType MonteCarlo\nNumberOfInitializationCycles 1000\n"
-    else:
-        simulation_parameters += f"\nEnsemble: {ensemble}\n"
+    if ensemble is None:
+        ensemble = prompt_ensemble()
+    simulation_parameters += ensemble_parameters(ensemble)
     
     click.echo("\nGenerating initial sample simulation input script...\n")
     current_script = generate_simulation_script(simulation_type, simulation_parameters)
@@ -131,12 +176,23 @@ def interactive_generate_simulation_script(simulation_type, simulation_parameter
                 click.echo("Please enter 'yes' or 'no'.")
     
     if prompt_yes_no("Would you like to modify the generated script? (yes/no)", default="no"):
+        from langchain_openai import ChatOpenAI
         chat = ChatOpenAI(api_key=OPENAI_API_KEY, temperature=0.0)
         while True:
             mod_text = click.prompt("Enter your modifications (or type 'done' to finish):", default="")
             if mod_text.lower() == "done" or not mod_text.strip():
                 break
 
+            if edit_mode == "patch":
+                updated = request_script_patch(chat, current_script, mod_text)
+                if updated is not None:
+                    current_script = updated
+                    click.echo(current_script)
+                    click.echo("")
+                    if not prompt_yes_no("Would you like to modify the script further? (yes/no)", default="no"):
+                        break
+                    continue
+
             messages = [
                 {
                     "role": "system",
@@ -154,10 +210,40 @@ def interactive_generate_simulation_script(simulation_type, simulation_parameter
                     )
                 }
             ]
-            response = chat.invoke(messages)
+            response = invoke_llm(chat, messages, "simulation_script_edit")
             current_script = response.content
             click.echo("")
             if not prompt_yes_no("Would you like to modify the script further? (yes/no)", default="no"):
                 break
     
     return current_script
+
+def ensure_valid_script(simulation_type, script, simulation_parameters, max_attempts=2):
+    """
+    Run the offline validators on a script before it is saved. On failure,
+    ask the LLM for a patch that fixes only the reported problems (falling
+    back to regenerating with the problems listed), up to max_attempts times.
+    Returns (script, remaining_issues).
+    """
+    issues = validate_script(simulation_type, script)
+    chat = None
+    for _ in range(max_attempts):
+        if not issues:
+            break
+        click.echo("Validation found problems in the script:\n" + "\n".join(f"  - {issue}" for issue in issues))
+        if chat is None:
+            from langchain_openai import ChatOpenAI
+            chat = ChatOpenAI(api_key=OPENAI_API_KEY, temperature=0.0)
+        problems = "\n".join(f"- {issue}" for issue in issues)
+        updated = request_script_patch(chat, script, f"Fix only these problems and change nothing else:\n{problems}")
+        if updated is None:
+            updated = generate_simulation_script(
+                simulation_type,
+                f"{simulation_parameters}\nA previous attempt had these problems; avoid them:\n{problems}",
+            )
+        script = updated
+        issues = validate_script(simulation_type, script)
+    if issues:
+        click.echo("WARNING: script still fails validation; review it before submitting:\n"
+                   + "\n".join(f"  - {issue}" for issue in issues))
+    return script, issues
@@ -0,0 +1,336 @@
+import os
+import json
+import hashlib
+from contextlib import contextmanager
+import numpy as np
+from .config import STRUCTURE_CACHE
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; appends are then unserialized
+    fcntl = None
+
+# Arrays are padded to this boundary inside the archive.
+_ALIGN = 64
+_INDEX = "index.jsonl"
+_LOCK = "cache.lock"
+
+# folder -> StructureCache
+_CACHES = {}
+
+class CachedStructure:
+    """
+    Parsed structure backed by the cache archive: lattice (3, 3), frac_coords
+    (n, 3), species_codes (n,) into `symbols` and, where the parser keeps
+    them, site labels. Arrays are read-only views of the memory-mapped
+    archive; meta holds the small per-file extras (cell parameters, symmetry
+    operations, ...).
+    """
+
+    def __init__(self, lattice, frac_coords, species_codes, symbols, labels=None, meta=None):
+        self.lattice = lattice
+        self.frac_coords = frac_coords
+        self.species_codes = species_codes
+        self.symbols = list(symbols)
+        self.labels = labels
+        self.meta = dict(meta or {})
+
+    def __len__(self):
+        return len(self.species_codes)
+
+    @property
+    def species(self):
+        """
+        Element symbol per site.
+        """
+        return np.asarray(self.symbols)[self.species_codes]
+
+    @property
+    def cell_params(self):
+        return self.meta.get("cell_params", {})
+
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def content_hash(data):
+    return hashlib.sha1(data).hexdigest()
+
+def encode_species(species):
+    """
+    (symbols, codes): the distinct species in order of appearance and an int16
+    code per site.
+    """
+    symbols, codes = [], np.empty(len(species), dtype=np.int16)
+    lookup = {}
+    for i, symbol in enumerate(species):
+        if symbol not in lookup:
+            lookup[symbol] = len(symbols)
+            symbols.append(symbol)
+        codes[i] = lookup[symbol]
+    return symbols, codes
+
+class StructureCache:
+    """
+    Persistent cache of parsed structure files.
+    All arrays live in one append-only binary archive that is memory-mapped
+    for reading, so cached structures load zero-copy; an append-only JSON
+    lines index maps (parser kind, absolute path) to array offsets. A file is
+    a hit without being read when its mtime and size match the index; when
+    they differ its content hash is compared (touched or copied files are
+    still hits) and only new content is parsed. Stale arrays are dropped by
+    compact(). Appends and compaction hold an exclusive lock on the folder,
+    so several processes can share one cache.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.archive = None
+        self.entries = {}
+        self.by_hash = {}
+        self.hits = 0
+        self.misses = 0
+        self._map = None
+        os.makedirs(folder, exist_ok=True)
+        self._load_index()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def index_path(self):
+        return os.path.join(self.folder, _INDEX)
+
+    @property
+    def archive_path(self):
+        return os.path.join(self.folder, self.archive)
+
+    @contextmanager
+    def _locked(self):
+        with open(os.path.join(self.folder, _LOCK), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        self.archive, self.entries, self.by_hash = "structures-0.bin", {}, {}
+        self._index_offset = 0
+        self._read_index()
+
+    def _read_index(self):
+        """
+        Read index lines written since the last read (by this or another process).
+        """
+        if not os.path.exists(self.index_path):
+            return
+        if os.path.getsize(self.index_path) < self._index_offset:
+            # Compacted by another process.
+            self._map = None
+            self._load_index()
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partially written last line.
+                    break
+                self._index_offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "archive" in record:
+                    self.archive = record["archive"]
+                    continue
+                self.entries[record["key"]] = record
+                self.by_hash[f"{record['kind']}:{record['sha1']}"] = record
+
+    def _append_index(self, record):
+        with open(self.index_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        self._read_index()
+
+    def _write_arrays(self, f, arrays):
+        refs = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            offset = f.seek(0, os.SEEK_END)
+            padding = -offset % _ALIGN
+            f.write(b"\0" * padding)
+            f.write(array.tobytes())
+            refs[name] = [offset + padding, array.dtype.str, list(array.shape)]
+        return refs
+
+    def _view(self, ref):
+        offset, dtype, shape = ref
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape))
+        end = offset + count * dtype.itemsize
+        if self._map is None or len(self._map) < end:
+            # The archive only grows, so views of the previous map stay valid.
+            self._map = np.memmap(self.archive_path, dtype=np.uint8, mode="r")
+        return np.frombuffer(self._map, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+    def _structure(self, record):
+        arrays = {name: self._view(ref) for name, ref in record["arrays"].items()}
+        return CachedStructure(arrays["lattice"], arrays["frac_coords"], arrays["species_codes"],
+                               record["symbols"], arrays.get("labels"), record["meta"])
+
+    def load(self, path, kind, parse):
+        """
+        Return the CachedStructure for a file, parsing it only on a miss.
+        parse(text) returns a dict with lattice, frac_coords, species (symbol
+        per site) and optionally labels and meta (JSON-serializable); kind
+        names the parser so different parsers of one file are kept apart.
+        """
+        path = os.path.abspath(path)
+        key = f"{kind}:{path}"
+        mtime_ns, size = file_fingerprint(path)
+        record = self.entries.get(key)
+        if record is not None and record["mtime_ns"] == mtime_ns and record["size"] == size:
+            self.hits += 1
+            return self._structure(record)
+        with open(path, "rb") as f:
+            data = f.read()
+        sha1 = content_hash(data)
+        known = self.by_hash.get(f"{kind}:{sha1}")
+        if known is not None:
+            # Same content under a new mtime or path: record it, reuse the arrays.
+            self.hits += 1
+            record = dict(known, key=key, path=path, mtime_ns=mtime_ns, size=size)
+            with self._locked():
+                self._read_index()
+                self._append_index(record)
+            return self._structure(record)
+        self.misses += 1
+        parsed = parse(data.decode("utf-8", errors="replace"))
+        symbols, codes = encode_species(parsed["species"])
+        arrays = {
+            "lattice": np.asarray(parsed["lattice"], dtype=np.float64).reshape(3, 3),
+            "frac_coords": np.asarray(parsed["frac_coords"], dtype=np.float64).reshape(-1, 3),
+            "species_codes": codes,
+        }
+        if parsed.get("labels") is not None:
+            arrays["labels"] = np.asarray(parsed["labels"], dtype=str)
+        with self._locked():
+            self._read_index()
+            known = self.by_hash.get(f"{kind}:{sha1}")
+            if known is not None:
+                # Another process cached it while this one was parsing.
+                record = dict(known, key=key, path=path, mtime_ns=mtime_ns, size=size)
+                self._append_index(record)
+                return self._structure(record)
+            with open(self.archive_path, "ab") as f:
+                refs = self._write_arrays(f, arrays)
+            record = {"key": key, "kind": kind, "path": path, "mtime_ns": mtime_ns, "size": size, "sha1": sha1,
+                      "symbols": symbols, "arrays": refs, "meta": parsed.get("meta", {})}
+            self._append_index(record)
+        return self._structure(record)
+
+    def compact(self):
+        """
+        Rewrite the archive and index with only the arrays still referenced.
+        """
+        with self._locked():
+            self._read_index()
+            return self._compact()
+
+    def _compact(self):
+        generation = int(self.archive.split("-")[-1].split(".")[0]) + 1
+        archive = f"structures-{generation}.bin"
+        moved = {}
+        records = []
+        with open(os.path.join(self.folder, archive), "wb") as f:
+            for record in self.entries.values():
+                arrays_key = json.dumps(record["arrays"], sort_keys=True)
+                if arrays_key not in moved:
+                    structure = self._structure(record)
+                    arrays = {"lattice": structure.lattice, "frac_coords": structure.frac_coords,
+                              "species_codes": structure.species_codes}
+                    if structure.labels is not None:
+                        arrays["labels"] = structure.labels
+                    moved[arrays_key] = self._write_arrays(f, arrays)
+                records.append(dict(record, arrays=moved[arrays_key]))
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(json.dumps({"archive": archive}) + "\n")
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        old_archive = self.archive_path
+        os.replace(tmp, self.index_path)
+        self._map = None
+        self._load_index()
+        if os.path.exists(old_archive) and old_archive != self.archive_path:
+            os.remove(old_archive)
+        return self.archive_path
+
+def get_structure_cache(folder=None):
+    """
+    Shared StructureCache for a folder (default: STRUCTURE_CACHE, i.e.
+    $XDG_CACHE_HOME/osairo/structures or OSAIRO_STRUCTURE_CACHE); None when
+    caching is disabled (OSAIRO_STRUCTURE_CACHE="" or "off") or the folder
+    cannot be created.
+    """
+    folder = STRUCTURE_CACHE if folder is None else folder
+    if not folder:
+        return None
+    folder = os.path.abspath(os.path.expanduser(folder))
+    if folder not in _CACHES:
+        try:
+            _CACHES[folder] = StructureCache(folder)
+        except OSError as e:
+            print(f"WARNING: structure cache {folder} is unavailable ({e}); parsing files directly.")
+            _CACHES[folder] = None
+    return _CACHES[folder]
+
+def _from_parsed(parsed):
+    symbols, codes = encode_species(parsed["species"])
+    labels = parsed.get("labels")
+    return CachedStructure(np.asarray(parsed["lattice"], dtype=float).reshape(3, 3),
+                           np.asarray(parsed["frac_coords"], dtype=float).reshape(-1, 3),
+                           codes, symbols, None if labels is None else np.asarray(labels, dtype=str),
+                           parsed.get("meta"))
+
+def load_parsed(path, kind, parse, cache=None):
+    """
+    CachedStructure for a file through the structure cache (default: the
+    shared cache, see get_structure_cache; cache=False parses directly). If the cache cannot be read or
+    written (read-only home, full disk, ...) the file is parsed uncached, so
+    a valid file always loads.
+    """
+    cache = get_structure_cache() if cache is None else cache
+    if isinstance(cache, StructureCache):
+        try:
+            return cache.load(path, kind, parse)
+        except Exception as e:
+            error = e
+    else:
+        error = None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        structure = _from_parsed(parse(f.read()))
+    if error is not None:
+        print(f"WARNING: structure cache failed for {path} ({error}); parsed without it.")
+    return structure
+
+def _parse_pymatgen(text):
+    from pymatgen.core.structure import Structure
+    structure = Structure.from_str(text, fmt="cif")
+    lattice = structure.lattice
+    return {
+        "lattice": lattice.matrix,
+        "frac_coords": structure.frac_coords,
+        "species": [site.specie.symbol for site in structure],
+        "meta": {"cell_params": dict(zip(("a", "b", "c", "alpha", "beta", "gamma"),
+                                         map(float, lattice.abc + lattice.angles)))},
+    }
+
+def load_structure(path, cache=None):
+    """
+    Structure of a CIF file as parsed by pymatgen (Structure.from_file),
+    served from the structure cache unless it is disabled or cache=False.
+    """
+    return load_parsed(path, "pymatgen", _parse_pymatgen, cache)
@@ -0,0 +1,70 @@
+import numpy as np
+
+def lattice_matrix(a, b, c, alpha, beta, gamma):
+    """
+    Lattice vectors (rows) from cell lengths (Å) and angles (degrees), with a
+    along x and b in the xy-plane (the CIF/RASPA convention).
+    """
+    alpha, beta, gamma = np.radians([alpha, beta, gamma])
+    cos_a, cos_b, cos_g, sin_g = np.cos(alpha), np.cos(beta), np.cos(gamma), np.sin(gamma)
+    cx = c * cos_b
+    cy = c * (cos_a - cos_b * cos_g) / sin_g
+    cz = np.sqrt(max(c * c - cx * cx - cy * cy, 0.0))
+    return np.array([
+        [a, 0.0, 0.0],
+        [b * cos_g, b * sin_g, 0.0],
+        [cx, cy, cz],
+    ])
+
+def perpendicular_widths(matrix):
+    """
+    Distances between opposite faces of the cell(s): V / |a_j x a_k| for each
+    lattice vector. Accepts one (3, 3) matrix or a stack (..., 3, 3).
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    volume = np.abs(np.linalg.det(matrix))
+    cross = np.stack([
+        np.cross(matrix[..., 1, :], matrix[..., 2, :]),
+        np.cross(matrix[..., 2, :], matrix[..., 0, :]),
+        np.cross(matrix[..., 0, :], matrix[..., 1, :]),
+    ], axis=-2)
+    return volume[..., None] / np.linalg.norm(cross, axis=-1)
+
+def minimum_supercell(matrix, cutoff):
+    """
+    Smallest repetitions (n_a, n_b, n_c) whose perpendicular widths are all at
+    least twice the cutoff, as the minimum-image convention requires.
+    """
+    widths = perpendicular_widths(matrix)
+    return np.maximum(np.ceil(2.0 * cutoff / widths - 1e-9), 1).astype(int)
+
+def tile_fractional(frac_coords, repeats):
+    """
+    Fractional coordinates of the supercell: every site shifted by each
+    integer translation and rescaled to the supercell, translation-major.
+    """
+    frac_coords = np.asarray(frac_coords, dtype=float)
+    repeats = np.asarray(repeats, dtype=int)
+    shifts = np.indices(repeats).reshape(3, -1).T
+    return ((frac_coords[None, :, :] + shifts[:, None, :]) / repeats).reshape(-1, 3)
+
+def build_supercell(matrix, frac_coords, species, repeats):
+    """
+    Return (matrix, frac_coords, species) of the repeats[0] x repeats[1] x
+    repeats[2] supercell; species is tiled to match the coordinates.
+    """
+    repeats = np.asarray(repeats, dtype=int)
+    species = np.asarray(species)
+    return (
+        np.asarray(matrix, dtype=float) * repeats[:, None],
+        tile_fractional(frac_coords, repeats),
+        np.tile(species, int(np.prod(repeats))),
+    )
+
+def raspa_unit_cells(cell_params, cutoff=12.0):
+    """
+    RASPA UnitCells string ("n_a n_b n_c") for a framework, given the CIF cell
+    parameters (a, b, c, alpha, beta, gamma) and the force-field cutoff.
+    """
+    matrix = lattice_matrix(*(cell_params[k] for k in ("a", "b", "c", "alpha", "beta", "gamma")))
+    return " ".join(str(n) for n in minimum_supercell(matrix, cutoff))
@@ -0,0 +1,154 @@
+import os
+import numpy as np
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+class TrainingStore:
+    """
+    Append-optimized training data table.
+    Rows live in a preallocated float64 buffer that doubles in size when full,
+    so appends are amortized O(1) instead of copying the whole table on every
+    new observation. Column slices are handed to model training as views.
+    """
+
+    def __init__(self, columns, capacity=1024, path=None, compact_every=None):
+        self.columns = list(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._data = np.full((max(int(capacity), 1), len(self.columns)), np.nan)
+        self._size = 0
+        self.path = path
+        self.compact_every = compact_every
+        self._appends_since_compact = 0
+
+    @classmethod
+    def from_dataframe(cls, df, columns=None, **kwargs):
+        """
+        Build a store from a DataFrame (numeric columns only by default).
+        """
+        columns = list(columns) if columns is not None else list(df.select_dtypes("number").columns)
+        store = cls(columns, capacity=max(2 * len(df), 1024), **kwargs)
+        store.extend(df[columns].to_numpy(dtype=float))
+        return store
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """
+        Load a store previously written with compact().
+        """
+        with np.load(path, allow_pickle=False) as archive:
+            columns = [str(c) for c in archive["columns"]]
+            data = archive["data"]
+        store = cls(columns, capacity=max(2 * len(data), 1024), path=path, **kwargs)
+        store.extend(data)
+        return store
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, n_rows):
+        capacity = self._data.shape[0]
+        if n_rows <= capacity:
+            return
+        while capacity < n_rows:
+            capacity *= 2
+        data = np.full((capacity, self._data.shape[1]), np.nan)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+    def _add_columns(self, names):
+        new = [name for name in names if name not in self._index]
+        if not new:
+            return
+        for name in new:
+            self._index[name] = len(self.columns)
+            self.columns.append(name)
+        data = np.full((self._data.shape[0], len(self.columns)), np.nan)
+        data[:, :self._data.shape[1]] = self._data
+        self._data = data
+
+    def append(self, row):
+        """
+        Append a single observation (dict keyed by column, or a sequence in
+        column order). Missing columns are stored as NaN.
+        """
+        self.extend([row])
+
+    def extend(self, rows):
+        """
+        Append a batch of observations: a 2-D array in column order or an
+        iterable of dicts/sequences. Non-numeric dict values are not stored.
+        """
+        if isinstance(rows, np.ndarray) and rows.ndim == 2:
+            block = rows.astype(float, copy=False)
+        else:
+            rows = list(rows)
+            if not rows:
+                return
+            if isinstance(rows[0], dict):
+                # Only numbers go in the float buffer; text fields (e.g. source_file) are dropped.
+                rows = [{key: value for key, value in row.items() if _is_number(value)} for row in rows]
+                self._add_columns([key for row in rows for key in row])
+                block = np.full((len(rows), len(self.columns)), np.nan)
+                for i, row in enumerate(rows):
+                    for key, value in row.items():
+                        block[i, self._index[key]] = value
+            else:
+                block = np.asarray(rows, dtype=float)
+        if block.shape[1] != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} columns, got {block.shape[1]}.")
+        n = len(block)
+        self._reserve(self._size + n)
+        self._data[self._size:self._size + n] = block
+        self._size += n
+        self._appends_since_compact += n
+        if self.compact_every and self.path and self._appends_since_compact >= self.compact_every:
+            self.compact()
+
+    @property
+    def data(self):
+        """
+        Read-only view over all stored rows.
+        """
+        view = self._data[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def view(self, columns):
+        """
+        Return the given columns as an (n_rows, n_columns) array.
+        Contiguous column runs are returned as zero-copy views; other
+        selections fall back to a copy.
+        """
+        idx = [self._index[name] for name in columns]
+        start = idx[0]
+        if idx == list(range(start, start + len(idx))):
+            return self.data[:, start:start + len(idx)]
+        return self.data[:, idx]
+
+    def arrays(self, input_features, target_features):
+        """
+        Return (X, y) for model training.
+        """
+        return self.view(input_features), self.view(target_features)
+
+    def to_dataframe(self):
+        import pandas as pd
+        return pd.DataFrame(self._data[:self._size].copy(), columns=self.columns)
+
+    def compact(self, path=None):
+        """
+        Write the used part of the buffer to disk (.npz), atomically.
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for compaction.")
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, data=self._data[:self._size], columns=np.array(self.columns))
+        os.replace(tmp_path, path)
+        self.path = path
+        self._appends_since_compact = 0
+        return path
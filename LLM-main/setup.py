@@ -7,6 +7,7 @@ setup(
     author='Etinosa Osaro',
     author_email='eosaro@nd.edu',
     packages=find_packages(),
+    package_data={'osairo': ['forcefield_data/*.json']},
     install_requires=[
         'click',
         'pandas',
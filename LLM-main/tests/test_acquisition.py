@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from osairo.acquisition import (cost_aware_variance, expected_improvement, get_acquisition, max_variance,
+                                pressure_cost_model, score_candidates, select_best, upper_confidence_bound)
+
+def test_variance_and_ucb_argmax():
+    mean = np.array([[1.0], [2.0], [0.0]])
+    variance = np.array([[0.1], [0.1], [4.0]])
+    assert np.argmax(max_variance(mean, variance, None, None)) == 2
+    # std 0.32 vs 2: a small beta favours the high mean, a large one the uncertain point.
+    assert np.argmax(upper_confidence_bound(mean, variance, None, None, beta=0.5)) == 1
+    assert np.argmax(upper_confidence_bound(mean, variance, None, None, beta=2.0)) == 2
+
+def test_weighted_ucb_uses_squared_weights():
+    mean = np.zeros((1, 2))
+    variance = np.array([[1.0, 4.0]])
+    weights = [2.0, 0.5]
+    # Var(2 f1 + 0.5 f2) = 4 * 1 + 0.25 * 4 = 5.
+    score = upper_confidence_bound(mean, variance, None, None, beta=1.0, target_weights=weights)
+    np.testing.assert_allclose(score, [np.sqrt(5.0)])
+    # Scaling every weight by c scales the weighted objective and its std by c.
+    scaled = upper_confidence_bound(mean, variance, None, None, beta=1.0, target_weights=[4.0, 1.0])
+    np.testing.assert_allclose(scaled, 2 * score)
+
+def test_expected_improvement():
+    pytest.importorskip("scipy")
+    mean = np.array([[1.0], [0.5], [0.0]])
+    variance = np.array([[1e-8], [1.0], [1e-8]])
+    ei = expected_improvement(mean, variance, None, {"y_best": 0.9})
+    # Certain improvement of 0.1; 0.5 +/- 1 has a larger expected gain; 0.0 cannot improve.
+    np.testing.assert_allclose(ei[0], 0.1, atol=1e-6)
+    assert np.argmax(ei) == 1 and ei[2] == pytest.approx(0.0, abs=1e-12)
+    # EI of a weighted sum matches EI of the equivalent single target.
+    two = expected_improvement(np.array([[0.25, 0.25]]), np.array([[0.25, 0.25]]), None, {"y_best": 0.9},
+                               target_weights=[2.0, 0.0])
+    one = expected_improvement(np.array([[0.5]]), np.array([[1.0]]), None, {"y_best": 0.9})
+    np.testing.assert_allclose(two, one)
+
+def test_cost_aware_prefers_cheap_points():
+    X = np.array([[1e7], [1e3], [1e5]])
+    variance = np.ones((3, 1))
+    scores = cost_aware_variance(None, variance, X, None)
+    assert np.argmax(scores) == 1
+    np.testing.assert_allclose(scores, 1.0 / pressure_cost_model()(X))
+
+def test_unknown_acquisition():
+    with pytest.raises(ValueError, match="Unknown acquisition"):
+        get_acquisition("nope")
+
+@pytest.fixture
+def gp():
+    gpflow = pytest.importorskip("gpflow")
+
+    def build(X, y):
+        return gpflow.models.GPR(data=(X, y), kernel=gpflow.kernels.SquaredExponential(lengthscales=0.5),
+                                 noise_variance=1e-4)
+    return build
+
+def test_ivr_picks_the_unexplored_cluster(gp):
+    X_train = np.array([[0.0], [0.1]])
+    model = gp(X_train, np.zeros((2, 1)))
+    rng = np.random.default_rng(0)
+    pool = np.vstack([[[0.05]], 3.0 + 0.1 * rng.standard_normal((20, 1)), [[8.0]]])
+    best, _ = select_best(model, pool, "ivr")
+    # Labelling inside the dense unexplored cluster removes the most pool variance.
+    assert 1 <= best <= 20
+
+@pytest.mark.parametrize("acquisition, params", [
+    ("variance", {}), ("ucb", {"beta": 1.5}), ("ei", {}), ("ivr", {"n_reference": 16}), ("cost_aware", {}),
+])
+def test_chunked_scoring_matches_unchunked(gp, acquisition, params):
+    rng = np.random.default_rng(1)
+    X_train = rng.uniform(0, 1, (8, 2))
+    model = gp(X_train, np.sin(3 * X_train[:, :1]))
+    pool = rng.uniform(0, 1, (37, 2))
+    full = score_candidates(model, pool, acquisition, chunk_size=1000, **params)
+    chunked = score_candidates(model, pool, acquisition, chunk_size=5, **params)
+    np.testing.assert_allclose(chunked, full, rtol=1e-9)
+    assert select_best(model, pool, acquisition, chunk_size=5, **params)[0] == int(np.argmax(full))
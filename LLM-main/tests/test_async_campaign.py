@@ -0,0 +1,221 @@
+import sys
+import threading
+import time
+import numpy as np
+import pytest
+from osairo.async_campaign import fantasize, job_label_fn, run_pipelined_campaign
+from osairo.local_executor import COMPLETED, PENDING, RUNNING
+from osairo.scheduler import SchedulerClient
+
+# Fake Slurm commands sharing a queue file: a job is listed RUNNING by two
+# squeue calls, then leaves the queue and sacct reports it COMPLETED. squeue
+# logs when it starts and ends, to check that polls never overlap.
+FAKE_SLURM = """\
+import fcntl, json, os, sys, time
+state = os.path.join(os.path.dirname(os.path.abspath(__file__)), "queue.json")
+command = os.path.basename(__file__)
+
+def log(event):
+    with open(state + ".log", "a") as f:
+        f.write(event + "\\n")
+
+if command == "squeue.py":
+    log("start")
+    time.sleep(0.05)
+with open(state + ".lock", "w") as lock:
+    fcntl.flock(lock, fcntl.LOCK_EX)
+    jobs = json.load(open(state)) if os.path.exists(state) else {}
+    if command == "sbatch.py":
+        job_id = str(1000 + len(jobs))
+        jobs[job_id] = 2
+        print(job_id)
+    elif command == "squeue.py":
+        for job_id, left in jobs.items():
+            if left > 0:
+                print(job_id, "RUNNING")
+                jobs[job_id] = left - 1
+    else:
+        for job_id in sys.argv[sys.argv.index("-j") + 1].split(","):
+            print(f"{job_id}|COMPLETED")
+    json.dump(jobs, open(state, "w"))
+if command == "squeue.py":
+    log("end")
+"""
+
+def target(x):
+    return float(np.sin(3 * x[0]) + x[1])
+
+@pytest.fixture
+def train_gp():
+    gpflow = pytest.importorskip("gpflow")
+
+    def train(X, y):
+        # Fixed hyperparameters keep the test fast and deterministic.
+        return gpflow.models.GPR(data=(np.asarray(X, dtype=float), np.asarray(y, dtype=float).reshape(-1, 1)),
+                                 kernel=gpflow.kernels.Matern52(lengthscales=0.3))
+    return train
+
+class RecordedModel:
+    """
+    'nn' stand-in that keeps its training data: selection draws unlabelled
+    candidates at random, so the campaign bookkeeping runs without gpflow.
+    """
+
+    def __init__(self, X, y):
+        self.data = (np.asarray(X, dtype=float), np.asarray(y, dtype=float))
+
+class FakeScheduler:
+    """
+    SchedulerClient stand-in: a job runs for `polls` blocking poll() calls.
+    Records which threads poll, to check the event loop never blocks on it.
+    """
+
+    def __init__(self, polls=2, poll_time=0.01):
+        self.polls = polls
+        self.poll_time = poll_time
+        self.jobs = {}
+        self.order = []
+        self.poll_threads = set()
+        self._lock = threading.Lock()
+
+    def submit(self, script_path):
+        with self._lock:
+            job_id = str(len(self.jobs) + 1)
+            self.jobs[job_id] = {"job_id": job_id, "point": script_path, "status": PENDING, "left": self.polls}
+        return job_id
+
+    def poll(self):
+        self.poll_threads.add(threading.get_ident())
+        time.sleep(self.poll_time)
+        with self._lock:
+            for job in self.jobs.values():
+                if job["status"] in (PENDING, RUNNING):
+                    job["left"] -= 1
+                    job["status"] = COMPLETED if job["left"] <= 0 else RUNNING
+                    if job["status"] == COMPLETED:
+                        self.order.append(job["job_id"])
+
+    def status(self, job_id):
+        return self.jobs[job_id]["status"]
+
+def test_fantasize_adds_pending_points_without_touching_model(train_gp):
+    X = np.array([[0.0, 0.0], [1.0, 1.0]])
+    model = train_gp(X, [target(x) for x in X])
+    pending = np.array([[0.5, 0.5]])
+    fantasy = fantasize(model, pending)
+    assert len(fantasy.data[0]) == 3 and len(model.data[0]) == 2
+    _, before = model.predict_f(pending)
+    _, after = fantasy.predict_f(pending)
+    assert float(after[0, 0]) < float(before[0, 0])
+
+def test_fantasize_leaves_nn_models_unchanged():
+    model = RecordedModel([[0.0, 0.0]], [[0.0]])
+    assert fantasize(model, np.array([[0.5, 0.5]]), model_type='nn') is model
+
+def test_pipelined_campaign_with_fake_scheduler():
+    rng = np.random.default_rng(0)
+    X_pool = rng.uniform(0, 1, (200, 2))
+    X0 = X_pool[:3]
+    backend = FakeScheduler()
+    label = job_label_fn(lambda point, idx: point, backend, lambda job: target(job["point"]), poll_interval=0.001)
+    main_thread = threading.get_ident()
+    model, X, y, stats = run_pipelined_campaign(RecordedModel, label, X_pool, X0, [target(x) for x in X0],
+                                                model_type='nn', max_in_flight=3, max_points=9)
+    events = [e["event"] for e in stats["events"]]
+    # The first max_in_flight points are submitted before any result comes back.
+    assert events[:3] == ["submit"] * 3
+    assert events.index("result") > 2
+    # Every result is followed by a retrain that includes it.
+    assert stats["submitted"] == stats["completed"] == 9
+    assert events[-1] == "train_done"
+    # Each point is labelled after it was submitted, and results are added to
+    # the training data in the order they came back.
+    submitted = [e["index"] for e in stats["events"] if e["event"] == "submit"]
+    returned = [e["index"] for e in stats["events"] if e["event"] == "result"]
+    assert sorted(submitted) == sorted(returned)
+    position = {(e["event"], e.get("index")): i for i, e in enumerate(stats["events"])}
+    assert all(position[("submit", idx)] < position[("result", idx)] for idx in returned)
+    np.testing.assert_allclose(X[3:], X_pool[returned])
+    assert len(backend.order) == 9
+    # Fantasized means are replaced by real labels: the final data holds only
+    # observed points with their true targets, and the model is trained on them.
+    assert len(X) == 12 and len(np.unique(X.round(8), axis=0)) == 12
+    np.testing.assert_allclose(y[:, 0], [target(x) for x in X])
+    np.testing.assert_allclose(np.asarray(model.data[1])[:, 0], y[:, 0])
+    # Blocking polls ran in worker threads, never on the event loop.
+    assert main_thread not in backend.poll_threads
+
+def test_pipelined_campaign_with_scheduler_client(tmp_path):
+    commands = {}
+    for name in ("sbatch", "squeue", "sacct"):
+        (tmp_path / f"{name}.py").write_text(FAKE_SLURM)
+        commands[name] = f"{sys.executable} {tmp_path / name}.py"
+    client = SchedulerClient("slurm", submit_cmd=commands["sbatch"], status_cmd=commands["squeue"],
+                             accounting_cmd=commands["sacct"] + " -j {job_ids}", user="alice",
+                             min_interval=0.01, max_interval=0.05, state_file=str(tmp_path / "jobs.json"))
+
+    def write_job(point, idx):
+        job_dir = tmp_path / f"job{idx}"
+        job_dir.mkdir()
+        np.savetxt(job_dir / "point.txt", point)
+        (job_dir / "run.sh").write_text("#!/bin/bash\n")
+        return str(job_dir / "run.sh")
+
+    def read_result(job):
+        return target(np.loadtxt(f"{job['cwd']}/point.txt"))
+
+    rng = np.random.default_rng(0)
+    X_pool = rng.uniform(0, 1, (100, 2))
+    X0 = X_pool[:3]
+    label = job_label_fn(write_job, client, read_result, poll_interval=0.001)
+    model, X, y, stats = run_pipelined_campaign(RecordedModel, label, X_pool, X0, [target(x) for x in X0],
+                                                model_type='nn', max_in_flight=4, max_points=8)
+    assert stats["submitted"] == stats["completed"] == 8 and stats["failed"] == 0
+    np.testing.assert_allclose(y[:, 0], [target(x) for x in X])
+    assert client.summary() == {COMPLETED: 8}
+    # Points waiting in parallel threads shared the polls: squeue calls never overlapped.
+    log = (tmp_path / "queue.json.log").read_text().split()
+    assert log == ["start", "end"] * (len(log) // 2)
+    assert client.queries >= len(log) // 2
+
+def test_failed_training_keeps_campaign_running():
+    calls = []
+
+    def flaky_train(X, y):
+        calls.append(len(X))
+        if len(calls) == 2:
+            raise RuntimeError("Cholesky decomposition failed")
+        return RecordedModel(X, y)
+
+    def label(point, idx):
+        time.sleep(0.01)
+        return target(point)
+
+    X_pool = np.random.default_rng(0).uniform(0, 1, (50, 2))
+    X0 = X_pool[:3]
+    model, X, y, stats = run_pipelined_campaign(flaky_train, label, X_pool, X0, [target(x) for x in X0],
+                                                model_type='nn', max_in_flight=3, max_points=9)
+    events = [e["event"] for e in stats["events"]]
+    assert stats["train_failures"] == 1 and events.count("train_failed") == 1
+    # No in-flight result was lost, and a later training picked them all up.
+    assert stats["submitted"] == stats["completed"] == 9 and len(X) == 12
+    assert events[-1] == "train_done" and len(model.data[0]) == 12
+    np.testing.assert_allclose(y[:, 0], [target(x) for x in X])
+
+@pytest.mark.parametrize("model_type", ["nn", "gp"])
+def test_exhausted_pool_ends_campaign(request, model_type):
+    train = RecordedModel if model_type == 'nn' else request.getfixturevalue("train_gp")
+    X_pool = np.array([[0.0, 0.0], [0.5, 0.5], [1.0, 1.0]])
+    X0 = X_pool[:1]
+    model, X, y, stats = run_pipelined_campaign(train, lambda point, idx: target(point), X_pool, X0,
+                                                [target(X0[0])], model_type=model_type, max_in_flight=2,
+                                                max_points=10)
+    assert stats["submitted"] == stats["completed"] == 2 and len(X) == 3
+
+def test_selection_errors_propagate(train_gp):
+    X_pool = np.random.default_rng(0).uniform(0, 1, (20, 2))
+    X0 = X_pool[:3]
+    # A misconfigured acquisition must fail the campaign, not end it as if the pool ran out.
+    with pytest.raises(ValueError, match="Unknown acquisition"):
+        run_pipelined_campaign(train_gp, lambda point, idx: target(point), X_pool, X0,
+                               [target(x) for x in X0], acquisition="nope")
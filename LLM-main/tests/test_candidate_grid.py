@@ -0,0 +1,79 @@
+import itertools
+import json
+import numpy as np
+import pytest
+from osairo.acquisition import select_best
+from osairo.candidate_grid import CandidateGrid, categorical_axis, linear_axis, log_axis
+from osairo.feature_index import FeatureIndex
+from osairo.model_manager import get_most_uncertain_point
+
+def small_grid():
+    return CandidateGrid([
+        log_axis("pressure", 1e3, 1e6, 4),
+        linear_axis("temperature", 250, 350, 3),
+        categorical_axis("framework", [[1.0, 10.0], [2.0, 20.0]], columns=["pld", "lcd"], labels=["IRMOF-1", "ZIF-8"]),
+    ])
+
+def test_rows_follow_c_order_product():
+    grid = small_grid()
+    assert grid.dims == (4, 3, 2) and grid.shape == (24, 4)
+    assert grid.columns == ["pressure", "temperature", "pld", "lcd"]
+    expected = np.array([np.concatenate([p, t, f]) for p, t, f in itertools.product(
+        *(axis.values for axis in grid.axes))])
+    np.testing.assert_allclose(grid[:], expected)
+    for i in (0, 5, 23, -1):
+        np.testing.assert_allclose(grid[i], expected[i])
+        multi = np.unravel_index(i % 24, grid.dims)
+        np.testing.assert_allclose(grid[i][:1], grid.axes[0].values[multi[0]])
+    np.testing.assert_allclose(grid[[3, -2, 7]], expected[[3, -2, 7]])
+    mask = np.zeros(24, dtype=bool)
+    mask[[1, 20]] = True
+    np.testing.assert_allclose(grid[mask], expected[mask])
+    np.testing.assert_allclose(grid[2:17:5], expected[2:17:5])
+    with pytest.raises(IndexError):
+        grid[24]
+
+def test_log_and_categorical_axes():
+    grid = small_grid()
+    np.testing.assert_allclose(grid.axes[0].values[:, 0], [1e3, 1e4, 1e5, 1e6])
+    np.testing.assert_allclose(grid.axes[1].values[:, 0], [250, 300, 350])
+    assert grid.coordinates(5) == {"pressure": 1e3, "temperature": 350.0, "framework": "ZIF-8"}
+    unlabelled = CandidateGrid([categorical_axis("site", [[0.5, 1.5]])])
+    assert unlabelled.coordinates(0) == {"site": {"site_0": 0.5, "site_1": 1.5}}
+
+def test_from_spec(tmp_path):
+    spec = {"axes": [{"name": "pressure", "start": 1e3, "stop": 1e6, "num": 4, "scale": "log"},
+                     {"name": "temperature", "start": 250, "stop": 350, "num": 3},
+                     {"name": "framework", "values": [[1.0, 10.0], [2.0, 20.0]], "columns": ["pld", "lcd"],
+                      "labels": ["IRMOF-1", "ZIF-8"]}]}
+    path = tmp_path / "grid.json"
+    path.write_text(json.dumps(spec))
+    np.testing.assert_allclose(CandidateGrid.from_json(str(path))[:], small_grid()[:])
+    assert CandidateGrid.from_spec(spec).describe() == "pressure[4] x temperature[3] x framework[2] = 24 points"
+
+def test_chunks_cover_grid():
+    grid = small_grid()
+    starts, rows = zip(*grid.chunks(chunk_size=10))
+    assert starts == (0, 10, 20)
+    np.testing.assert_allclose(np.vstack(rows), grid[:])
+
+def test_implicit_materialization_is_capped():
+    grid = CandidateGrid([linear_axis(name, 0, 1, 1000) for name in "abc"])
+    assert len(grid) == 10 ** 9
+    with pytest.raises(ValueError, match="Refusing to materialize"):
+        np.asarray(grid)
+    np.testing.assert_allclose(np.asarray(small_grid()), small_grid()[:])
+
+def test_labelled_points_masked_per_chunk():
+    gpflow = pytest.importorskip("gpflow")
+    grid = CandidateGrid([linear_axis("x", 0, 1, 50), linear_axis("y", 0, 1, 40)])
+    X_train = np.array([[0.5, 0.5]])
+    model = gpflow.models.GPR(data=(X_train, np.zeros((1, 1))), kernel=gpflow.kernels.Matern52(lengthscales=0.2))
+    # Corners are equally uncertain; label all but one and the survivor must win.
+    corners = np.array([[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]])
+    index = FeatureIndex(np.vstack([X_train, corners[:3]]))
+    point, idx, _ = get_most_uncertain_point(model, grid, exclude=index)
+    np.testing.assert_allclose(point, [1.0, 1.0])
+    assert idx == len(grid) - 1
+    # Same with many small chunks: each one is masked on its own.
+    assert select_best(model, grid, chunk_size=128, exclude=index)[0] == len(grid) - 1
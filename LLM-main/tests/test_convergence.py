@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from osairo.convergence import ConvergenceMonitor
+
+class ConstantModel:
+    """Stand-in NN model predicting a fixed offset."""
+
+    def __init__(self, offset):
+        self.offset = offset
+
+    def predict(self, X, verbose=0):
+        return np.full((len(X), 1), self.offset)
+
+def test_default_monitor_requires_holdout():
+    monitor = ConvergenceMonitor()
+    with pytest.raises(ValueError, match="prediction_change"):
+        monitor.update(ConstantModel(0.0), 'nn', np.zeros((5, 2)))
+
+def test_variance_threshold_requires_gp():
+    monitor = ConvergenceMonitor(prediction_change_tol=None, max_variance_tol=0.1)
+    with pytest.raises(ValueError, match="max_variance"):
+        monitor.update(ConstantModel(0.0), 'nn', np.zeros((5, 2)))
+
+def test_prediction_change_converges_with_holdout():
+    monitor = ConvergenceMonitor(prediction_change_tol=0.01, patience=2)
+    X_holdout = np.arange(6, dtype=float).reshape(3, 2)
+    for offset in (0.0, 0.0, 0.0):
+        metrics = monitor.update(ConstantModel(offset), 'nn', None, X_holdout)
+    assert metrics["prediction_change"] == 0.0
+    assert monitor.converged
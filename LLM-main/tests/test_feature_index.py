@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from osairo.feature_index import FeatureIndex
+
+def test_contains_and_add():
+    index = FeatureIndex(np.array([[1.0, 2.0], [3.0, 4.0]]))
+    assert len(index) == 2
+    np.testing.assert_array_equal(index.contains([[1.0, 2.0], [2.0, 1.0], [3.0, 4.0]]), [True, False, True])
+    index.add([2.0, 1.0])
+    assert index.contains([[2.0, 1.0]])[0]
+    index.add([[1.0, 2.0]])
+    assert len(index) == 3
+
+def test_empty_index():
+    index = FeatureIndex()
+    assert len(index) == 0
+    assert not index.contains(np.zeros((3, 2))).any()
+
+def test_near_equal_floats_match():
+    index = FeatureIndex(np.array([[0.1 + 0.2, 1e5]]), significant_digits=8)
+    # Round-off noise well below 8 significant digits is the same point.
+    assert index.contains([[0.3, 1e5 * (1 + 1e-12)]])[0]
+    # A difference in the 6th significant digit is a different point.
+    assert not index.contains([[0.300001, 1e5]])[0]
+
+def test_quantization_boundary_carry():
+    index = FeatureIndex(np.array([[10.0, -10.0]]), significant_digits=8)
+    # Rounds up across a decade (9.999999999 -> 10.000000) and must still match 10.
+    assert index.contains([[9.999999999, -9.999999999]])[0]
+    assert not index.contains([[9.99999, -10.0]])[0]
+
+def test_rounding_boundary():
+    # Keys are exact on the rounded value: near-equal floats on the same side
+    # of a half-quantum boundary match, floats straddling it do not.
+    index = FeatureIndex(np.array([[1.0000000500001]]), significant_digits=8)
+    np.testing.assert_array_equal(index.contains([[1.0000000500002], [1.00000014], [1.0000000499999]]),
+                                  [True, True, False])
+    assert FeatureIndex(np.array([[1.0000000499999]])).contains([[1.00000004]])[0]
+
+def test_zero_and_sign():
+    index = FeatureIndex(np.array([[0.0, 1.0]]))
+    assert index.contains([[0.0, 1.0]])[0]
+    assert not index.contains([[0.0, -1.0]])[0]
+
+def test_candidate_mask_drops_labelled_and_duplicates():
+    index = FeatureIndex(np.array([[1.0, 1.0]]))
+    pool = np.array([[1.0, 1.0], [2.0, 2.0], [2.0, 2.0 + 1e-13], [3.0, 3.0]])
+    np.testing.assert_array_equal(index.candidate_mask(pool), [False, True, False, True])
+    np.testing.assert_array_equal(index.candidate_mask(pool, drop_duplicates=False), [False, True, True, True])
+
+def test_dimension_mismatch():
+    index = FeatureIndex(np.zeros((1, 2)))
+    with pytest.raises(ValueError):
+        index.contains(np.zeros((1, 3)))
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import pytest
+
+pytest.importorskip("gpflow")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = textwrap.dedent("""
+    import json, sys
+    import numpy as np
+    from osairo.model_manager import fit_model
+    from osairo.preprocessing import FeaturePipeline
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 1, (20, 2))
+    y = np.column_stack([np.sin(3 * X[:, 0]), X[:, 1]])
+    cache = sys.argv[1]
+    out = {}
+    for run in ("first", "second"):
+        _, out[run] = fit_model("gp", X, y, cache_dir=cache, config={"kernel": "rbf"}, pipeline=FeaturePipeline())
+    _, out["nn"] = fit_model("nn", X, y, config={"epochs": 2, "hidden_units": [4]})
+    print(json.dumps(out))
+""")
+
+def test_fit_model_never_prompts(tmp_path):
+    # With stdin closed any prompt or input() would fail the run.
+    result = subprocess.run([sys.executable, "-c", SCRIPT, str(tmp_path / "cache")], cwd=ROOT,
+                            stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stderr
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    first, second, nn = stats["first"], stats["second"], stats["nn"]
+    assert (first["model_type"], first["n_train"], first["n_features"], first["n_targets"]) == ("gp", 20, 2, 2)
+    assert not first["cached"] and first["train_time_s"] > 0 and first["saved_path"].endswith(".npz")
+    assert second["cached"] and second["train_time_s"] == 0.0 and second["saved_path"] is None
+    assert second["log_marginal_likelihood"] == pytest.approx(first["log_marginal_likelihood"])
+    assert nn["model_type"] == "nn" and "log_marginal_likelihood" not in nn and nn["saved_path"] is None
+
+def test_unknown_model_type():
+    from osairo.model_manager import fit_model
+    with pytest.raises(ValueError, match="Unknown model type"):
+        fit_model("svm", [[0.0]], [0.0])
@@ -0,0 +1,47 @@
+import json
+import pytest
+from osairo.forcefields import ForceField, get_forcefield, list_forcefields
+
+def test_gulp_lines_only_present_elements():
+    lines = get_forcefield("zeolite_shell").gulp_lines(["Si", "O"])
+    assert lines == [
+        "species",
+        "Si core 4.00000",
+        "O2 core 0.86902",
+        "O2 shel -2.86902",
+        "buck",
+        "O2 shel O2 shel 22764.0 0.149 27.879 0.0 12.0",
+        "buck",
+        "Si core O2 shel 1283.907 0.32052 10.66158 0.0 10.0",
+        "three",
+        "Si core O2 shel O2 shel 2.09724 109.47 1.9 1.9 3.5",
+        "spring",
+        "O2 shel 74.92",
+    ]
+    assert not any(label in line for line in lines for label in ("Al", "Na"))
+
+def test_blocks_cached_per_composition():
+    forcefield = get_forcefield("zeolite_shell")
+    assert forcefield.gulp_lines(["O", "Si"]) == forcefield.gulp_lines({"Si", "O"})
+    lines = forcefield.gulp_lines(["Si", "O"])
+    lines.append("mutated")
+    assert "mutated" not in forcefield.gulp_lines(["Si", "O"])
+    assert "Na core Na core 7895.4 0.1709 0.0 0.0 10.0" in forcefield.gulp_lines(["Na", "O"])
+    assert forcefield.missing_elements(["Si", "O", "Zn"]) == ["Zn"]
+
+def test_user_forcefield_file(tmp_path):
+    path = tmp_path / "toy.json"
+    path.write_text(json.dumps({
+        "species": [{"label": "Zn", "element": "Zn", "type": "core", "charge": 2.0},
+                    {"label": "O", "element": "O", "type": "core", "charge": -2.0}],
+        "terms": [{"kind": "lennard", "species": ["Zn core", "O core"], "params": [1.0, 2.0]}],
+    }))
+    forcefield = get_forcefield(str(path))
+    assert isinstance(forcefield, ForceField) and forcefield.name == "toy"
+    assert forcefield.gulp_lines(["Zn"]) == ["species", "Zn core 2.00000"]
+    assert forcefield.gulp_lines()[-2:] == ["lennard", "Zn core O core 1.0 2.0"]
+
+def test_unknown_forcefield():
+    assert "zeolite_shell" in list_forcefields()
+    with pytest.raises(ValueError, match="Unknown force field"):
+        get_forcefield("nope")
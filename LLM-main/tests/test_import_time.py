@@ -0,0 +1,18 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must only be imported on first use (see benchmarks/import_time.py for the timing budget).
+HEAVY_MODULES = ["langchain", "langchain_openai", "langchain_core", "openai", "pymatgen", "tensorflow", "gpflow",
+                 "pandas"]
+
+@pytest.mark.parametrize("module", ["osairo", "osairo.cli", "osairo.result_harvester", "osairo.gulp_generator"])
+def test_heavy_dependencies_are_lazy(module):
+    code = f"import sys, json, {module}; print(json.dumps(sorted({{name.split('.')[0] for name in sys.modules}})))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    loaded = set(json.loads(result.stdout.splitlines()[-1]))
+    assert not loaded & set(HEAVY_MODULES), f"imported at startup: {sorted(loaded & set(HEAVY_MODULES))}"
@@ -0,0 +1,114 @@
+import json
+import time
+import pytest
+from osairo.local_executor import (CANCELLED, COMPLETED, FAILED, FINAL_STATES, RUNNING, TIMEOUT, LocalExecutor,
+                                   parse_job_resources)
+
+def write_script(folder, name, body, directives=""):
+    path = folder / name
+    path.write_text("#!/bin/bash\n" + directives + body + "\n")
+    return path
+
+def test_parse_slurm_directives():
+    resources = parse_job_resources(
+        "#!/bin/bash\n#SBATCH --cpus-per-task=4\n#SBATCH --mem-per-cpu=2G\n#SBATCH -t 1-02:00:00\n"
+        "#SBATCH -o run.out\n")
+    assert resources == {"cpus": 4, "memory_mb": 8192.0, "walltime_s": 93600.0, "output": "run.out"}
+    # A bare number is minutes for Slurm.
+    assert parse_job_resources("#SBATCH --time=30 --mem=500M\n") == {"walltime_s": 1800.0, "memory_mb": 500.0}
+
+def test_parse_uge_directives():
+    resources = parse_job_resources("#$ -pe smp 8\n#$ -l h_rt=02:30:00,h_vmem=1G\n#$ -e err.log\n")
+    assert resources == {"cpus": 8, "walltime_s": 9000.0, "memory_mb": 8192.0, "error": "err.log"}
+    assert parse_job_resources("echo hi\n") == {}
+
+def test_run_completed_and_failed(tmp_path):
+    good = write_script(tmp_path, "good.sh", "echo hello")
+    bad = write_script(tmp_path, "bad.sh", "exit 3")
+    executor = LocalExecutor(total_cpus=2)
+    jobs = [executor.submit(good), executor.submit(bad)]
+    assert executor.wait(timeout=30) == {jobs[0]: COMPLETED, jobs[1]: FAILED}
+    assert executor.jobs[jobs[1]]["returncode"] == 3
+    assert (tmp_path / f"good.o{jobs[0]}").read_text() == "hello\n"
+    executor.shutdown()
+
+def test_job_that_cannot_start_fails(tmp_path):
+    script = write_script(tmp_path, "lost.sh", "echo hello", "#SBATCH -o missing/run.out\n")
+    state_file = tmp_path / "jobs.json"
+    executor = LocalExecutor(total_cpus=1, state_file=str(state_file))
+    job = executor.submit(script)
+    # Reported as a status, not raised from wait().
+    assert executor.wait([job], timeout=30) == {job: FAILED}
+    assert "missing" in executor.jobs[job]["failure"]
+    assert json.loads(state_file.read_text())[0]["status"] == FAILED
+    # Its CPU is returned to the pool.
+    again = executor.submit(write_script(tmp_path, "ok.sh", "true"))
+    assert executor.wait([again], timeout=30) == {again: COMPLETED}
+    executor.shutdown()
+
+def test_walltime_exceeded_is_timeout(tmp_path):
+    script = write_script(tmp_path, "slow.sh", "sleep 30", "#SBATCH --time=0:00:01\n")
+    executor = LocalExecutor(total_cpus=1)
+    job = executor.submit(script)
+    started = time.time()
+    assert executor.wait([job], timeout=20) == {job: TIMEOUT}
+    assert time.time() - started < 10
+    executor.shutdown()
+
+def test_array_task_ids(tmp_path):
+    script = write_script(tmp_path, "array.sh", 'echo "$SLURM_ARRAY_TASK_ID $SGE_TASK_ID"')
+    executor = LocalExecutor(total_cpus=2)
+    jobs = executor.submit_array(script, [3, 7])
+    assert set(executor.wait(jobs, timeout=30).values()) == {COMPLETED}
+    assert (tmp_path / f"array.3.o{jobs[0]}").read_text() == "3 3\n"
+    assert (tmp_path / f"array.7.o{jobs[1]}").read_text() == "7 7\n"
+    executor.shutdown()
+
+def test_manifest(tmp_path):
+    write_script(tmp_path, "a.sh", "echo a")
+    (tmp_path / "jobs.json").write_text(json.dumps([{"script": "a.sh"}, {"script": "a.sh", "array": [1, 2]}]))
+    executor = LocalExecutor(total_cpus=2)
+    jobs = executor.submit_manifest(tmp_path / "jobs.json")
+    assert len(jobs) == 3
+    assert set(executor.wait(jobs, timeout=30).values()) == {COMPLETED}
+    executor.shutdown()
+
+def test_cancel_running_and_pending(tmp_path):
+    script = write_script(tmp_path, "sleep.sh", "sleep 30")
+    state = tmp_path / "state.json"
+    executor = LocalExecutor(total_cpus=1, state_file=str(state))
+    running, pending = executor.submit(script), executor.submit(script)
+    deadline = time.time() + 10
+    while executor.status(running) != RUNNING and time.time() < deadline:
+        time.sleep(0.01)
+    assert executor.cancel(pending) == CANCELLED
+    assert executor.cancel(running) == CANCELLED
+    started = time.time()
+    assert executor.wait(timeout=20) == {running: CANCELLED, pending: CANCELLED}
+    assert time.time() - started < 10
+    # Cancelling a finished job leaves its final status.
+    assert executor.cancel(running) == CANCELLED
+    assert executor.jobs[pending]["started"] is None
+    executor.shutdown()
+    saved = {job["job_id"]: job["status"] for job in json.loads(state.read_text())}
+    assert saved == {running: CANCELLED, pending: CANCELLED}
+
+def test_cpu_bound_pool(tmp_path):
+    script = write_script(tmp_path, "wide.sh", "sleep 0.3", "#SBATCH -c 2\n")
+    executor = LocalExecutor(total_cpus=2)
+    jobs = [executor.submit(script) for _ in range(2)]
+    executor.wait(jobs, timeout=30)
+    first, second = (executor.jobs[job] for job in jobs)
+    # Each job needs every CPU, so they ran one after the other.
+    assert second["started"] >= first["finished"] or first["started"] >= second["finished"]
+    assert all(executor.jobs[job]["status"] in FINAL_STATES for job in jobs)
+    executor.shutdown()
+
+def test_harvest_completed_jobs(tmp_path):
+    gulp = "opti conp\\ntotalenergy -12.5 eV\\ncell\\n 5.0 5.0 5.0 90.0 90.0 90.0"
+    script = write_script(tmp_path, "gulp.sh", f'printf "{gulp}\\n" > out.gout')
+    executor = LocalExecutor(total_cpus=1)
+    executor.wait([executor.submit(script)], timeout=30)
+    rows = executor.harvest(state_file=str(tmp_path / "harvest.json"), processes=1)
+    assert len(rows) == 1 and rows[0]["lattice_energy"] == pytest.approx(-12.5)
+    executor.shutdown()
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from osairo.model_selection import cross_validate, kfold_splits, select_model
+
+@pytest.mark.parametrize("n, k", [(10, 5), (11, 3), (4, 4)])
+def test_kfold_splits_partition(n, k):
+    folds = kfold_splits(n, k, seed=3)
+    assert len(folds) == k
+    indices = np.concatenate(folds)
+    assert sorted(indices.tolist()) == list(range(n))
+    assert max(map(len, folds)) - min(map(len, folds)) <= 1
+    # Seeded: every candidate and re-run sees the same folds.
+    assert all(np.array_equal(a, b) for a, b in zip(folds, kfold_splits(n, k, seed=3)))
+
+SUMMARY = [
+    {"name": "gp-rbf", "rmse": 0.05, "train_s": 9.0},
+    {"name": "gp-matern52", "rmse": 0.08, "train_s": 4.0},
+    {"name": "nn-32x32", "rmse": 0.09, "train_s": 1.0},
+    {"name": "nn-64x64", "rmse": 0.30, "train_s": 0.5},
+]
+
+def test_select_model_cheapest_under_target():
+    assert select_model(SUMMARY, 0.1)["name"] == "nn-32x32"
+    assert select_model(SUMMARY, 0.08)["name"] == "gp-matern52"
+    # No target, or no candidate meets it: the most accurate.
+    assert select_model(SUMMARY)["name"] == "gp-rbf"
+    assert select_model(SUMMARY, 0.01)["name"] == "gp-rbf"
+
+def test_cross_validate_small():
+    pytest.importorskip("gpflow")
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 1, (30, 2))
+    y = np.sin(3 * X[:, 0]) + X[:, 1]
+    candidates = [{"name": "gp-matern52", "model_type": "gp", "config": {"kernel": "matern52"}},
+                  {"name": "gp-rbf", "model_type": "gp", "config": {"kernel": "rbf"}}]
+    summary = cross_validate(X, y, candidates, k=3, processes=2)
+    assert {entry["name"] for entry in summary} == {"gp-matern52", "gp-rbf"}
+    assert summary[0]["rmse"] <= summary[1]["rmse"] < 0.5
+    assert all(entry["train_s"] > 0 and entry["rmse_std"] >= 0 for entry in summary)
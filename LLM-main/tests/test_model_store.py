@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from osairo.model_store import cached_model_path, load_cached_model, load_model, model_cache_key, save_model
+from osairo.preprocessing import FeaturePipeline
+
+gpflow = pytest.importorskip("gpflow")
+
+def data(n=12, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 1, (n, 2))
+    return X, np.sin(3 * X[:, :1]) + X[:, 1:]
+
+def gp_model(X, y, pipeline=None):
+    if pipeline is not None:
+        pipeline.fit(X, y)
+        X, y = pipeline.transform(X), pipeline.transform_targets(y)
+    model = gpflow.models.GPR(data=(X, y), kernel=gpflow.kernels.Matern52(lengthscales=0.4, variance=1.3),
+                              noise_variance=0.01)
+    model.osairo_pipeline = pipeline
+    return model
+
+def predict(model, X):
+    mean, variance = model.predict_f(X)
+    return np.asarray(mean), np.asarray(variance)
+
+def test_cache_key_stable_and_sensitive():
+    X, y = data()
+    key = model_cache_key("gp", X, y, {"kernel": "matern52"})
+    assert key == model_cache_key("gp", X.copy(), y.copy(), {"kernel": "matern52"})
+    assert key != model_cache_key("gp", X, y, {"kernel": "rbf"})
+    assert key != model_cache_key("nn", X, y, {"kernel": "matern52"})
+    y2 = y.copy()
+    y2[0, 0] += 1e-9
+    assert key != model_cache_key("gp", X, y2, {"kernel": "matern52"})
+    assert key != model_cache_key("gp", X[:-1], y[:-1], {"kernel": "matern52"})
+
+def test_gp_round_trip(tmp_path):
+    X, y = data()
+    model = gp_model(X, y)
+    path = save_model(model, "gp", str(tmp_path / "gp"))
+    assert path.endswith(".npz")
+    loaded = load_model(path)
+    X_test = data(5, seed=1)[0]
+    for before, after in zip(predict(model, X_test), predict(loaded, X_test)):
+        np.testing.assert_allclose(after, before, rtol=1e-10)
+    assert loaded.osairo_pipeline is None
+
+def test_gp_noise_on_lower_bound(tmp_path):
+    # The noise floor maps to -inf when inverting the constrained value; the
+    # stored unconstrained value must restore it exactly.
+    X, y = data()
+    model = gp_model(X, y)
+    model.likelihood.variance.unconstrained_variable.assign(-1e3)
+    loaded = load_model(save_model(model, "gp", str(tmp_path / "gp")))
+    assert np.isfinite(loaded.likelihood.variance.numpy())
+    np.testing.assert_allclose(loaded.likelihood.variance.numpy(), model.likelihood.variance.numpy())
+    np.testing.assert_allclose(predict(loaded, X)[0], predict(model, X)[0], rtol=1e-8)
+
+def test_gp_pipeline_persisted(tmp_path):
+    X, y = data()
+    X[:, 0] = 10 ** (X[:, 0] * 5)
+    model = gp_model(X, y, FeaturePipeline())
+    loaded = load_model(save_model(model, "gp", str(tmp_path / "gp")))
+    pipeline = loaded.osairo_pipeline
+    assert pipeline is not None
+    np.testing.assert_array_equal(pipeline.log_mask_, model.osairo_pipeline.log_mask_)
+    np.testing.assert_allclose(pipeline.transform(X), model.osairo_pipeline.transform(X))
+
+def test_nn_round_trip(tmp_path):
+    tf = pytest.importorskip("tensorflow")
+    X, y = data()
+    model = tf.keras.Sequential([tf.keras.layers.Input(shape=(2,)), tf.keras.layers.Dense(4, activation='relu'),
+                                 tf.keras.layers.Dense(1)])
+    model.osairo_pipeline = FeaturePipeline().fit(X, y)
+    path = save_model(model, "nn", str(tmp_path / "nn"))
+    assert path.endswith(".weights.h5")
+    loaded = load_model(str(tmp_path / "nn"))
+    np.testing.assert_allclose(loaded.predict(X, verbose=0), model.predict(X, verbose=0), rtol=1e-6)
+    assert loaded.osairo_pipeline is not None
+
+def test_load_cached_model_hit_and_miss(tmp_path):
+    X, y = data()
+    config = {"kernel": "matern52"}
+    cache = str(tmp_path / "cache")
+    assert load_cached_model(cache, "gp", X, y, config) is None
+    model = gp_model(X, y)
+    save_model(model, "gp", cached_model_path(cache, "gp", X, y, config))
+    hit = load_cached_model(cache, "gp", X, y, config)
+    np.testing.assert_allclose(predict(hit, X)[0], predict(model, X)[0], rtol=1e-10)
+    # Changed config or data is a different entry.
+    assert load_cached_model(cache, "gp", X, y, {"kernel": "rbf"}) is None
+    assert load_cached_model(cache, "gp", X, y + 1.0, config) is None
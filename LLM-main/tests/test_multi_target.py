@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from osairo.model_manager import combine_target_variances, get_most_uncertain_point, predict_mean_variance
+
+gpflow = pytest.importorskip("gpflow")
+
+def test_combine_target_variances():
+    variance = np.array([[1.0, 4.0], [2.0, 2.0], [9.0, 0.01]])
+    np.testing.assert_allclose(combine_target_variances(variance, 'sum'), [5.0, 4.0, 9.01])
+    np.testing.assert_allclose(combine_target_variances(variance, 'mean'), [2.5, 2.0, 4.505])
+    np.testing.assert_allclose(combine_target_variances(variance, 'max'), [4.0, 2.0, 9.0])
+    np.testing.assert_allclose(combine_target_variances(variance, 'geomean'), [2.0, 2.0, 0.3])
+    np.testing.assert_allclose(combine_target_variances(variance, 'sum', [1.0, 0.0]), [1.0, 2.0, 9.0])
+    np.testing.assert_allclose(combine_target_variances(variance[:, :1]), variance[:, 0])
+    with pytest.raises(ValueError):
+        combine_target_variances(variance, 'median')
+
+def multi_target_gp():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 1, (15, 2))
+    y = np.column_stack([np.sin(3 * X[:, 0]), 100 * X[:, 1]])
+    return gpflow.models.GPR(data=(X, y), kernel=gpflow.kernels.Matern52(lengthscales=0.3), noise_variance=1e-3)
+
+def test_argmax_is_a_row_index():
+    model = multi_target_gp()
+    X_pool = np.random.default_rng(1).uniform(0, 1.5, (300, 2))
+    _, variance = predict_mean_variance(model, X_pool)
+    assert variance.shape == (300, 2)
+    for rule in ('sum', 'max', 'geomean'):
+        point, idx, score = get_most_uncertain_point(model, X_pool, target_rule=rule)
+        # A flattened (n_points * n_targets) index would overrun the pool.
+        assert 0 <= idx < len(X_pool)
+        np.testing.assert_array_equal(point, X_pool[idx])
+        scores = combine_target_variances(variance, rule)
+        assert idx == int(np.argmax(scores)) and score == pytest.approx(scores.max())
+
+def test_argmax_with_pool_filter_maps_back():
+    from osairo.feature_index import FeatureIndex
+    model = multi_target_gp()
+    X_pool = np.random.default_rng(1).uniform(0, 1.5, (300, 2))
+    first = get_most_uncertain_point(model, X_pool)[1]
+    point, idx, _ = get_most_uncertain_point(model, X_pool, exclude=FeatureIndex(X_pool[first:first + 1]))
+    assert idx != first and idx < len(X_pool)
+    np.testing.assert_array_equal(point, X_pool[idx])
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from osairo.model_manager import get_most_uncertain_point
+from osairo.precision import Float32GPPredictor, check_ranking_agreement, float32_predictor, verified_float32
+
+gpflow = pytest.importorskip("gpflow")
+
+def gp(kernel, n=30, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 1, (n, 2))
+    y = np.column_stack([np.sin(4 * X[:, 0]) + X[:, 1], X[:, 0] * X[:, 1]])
+    return gpflow.models.GPR(data=(X, y), kernel=kernel, noise_variance=1e-3)
+
+@pytest.mark.parametrize("kernel", [
+    gpflow.kernels.Matern52(lengthscales=[0.3, 0.5]), gpflow.kernels.Matern32(lengthscales=0.4),
+    gpflow.kernels.SquaredExponential(lengthscales=0.3, variance=2.0), gpflow.kernels.RationalQuadratic(),
+])
+def test_float32_matches_float64(kernel):
+    model = gp(kernel)
+    X = np.random.default_rng(1).uniform(-0.2, 1.2, (200, 2))
+    mean64, var64 = (np.asarray(a) for a in model.predict_f(X))
+    mean32, var32 = Float32GPPredictor(model).predict_f(X)
+    assert mean32.dtype == np.float32 and var32.shape == var64.shape
+    np.testing.assert_allclose(mean32, mean64, atol=1e-3 * np.abs(mean64).max())
+    np.testing.assert_allclose(var32, var64, atol=1e-3 * float(kernel.variance.numpy()))
+
+def test_predictor_is_cached_per_model():
+    model = gp(gpflow.kernels.Matern52())
+    assert float32_predictor(model) is float32_predictor(model)
+
+@pytest.mark.parametrize("acquisition", ["variance", "ucb", "ei"])
+def test_ranking_agreement_on_acquisition_in_use(acquisition):
+    model = gp(gpflow.kernels.Matern52(lengthscales=0.3))
+    X = np.random.default_rng(2).uniform(0, 1, (500, 2))
+    agreement = check_ranking_agreement(model, X, acquisition)
+    assert agreement["acquisition"] == acquisition
+    assert agreement["top_k_overlap"] >= 0.8 and agreement["spearman"] > 0.99
+
+def test_fallback_below_min_overlap(monkeypatch, capsys):
+    model = gp(gpflow.kernels.Matern52(lengthscales=0.3))
+    X = np.random.default_rng(3).uniform(0, 1, (300, 2))
+    # Simulate a float32 path that scrambles the ranking.
+    predictor = float32_predictor(model)
+    scramble = np.random.default_rng(4).permutation
+    monkeypatch.setattr(predictor, "predict_f", lambda X: (np.zeros((len(X), 2), np.float32),
+                                                           np.repeat(scramble(len(X))[:, None], 2, 1)
+                                                           .astype(np.float32)))
+    assert not verified_float32(model, X, "variance")
+    assert "scoring in float64" in capsys.readouterr().out
+    # get_most_uncertain_point falls back to float64 and still picks the float64 argmax.
+    _, idx, _ = get_most_uncertain_point(model, X, precision='float32')
+    _, idx64, _ = get_most_uncertain_point(model, X, precision='float64')
+    assert idx == idx64
+    # The check runs once per acquisition setting and is then reused.
+    checks = len(predictor.agreement)
+    get_most_uncertain_point(model, X, precision='float32')
+    assert len(predictor.agreement) == checks
+    verified_float32(model, X, "ucb", {"beta": 1.0})
+    assert len(predictor.agreement) == checks + 1
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from osairo.data_manager import sample_candidate_pool
+from osairo.model_manager import predict_mean_variance
+from osairo.preprocessing import FeaturePipeline, log_scale_columns
+
+def isotherm_data(n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    # Pressure over 2.5 decades, temperature over a narrow range.
+    X = np.column_stack([10 ** rng.uniform(3, 5.5, n), rng.uniform(250, 350, n)])
+    y = np.column_stack([np.log10(X[:, 0]) * 3 - X[:, 1] / 100, 50 + 10 * rng.standard_normal(n)])
+    return X, y
+
+def test_fit_transform_round_trip():
+    X, y = isotherm_data()
+    pipeline = FeaturePipeline().fit(X, y)
+    np.testing.assert_array_equal(pipeline.log_mask_, [True, False])
+    Z = pipeline.transform(X)
+    np.testing.assert_allclose(Z.mean(axis=0), 0.0, atol=1e-12)
+    np.testing.assert_allclose(Z.std(axis=0), 1.0)
+    np.testing.assert_allclose(Z[:, 0], (np.log10(X[:, 0]) - np.log10(X[:, 0]).mean()) / np.log10(X[:, 0]).std())
+    np.testing.assert_allclose(pipeline.inverse_transform_targets(pipeline.transform_targets(y)), y)
+    # Stored and restored state transforms identically.
+    restored = FeaturePipeline.from_arrays(pipeline.to_arrays())
+    np.testing.assert_allclose(restored.transform(X), Z)
+    np.testing.assert_allclose(restored.inverse_transform_targets(pipeline.transform_targets(y)), y)
+
+def test_pca_keeps_explained_fraction():
+    rng = np.random.default_rng(1)
+    base = rng.standard_normal((100, 1))
+    X = np.hstack([base, 2 * base + 1e-3 * rng.standard_normal((100, 1)), rng.standard_normal((100, 1))])
+    assert FeaturePipeline(pca_components=0.6).fit(X).transform(X).shape == (100, 1)
+    assert FeaturePipeline(pca_components=2).fit(X).transform(X).shape == (100, 2)
+
+def test_variance_maps_back_with_scale_squared():
+    X, y = isotherm_data()
+    pipeline = FeaturePipeline().fit(X, y)
+    variance = np.array([[0.5, 2.0]])
+    np.testing.assert_allclose(pipeline.inverse_transform_variance(variance), variance * pipeline.y_std_ ** 2)
+    # Matches the spread of normalized-space samples mapped back to target units.
+    samples = np.random.default_rng(2).normal(0.0, np.sqrt(variance), (200000, 2))
+    np.testing.assert_allclose(pipeline.inverse_transform_targets(samples).var(axis=0),
+                               pipeline.inverse_transform_variance(variance)[0], rtol=0.02)
+
+def test_predictions_in_target_units():
+    gpflow = pytest.importorskip("gpflow")
+    X, y = isotherm_data()
+    y = y[:, :1] * 1000.0
+    pipeline = FeaturePipeline().fit(X, y)
+    model = gpflow.models.GPR(data=(pipeline.transform(X), pipeline.transform_targets(y)),
+                              kernel=gpflow.kernels.Matern52(), noise_variance=0.1)
+    model.osairo_pipeline = pipeline
+    mean, variance = predict_mean_variance(model, X[:5], chunk_size=2)
+    raw_mean, raw_variance = model.predict_f(pipeline.transform(X[:5]))
+    np.testing.assert_allclose(mean, np.asarray(raw_mean) * pipeline.y_std_ + pipeline.y_mean_)
+    np.testing.assert_allclose(variance, np.asarray(raw_variance) * pipeline.y_std_ ** 2)
+
+def test_sampling_and_pipeline_agree_on_log_columns():
+    # 2.5 decades: log-sampled and log-scaled alike.
+    X, _ = isotherm_data()
+    pool = sample_candidate_pool(X, n_samples=20000, seed=0)
+    log_p = np.log10(pool[:, 0])
+    assert abs(np.median(log_p) - np.log10(X[:, 0]).min() - (np.ptp(np.log10(X[:, 0])) / 2)) < 0.05
+    np.testing.assert_array_equal(log_scale_columns(X), FeaturePipeline().fit(X).log_mask_)
+    np.testing.assert_array_equal(log_scale_columns(np.array([[1.0, -1.0], [50.0, 500.0]])), [False, False])
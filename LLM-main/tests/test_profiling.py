@@ -0,0 +1,90 @@
+import json
+import threading
+import pytest
+from osairo import profiling
+
+@pytest.fixture(autouse=True)
+def clean_profiler():
+    profiling.reset()
+    yield
+    profiling.enable_profiling(False)
+    profiling.reset()
+
+def test_spans_are_noops_when_disabled():
+    profiling.enable_profiling(False)
+    with profiling.span("score", n=3) as attrs:
+        attrs["extra"] = 1
+    assert attrs == {"n": 3, "extra": 1}
+    assert profiling.traced("train")(lambda x: x + 1)(1) == 2
+    assert profiling.get_spans() == []
+
+def test_nested_spans_and_report():
+    profiling.enable_profiling()
+    with profiling.span("cycle"):
+        with profiling.span("train"):
+            pass
+        with profiling.span("train"):
+            pass
+    spans = {(s["name"], s["span_id"]): s for s in profiling.get_spans()}
+    cycle = next(s for (name, _), s in spans.items() if name == "cycle")
+    children = [s for (name, _), s in spans.items() if name == "train"]
+    assert len(children) == 2 and cycle["parent_id"] is None
+    assert all(c["parent_id"] == cycle["span_id"] and c["trace_id"] == cycle["trace_id"] for c in children)
+    report = profiling.stage_report()
+    assert report["train"]["count"] == 2 and report["cycle"]["total_s"] >= report["train"]["total_s"]
+
+def test_threads_have_their_own_stack():
+    profiling.enable_profiling()
+    worker = []
+    with profiling.span("main"):
+        def run():
+            with profiling.span("worker"):
+                pass
+            worker.extend(s for s in profiling.get_spans() if s["name"] == "worker")
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+    # A span opened in a worker thread does not nest under the caller's span.
+    assert worker[0]["parent_id"] is None
+
+class Response:
+    usage_metadata = {"input_tokens": 120, "output_tokens": 30}
+
+class Chat:
+    def invoke(self, messages):
+        return Response()
+
+def test_llm_tokens_recorded():
+    profiling.enable_profiling()
+    profiling.invoke_llm(Chat(), ["hi"], "script")
+    profiling.invoke_llm(Chat(), ["hi"], "script")
+    stage = profiling.stage_report()["llm.script"]
+    assert (stage["count"], stage["prompt_tokens"], stage["completion_tokens"]) == (2, 240, 60)
+
+def test_otlp_json_shape(tmp_path):
+    profiling.enable_profiling()
+    with profiling.span("cycle", cycle=1):
+        with profiling.span("score", acquisition="ucb", ratio=0.5, cached=True):
+            pass
+    path = profiling.export(str(tmp_path / "trace.otlp.json"))
+    payload = json.load(open(path))
+    (resource,) = payload["resourceSpans"]
+    assert resource["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "osairo"}}]
+    (scope,) = resource["scopeSpans"]
+    assert scope["scope"] == {"name": "osairo.profiling"}
+    spans = {s["name"]: s for s in scope["spans"]}
+    assert set(spans) == {"cycle", "score"}
+    for s in spans.values():
+        assert len(s["traceId"]) == 32 and len(s["spanId"]) == 16 and s["kind"] == 1
+        assert int(s["endTimeUnixNano"]) >= int(s["startTimeUnixNano"])
+    assert "parentSpanId" not in spans["cycle"]
+    assert spans["score"]["parentSpanId"] == spans["cycle"]["spanId"]
+    assert spans["score"]["attributes"] == [
+        {"key": "acquisition", "value": {"stringValue": "ucb"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "cached", "value": {"boolValue": True}},
+    ]
+    assert spans["cycle"]["attributes"] == [{"key": "cycle", "value": {"intValue": "1"}}]
+    # Plain .json exports the raw spans and the per-stage summary.
+    plain = json.load(open(profiling.export(str(tmp_path / "trace.json"))))
+    assert set(plain) == {"spans", "stages"} and plain["stages"]["score"]["count"] == 1
@@ -0,0 +1,117 @@
+import os
+from osairo.result_harvester import append_harvested_results, harvest_results, parse_gulp_output, parse_raspa_output
+from osairo.training_store import TrainingStore
+
+RASPA_OUTPUT = """\
+Compiler and run-time data
+===========================================================================
+External temperature: 298.000000 [K]
+External Pressure: 100000.000000 [Pa]
+
+Average loading absolute [molecules/unit cell]   12.3 +/- 0.1 [-]
+
+Number of molecules:
+====================
+
+Component 0 [CO2]
+-------------------------------------------------------------
+	Block[ 0]         1.6531 [mol/kg]
+	Average loading absolute [mol/kg framework]            1.6419553047  +/-       0.0105338466 [-]
+	Average loading excess [mol/kg framework]            1.5812277304  +/-       0.0105338466 [-]
+
+Component 1 [N2]
+-------------------------------------------------------------
+	Average loading absolute [mol/kg framework]            0.0934123456  +/-       0.0021000000 [-]
+	Average loading excess [mol/kg framework]            0.0801234567  +/-       0.0021000000 [-]
+"""
+
+# Killed during production: header written, no averages yet.
+RASPA_TRUNCATED = """\
+External temperature: 298.000000 [K]
+External Pressure: 100000.000000 [Pa]
+Current cycle: 4000 out of 10000
+Component 0 [CO2]
+	Loadings: 1.6 (mol/kg)
+"""
+
+GULP_OUTPUT = """\
+  Total lattice energy       =       -1234.56780000 eV
+
+  **** Optimisation achieved ****
+
+  Final energy =   -1240.12345678 eV
+
+  Final cell parameters and derivatives :
+
+--------------------------------------------------------------------------------
+       a            7.104512 Angstrom     dE/de1(xx)     0.000012 eV/strain
+       b            7.104512 Angstrom     dE/de2(yy)     0.000012 eV/strain
+       c            7.210000 Angstrom     dE/de3(zz)    -0.000001 eV/strain
+       alpha       90.000000 Degrees      dE/de4(yz)     0.000000 eV/strain
+       beta        90.000000 Degrees      dE/de5(xz)     0.000000 eV/strain
+       gamma      120.000000 Degrees      dE/de6(xy)     0.000000 eV/strain
+--------------------------------------------------------------------------------
+"""
+
+GULP_DUMP = """\
+opti conp
+totalenergy       -1240.1234567800 eV
+cell
+   7.104512   7.104512   7.210000  90.000000  90.000000 120.000000
+"""
+
+GULP_FAILED = """\
+  Total lattice energy       =       -1234.56780000 eV
+  **** Too many failed attempts to optimise ****
+  Final energy =   -1236.00000000 eV
+"""
+
+GULP_ERROR = """\
+!! ERROR : species O1 shel has not been defined
+Program terminated by processor 0 in input
+"""
+
+def test_raspa_output():
+    row = parse_raspa_output(RASPA_OUTPUT)
+    assert row == {
+        "loading_absolute_CO2": 1.6419553047, "loading_absolute_CO2_err": 0.0105338466,
+        "loading_excess_CO2": 1.5812277304, "loading_excess_CO2_err": 0.0105338466,
+        "loading_absolute_N2": 0.0934123456, "loading_absolute_N2_err": 0.0021,
+        "loading_excess_N2": 0.0801234567, "loading_excess_N2_err": 0.0021,
+        "pressure": 100000.0, "temperature": 298.0,
+    }
+
+def test_raspa_truncated_and_empty():
+    assert parse_raspa_output(RASPA_TRUNCATED) is None
+    assert parse_raspa_output("") is None
+
+def test_gulp_output_uses_final_energy_and_cell():
+    row = parse_gulp_output(GULP_OUTPUT)
+    assert row["lattice_energy"] == -1240.12345678
+    assert (row["a"], row["c"], row["gamma"]) == (7.104512, 7.21, 120.0)
+
+def test_gulp_dump():
+    row = parse_gulp_output(GULP_DUMP)
+    assert row == {"lattice_energy": -1240.12345678, "a": 7.104512, "b": 7.104512, "c": 7.21,
+                   "alpha": 90.0, "beta": 90.0, "gamma": 120.0}
+
+def test_gulp_failed_and_error_runs():
+    # A failed optimisation still reports its last energy but no final cell.
+    assert parse_gulp_output(GULP_FAILED) == {"lattice_energy": -1236.0}
+    assert parse_gulp_output(GULP_ERROR) is None
+
+def test_harvest_results_skips_unfinished_and_unchanged(tmp_path):
+    (tmp_path / "done.data").write_text(RASPA_OUTPUT)
+    (tmp_path / "running.data").write_text(RASPA_TRUNCATED)
+    (tmp_path / "opt.gout").write_text(GULP_OUTPUT)
+    state = tmp_path / "state.json"
+    rows = harvest_results([str(tmp_path)], state_file=str(state), processes=1)
+    assert sorted(os.path.basename(row["source_file"]) for row in rows) == ["done.data", "opt.gout"]
+    assert harvest_results([str(tmp_path)], state_file=str(state), processes=1) == []
+
+def test_append_harvested_rows_to_training_store():
+    store = TrainingStore(["pressure", "loading"])
+    row = dict(parse_raspa_output(RASPA_OUTPUT), source_file="/runs/done.data")
+    append_harvested_results(store, [row], column_map={"loading_absolute_CO2": "loading"})
+    assert store.columns == ["pressure", "loading"]
+    assert store.data.tolist() == [[100000.0, 1.6419553047]]
@@ -0,0 +1,133 @@
+import pytest
+from osairo.scheduler import (FINISHED, SchedulerClient, parse_accounting_output, parse_status_output,
+                              parse_submit_output, states_by_job)
+from osairo.local_executor import CANCELLED, COMPLETED, FAILED, PENDING, RUNNING, TIMEOUT
+
+SQUEUE = """\
+1001 PENDING
+1002 RUNNING
+1003 COMPLETING
+1004_7 PENDING
+"""
+
+QSTAT = """\
+job-ID  prior   name       user         state submit/start at     queue                          slots ja-task-ID
+-----------------------------------------------------------------------------------------------------------------
+   2001 0.55500 run.sh     alice        r     05/01/2024 10:00:01 long@node12                        8
+   2002 0.00000 run.sh     alice        qw    05/01/2024 10:00:02                                    8
+   2003 0.00000 run.sh     alice        Eqw   05/01/2024 10:00:03                                    8
+   2004 0.55500 run.sh     alice        dr    05/01/2024 10:00:04 long@node13                        8
+"""
+
+SACCT = """\
+1001|COMPLETED
+1002|FAILED
+1003|CANCELLED by 1234
+1005|TIMEOUT
+1006|OUT_OF_MEMORY
+"""
+
+def test_parse_submit_output():
+    assert parse_submit_output("slurm", "12345\n") == "12345"
+    assert parse_submit_output("slurm", "12345;cluster\n") == "12345"
+    assert parse_submit_output("uge", 'Your job 678 ("run.sh") has been submitted\n') == "678"
+    assert parse_submit_output("uge", 'Your job-array 679.1-10:1 ("run.sh") has been submitted\n') == "679"
+    with pytest.raises(RuntimeError):
+        parse_submit_output("slurm", "sbatch: error: invalid partition\n")
+
+def test_parse_squeue():
+    states = parse_status_output("slurm", SQUEUE)
+    assert states == {"1001": PENDING, "1002": RUNNING, "1003": RUNNING, "1004_7": PENDING}
+    assert "9999" not in states
+
+def test_parse_qstat():
+    states = parse_status_output("uge", QSTAT)
+    assert states == {"2001": RUNNING, "2002": PENDING, "2003": FAILED, "2004": CANCELLED}
+
+def test_array_tasks_reduce_to_their_job():
+    squeue = "1004_[8-10] PENDING\n1004_3 RUNNING\n1004_7 PENDING\n1005_[1-4] PENDING\n"
+    assert states_by_job(parse_status_output("slurm", squeue)) == {"1004": RUNNING, "1005": PENDING}
+    # UGE lists each task of a job-array under the same job id.
+    qstat = ("   2001 0.5 run.sh alice qw 05/01/2024 10:00:01   1 5-10:1\n"
+             "   2001 0.5 run.sh alice r  05/01/2024 10:00:01 long@node12 1 4\n")
+    assert parse_status_output("uge", qstat) == {"2001": RUNNING}
+
+def test_parse_sacct():
+    states = parse_accounting_output(SACCT)
+    assert states == {"1001": COMPLETED, "1002": FAILED, "1003": CANCELLED, "1005": TIMEOUT, "1006": FAILED}
+    assert parse_accounting_output("") == {}
+
+class CannedScheduler(SchedulerClient):
+    """
+    SchedulerClient whose commands return queued canned outputs.
+    """
+
+    def __init__(self, outputs, **kwargs):
+        super().__init__("slurm", user="alice", **kwargs)
+        self.outputs = outputs
+        self.commands = []
+
+    def _run(self, command, cwd=None):
+        self.commands.append(command[0])
+        output = self.outputs[command[0]].pop(0)
+        if isinstance(output, Exception):
+            raise output
+        return output
+
+def test_one_query_per_poll_and_batched_accounting(tmp_path):
+    outputs = {
+        "sbatch": ["1001\n", "1002\n", "1003\n"],
+        "squeue": ["1001 RUNNING\n1002 PENDING\n1003 PENDING\n", "1003 RUNNING\n"],
+        "sacct": ["1001|COMPLETED\n1002|FAILED\n"],
+    }
+    client = CannedScheduler(outputs, min_interval=0)
+    for name in ("a", "b", "c"):
+        client.submit(tmp_path / f"{name}.sh")
+    assert client.poll() == {"1001": RUNNING, "1002": PENDING, "1003": PENDING}
+    assert client.poll() == {"1001": COMPLETED, "1002": FAILED, "1003": RUNNING}
+    # Two polls over three jobs: two squeue calls and one sacct for both finished jobs.
+    assert client.commands.count("squeue") == 2 and client.commands.count("sacct") == 1
+    assert client.queries == 3
+    assert client.summary() == {COMPLETED: 1, FAILED: 1, RUNNING: 1}
+
+def test_missing_job_is_finished(tmp_path):
+    client = CannedScheduler({"sbatch": ["1001\n"], "squeue": [""], "sacct": ["1001|RUNNING\n"]}, min_interval=0)
+    client.submit(tmp_path / "a.sh")
+    # Left the queue while accounting still says RUNNING: it has ended.
+    assert client.poll() == {"1001": FINISHED}
+
+def test_missing_job_without_accounting_command(tmp_path):
+    client = CannedScheduler({"sbatch": ["1001\n"], "squeue": [""]}, accounting_cmd="", min_interval=0)
+    client.submit(tmp_path / "a.sh")
+    assert client.poll() == {"1001": FINISHED}
+    assert "sacct" not in client.commands
+
+def test_backoff_and_reset(tmp_path):
+    client = CannedScheduler({
+        "sbatch": ["1001\n"],
+        "squeue": ["1001 PENDING\n", "1001 PENDING\n", RuntimeError("squeue: timeout"), "1001 RUNNING\n"],
+    }, min_interval=1, max_interval=6, backoff=2)
+    client.submit(tmp_path / "a.sh")
+    client.poll(force=True)      # no change: back off
+    assert client.interval == 2
+    client.poll(force=True)
+    assert client.interval == 4
+    client.poll(force=True)      # a failed query backs off too, capped at max_interval
+    assert client.interval == 6
+    assert client.poll() == {"1001": PENDING}  # not due yet: no query
+    assert client.commands.count("squeue") == 3
+    client.poll(force=True)      # a state change resets the interval
+    assert client.status("1001") == RUNNING and client.interval == 1
+
+def test_array_job_is_active_while_any_task_is_listed(tmp_path):
+    client = CannedScheduler({
+        "sbatch": ["1004\n"],
+        "squeue": ["1004_[3-4] PENDING\n1004_1 RUNNING\n", "1004_4 PENDING\n", ""],
+        "sacct": ["1004_1|COMPLETED\n1004_2|COMPLETED\n1004_3|FAILED\n1004_4|COMPLETED\n"],
+    }, min_interval=0)
+    client.submit(tmp_path / "array.sh")
+    assert client.poll() == {"1004": RUNNING}
+    assert client.poll() == {"1004": PENDING}
+    # All tasks have left the queue; one of them failed.
+    assert client.poll() == {"1004": FAILED}
+    assert client.commands.count("sacct") == 1
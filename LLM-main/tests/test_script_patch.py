@@ -0,0 +1,57 @@
+import pytest
+from osairo.script_patch import PatchError, apply_line_edits, apply_patch, apply_unified_diff, parse_unified_diff
+
+SCRIPT = "line1\nline2\nline3\nline4\nline5\n"
+
+def test_parse_unified_diff_reads_hunks():
+    hunks = parse_unified_diff("--- a\n+++ b\n@@ -2,1 +2,1 @@\n-line2\n+LINE2\n")
+    assert hunks == [{"old_start": 2, "lines": [("-", "line2"), ("+", "LINE2")]}]
+
+def test_parse_unified_diff_without_hunks():
+    with pytest.raises(PatchError):
+        parse_unified_diff("just some text")
+
+def test_insert_only_hunk_goes_after_line():
+    diff = "@@ -2,0 +3,1 @@\n+inserted\n"
+    assert apply_unified_diff(SCRIPT, diff) == "line1\nline2\ninserted\nline3\nline4\nline5\n"
+
+def test_insert_at_top():
+    diff = "@@ -0,0 +1,1 @@\n+first\n"
+    assert apply_unified_diff(SCRIPT, diff).startswith("first\nline1\n")
+
+def test_delete_only_hunk():
+    diff = "@@ -3,2 +2,0 @@\n-line3\n-line4\n"
+    assert apply_unified_diff(SCRIPT, diff) == "line1\nline2\nline5\n"
+
+def test_drifted_line_numbers_use_context():
+    diff = "@@ -1,3 +1,3 @@\n line3\n-line4\n+LINE4\n line5\n"
+    assert apply_unified_diff(SCRIPT, diff) == "line1\nline2\nline3\nLINE4\nline5\n"
+
+def test_out_of_order_hunks():
+    diff = "@@ -5,1 +5,1 @@\n-line5\n+LINE5\n@@ -1,1 +1,1 @@\n-line1\n+LINE1\n"
+    assert apply_unified_diff(SCRIPT, diff) == "LINE1\nline2\nline3\nline4\nLINE5\n"
+
+def test_missing_context_raises():
+    diff = "@@ -2,2 +2,2 @@\n line2\n-not in script\n+x\n"
+    with pytest.raises(PatchError):
+        apply_unified_diff(SCRIPT, diff)
+
+def test_line_edits():
+    edits = [
+        {"action": "replace", "start": 1, "end": 1, "text": "LINE1"},
+        {"action": "delete", "start": 3, "end": 4},
+        {"action": "insert", "after": 5, "text": "line6"},
+    ]
+    assert apply_line_edits(SCRIPT, edits) == "LINE1\nline2\nline5\nline6\n"
+
+def test_overlapping_line_edits_raise():
+    edits = [{"action": "delete", "start": 2, "end": 3}, {"action": "replace", "start": 3, "end": 3, "text": "x"}]
+    with pytest.raises(PatchError):
+        apply_line_edits(SCRIPT, edits)
+
+def test_apply_patch_detects_format():
+    fenced = "```diff\n@@ -1,1 +1,1 @@\n-line1\n+LINE1\n```"
+    assert apply_patch(SCRIPT, fenced).startswith("LINE1\n")
+    assert apply_patch(SCRIPT, '{"action": "delete", "start": 5}') == "line1\nline2\nline3\nline4\n"
+    with pytest.raises(PatchError):
+        apply_patch(SCRIPT, '[{"action": "replace"}]')
@@ -0,0 +1,139 @@
+import json
+import numpy as np
+import pytest
+from osairo.script_templates import (ScriptTemplate, TemplateStore, capture_template, point_values,
+                                     render_scripts)
+
+RASPA = """\
+SimulationType                MonteCarlo
+NumberOfCycles                10000
+Framework 0
+FrameworkName                 CuBTC
+UnitCells                     1 1 1
+ExternalTemperature           298.0
+ExternalPressure              1e5
+"""
+
+LAMMPS = """\
+variable T equal 300.0
+velocity all create ${T} 4928459
+fix 1 all npt temp 300.0 300.0 100.0 iso 1.0 1.0 1000.0
+fix 2 all nvt temp 300.0 500.0 100.0
+run 50000
+"""
+
+def test_capture_and_render_raspa():
+    template = capture_template("raspa", RASPA)
+    assert template.slots == ["cycles", "framework", "pressure", "temperature", "unit_cells"]
+    assert template.defaults["pressure"] == "1e5" and template.defaults["unit_cells"] == "1 1 1"
+    assert template.render() == RASPA
+    rendered = template.render({"pressure": 2e6, "temperature": 77.0})
+    assert "ExternalPressure              2000000\n" in rendered
+    assert "ExternalTemperature           77\n" in rendered
+    assert "FrameworkName                 CuBTC\n" in rendered
+
+def test_lammps_ramp_is_not_flattened():
+    template = capture_template("lammps", LAMMPS)
+    rendered = template.render({"temperature": 350, "pressure": 5})
+    assert "variable T equal 350\n" in rendered
+    # References are left alone.
+    assert "velocity all create ${T} 4928459\n" in rendered
+    assert "fix 1 all npt temp 350 350 100.0 iso 5 5 1000.0\n" in rendered
+    # Tstart != Tstop: the ramp keeps its seed values.
+    assert "fix 2 all nvt temp 300.0 500.0 100.0\n" in rendered
+
+def test_gromacs_groups():
+    same = capture_template("gromacs", "ref_t = 300 300\nref_p = 1.0\n")
+    assert same.render({"temperature": 320, "pressure": 2}) == "ref_t = 320 320\nref_p = 2\n"
+    different = capture_template("gromacs", "ref_t = 300 310\n")
+    assert different.slots == [] and different.render() == "ref_t = 300 310\n"
+
+def test_explicit_placeholders_are_required():
+    template = capture_template("raspa", "ExternalPressure 1e5\nMoleculeName {{molecule}}\n")
+    assert template.slots == ["molecule", "pressure"]
+    assert "MoleculeName CO2" in template.render(molecule="CO2")
+    with pytest.raises(ValueError, match="molecule"):
+        template.render()
+
+def test_covers():
+    template = capture_template("raspa", RASPA)
+    assert template.covers({"pressure": 1.0, "temperature": 300.0})
+    # Slots the point does not vary keep the seed's value.
+    assert template.covers({"pressure": 1.0})
+    # A point field with no slot, or a slot with no seed value, is not covered.
+    assert not template.covers({"pressure": 1.0, "temperature": 300.0, "loading": 2.0})
+    assert not template.covers({})
+    assert not capture_template("raspa", RASPA + "MoleculeName {{molecule}}\n").covers({"pressure": 1.0})
+    pressure_only = capture_template("raspa", "ExternalPressure 1e5\nFrameworkName CuBTC\n")
+    assert pressure_only.covers({"pressure": 1.0})
+
+def test_isotherm_point_renders_from_raspa_seed():
+    template = capture_template("raspa", RASPA, context="CuBTC CO2 298K")
+    values = point_values([2.5e5], "pressure")
+    assert template.covers(values)
+    rendered = template.render(values)
+    assert "ExternalPressure              250000" in rendered
+    # The isotherm's fixed temperature and setup come from the seed.
+    assert "ExternalTemperature           298" in rendered and "FrameworkName                 CuBTC" in rendered
+
+def test_point_values_and_render_scripts(tmp_path):
+    assert point_values([1e5, 298.0], "Pressure, temperature") == {"pressure": 1e5, "temperature": 298.0}
+    template = capture_template("raspa", RASPA)
+    paths = render_scripts(template, [[1e4, 300.0], [1e6, 350.0]], ["pressure", "temperature"], str(tmp_path),
+                           indices=[7, 9])
+    assert [p.rsplit("/", 1)[1] for p in paths] == ["raspa_simulation_7.input", "raspa_simulation_9.input"]
+    assert "ExternalPressure              1000000" in open(paths[1]).read()
+
+def test_store_keys_on_type_and_context(tmp_path):
+    store = TemplateStore(str(tmp_path))
+    cubtc = capture_template("raspa", RASPA, context="CuBTC CO2 298K")
+    path = store.save(cubtc)
+    assert json.load(open(path))["context"] == "CuBTC CO2 298K"
+    # Whitespace differences in the context map to the same setup.
+    assert store.get("raspa", "CuBTC  CO2\n298K") is cubtc
+    assert store.get("raspa", "ZIF-8 CO2 298K") is None
+    assert store.get("raspa") is None and store.get("lammps", "CuBTC CO2 298K") is None
+    # A fresh store reads the saved template back.
+    loaded = TemplateStore(str(tmp_path)).get("raspa", "CuBTC CO2 298K")
+    assert isinstance(loaded, ScriptTemplate)
+    assert loaded.render({"pressure": 5, "temperature": 1}) == cubtc.render({"pressure": 5, "temperature": 1})
+    store.save(capture_template("raspa", RASPA.replace("CuBTC", "ZIF-8"), context="ZIF-8 CO2 298K"))
+    assert "ZIF-8" in store.get("raspa", "ZIF-8 CO2 298K").render()
+    assert "CuBTC" in store.get("raspa", "CuBTC CO2 298K").render()
+
+def test_cycle_templates_are_keyed_on_the_ensemble(tmp_path, monkeypatch):
+    from osairo import active_learning
+    answers = {"represent": "pressure", "description": "CO2 in CuBTC"}
+    ensembles = ["NVT", "NVT", "NPT", "NVT"]
+    confirms = [True, False]
+    generated = []
+
+    def prompt(text, default=None):
+        if text.startswith("Enter ensemble"):
+            return ensembles.pop(0)
+        return next(answer for key, answer in answers.items() if key in text)
+
+    def generate(simulation_type, parameters, ensemble=None):
+        generated.append(ensemble)
+        return RASPA.replace("CuBTC", f"CuBTC{len(generated)}")
+
+    monkeypatch.setattr(active_learning.click, "prompt", prompt)
+    monkeypatch.setattr(active_learning.click, "confirm", lambda *args, **kwargs: confirms.pop(0))
+    monkeypatch.setattr(active_learning, "interactive_generate_simulation_script", generate)
+    monkeypatch.setattr(active_learning, "ensure_valid_script", lambda sim_type, script, params: (script, []))
+    monkeypatch.setattr(active_learning, "generate_job_script", lambda *args: "#!/bin/bash\n")
+    store = TemplateStore(str(tmp_path / "templates"))
+    pool = np.array([[1e4], [2e4], [3e4], [4e4]])
+    points = []
+    for _ in range(4):
+        point, sim_script, _ = active_learning.active_learning_cycle(None, "nn", pool, "raspa", "CuBTC", "slurm",
+                                                                     folder=str(tmp_path), templates=store)
+        points.append((point, (tmp_path / sim_script).read_text()))
+    # The second NVT point (pressure only) is rendered from the captured seed,
+    # temperature included; NPT is generated afresh.
+    assert generated[:2] == ["NVT", "NPT"]
+    assert "CuBTC1" in points[1][1] and f"ExternalPressure              {points[1][0][0]:g}" in points[1][1]
+    # Declining a rendered script regenerates it but keeps the stored template.
+    assert generated == ["NVT", "NPT", "NVT"]
+    saved = [json.loads(path.read_text()) for path in (tmp_path / "templates").glob("*.json")]
+    assert sorted(t["defaults"]["framework"] for t in saved) == ["CuBTC1", "CuBTC2"]
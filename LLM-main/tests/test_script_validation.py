@@ -0,0 +1,119 @@
+from osairo.script_validation import validate_script
+
+RASPA = """\
+SimulationType                MonteCarlo
+NumberOfCycles                10000
+NumberOfInitializationCycles  2000
+PrintEvery                    1000
+CutOff                        12.0
+
+Framework 0
+FrameworkName                 CuBTC
+UnitCells                     1 1 1
+ExternalTemperature           298.0
+ExternalPressure              1e5
+
+Component 0 MoleculeName      N2
+            SwapProbability   1.0
+            CreateNumberOfMolecules 0
+"""
+
+LAMMPS = """\
+units real
+atom_style full
+read_data system.data
+pair_style lj/cut 12.0
+pair_coeff * * 0.1 3.0
+thermo 100
+dump 1 all atom 1000 dump.lammpstrj
+fix 1 all nvt temp 300.0 300.0 100.0
+run 50000
+"""
+
+GROMACS = """\
+integrator = md
+dt         = 0.002
+nsteps     = 500000
+tcoupl     = V-rescale
+tc-grps    = Protein Non-Protein
+tau_t      = 0.1 0.1
+ref_t      = 300 300
+pcoupl     = no
+"""
+
+GULP = """\
+opti conp
+cell
+7.0 7.0 7.0 90.0 90.0 90.0
+frac
+Si core 0.000000 0.000000 0.000000
+O1 core 0.500000 0.000000 0.000000
+O1 shel 0.500000 0.000000 0.000000
+species
+Si core 4.00000
+O1 core 0.86902
+O1 shel -2.86902
+dump test.gout
+"""
+
+def test_good_scripts_pass():
+    assert validate_script("raspa", RASPA) == []
+    assert validate_script("lammps", LAMMPS) == []
+    assert validate_script("gromacs", GROMACS) == []
+    assert validate_script("gulp", GULP) == []
+
+def test_common_issues():
+    assert validate_script("raspa", "   ") == ["Script is empty."]
+    issues = validate_script("lammps", "Here is your script:\n```\n" + LAMMPS + "```\n")
+    assert any("code fences" in issue for issue in issues)
+    assert any("commentary" in issue for issue in issues)
+    # Unknown types only get the generic checks.
+    assert validate_script("cp2k", "&GLOBAL\n&END GLOBAL\n") == []
+
+def test_raspa_errors():
+    script = RASPA.replace("ExternalPressure              1e5", "ExternalPressure              high")
+    script = script.replace("UnitCells                     1 1 1", "UnitCells                     2 2")
+    script = script.replace("CreateNumberOfMolecules 0", "CreateNumberOfMolecules 10")
+    script += "Box 0\n"
+    issues = "\n".join(validate_script("raspa", script))
+    assert "ExternalPressure must be numeric" in issues
+    assert "UnitCells must be three positive integers" in issues
+    assert "CreateNumberOfMolecules should be 0" in issues
+    assert "Box section present" in issues
+    missing = validate_script("raspa", RASPA.replace("NumberOfCycles                10000\n", ""))
+    assert missing == ["Missing required RASPA keyword NumberOfCycles."]
+
+def test_lammps_errors():
+    script = LAMMPS.replace("pair_coeff * * 0.1 3.0\n", "").replace("read_data system.data\n", "")
+    script = script.replace("run 50000", "run")
+    issues = "\n".join(validate_script("lammps", script))
+    assert "pair_style given but no pair_coeff" in issues
+    assert "No simulation box" in issues
+    assert "run needs a step count" in issues
+
+def test_gromacs_errors():
+    script = GROMACS.replace("dt         = 0.002\n", "").replace("ref_t      = 300 300", "ref_t      = 300")
+    script = script.replace("pcoupl     = no", "pcoupl     = Parrinello-Rahman")
+    issues = "\n".join(validate_script("gromacs", script))
+    assert "Integrator md needs dt" in issues
+    assert "ref_t has 1 values for 2 tc-grps" in issues
+    assert "pcoupl = parrinello-rahman needs tau_p" in issues
+
+def test_gulp_errors():
+    script = GULP.replace("7.0 7.0 7.0 90.0 90.0 90.0", "7.0 7.0 7.0").replace("dump test.gout\n", "")
+    script = script.replace("O1 shel 0.500000 0.000000 0.000000", "O2 shel 0.500000 0.000000 0.000000")
+    issues = "\n".join(validate_script("gulp", script))
+    assert "cell must be followed by a b c alpha beta gamma" in issues
+    assert "Missing 'dump <name>.gout' line" in issues
+    assert "not in species block: O2 shel" in issues
+
+def test_comment_markers_per_format():
+    # '#' is a comment in RASPA; '!' is not, so a trailing "! Pa" is part of the value.
+    assert validate_script("raspa", RASPA.replace("1e5", "1e5 # Pa")) == []
+    issues = validate_script("raspa", RASPA.replace("1e5", "1e5 ! Pa"))
+    assert issues == ["ExternalPressure must be numeric, got 1e5 ! Pa."]
+    # A LAMMPS line starting with ';' or '!' is a command, not a comment.
+    assert validate_script("lammps", LAMMPS.replace("run 50000", "!run 50000")) == ["No run or minimize command."]
+    assert validate_script("lammps", LAMMPS + "# run 10\n") == []
+    assert validate_script("gromacs", GROMACS.replace("ref_t      = 300 300", "ref_t = 300 300 ; K")) == []
+    assert validate_script("gulp", "# header\n! note\n" + GULP.replace("dump test.gout", "dump test.gout ! out")) == []
@@ -0,0 +1,43 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+from osairo.config import worker_threads
+from osairo.model_manager import get_most_uncertain_point
+from osairo.sharded_scoring import merge_top_k, score_sharded
+
+def _worker_thread_env():
+    return os.environ.get("OMP_NUM_THREADS"), os.environ.get("OPENBLAS_NUM_THREADS")
+
+def test_merge_top_k():
+    shards = [(np.array([0, 3]), np.array([0.5, 0.9])), (np.array([10, 12]), np.array([0.7, 0.95]))]
+    indices, scores = merge_top_k(shards, 3)
+    np.testing.assert_array_equal(indices, [12, 3, 10])
+    np.testing.assert_allclose(scores, [0.95, 0.9, 0.7])
+
+def test_worker_threads_reach_spawned_workers(monkeypatch):
+    monkeypatch.setenv("OMP_NUM_THREADS", "7")
+    monkeypatch.delenv("OPENBLAS_NUM_THREADS", raising=False)
+    ctx = multiprocessing.get_context("spawn")
+    with worker_threads(2), ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        assert pool.submit(_worker_thread_env).result() == ("2", "2")
+    # The parent's settings are restored afterwards.
+    assert os.environ["OMP_NUM_THREADS"] == "7" and "OPENBLAS_NUM_THREADS" not in os.environ
+
+def test_sharded_top_k_matches_single_process(tmp_path):
+    gpflow = pytest.importorskip("gpflow")
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 1, (20, 2))
+    model = gpflow.models.GPR(data=(X, np.sin(3 * X[:, :1])), kernel=gpflow.kernels.Matern52(lengthscales=0.3),
+                              noise_variance=1e-3)
+    path = str(tmp_path / "pool.npy")
+    np.save(path, rng.uniform(-0.5, 1.5, (500, 2)))
+    pool = np.load(path, mmap_mode="r")
+    _, best, best_score = get_most_uncertain_point(model, np.asarray(pool))
+    indices, scores = score_sharded(model, pool, top_k=5, n_workers=2, shard_size=70)
+    assert int(indices[0]) == best and scores[0] == pytest.approx(best_score, rel=1e-9)
+    assert np.all(np.diff(scores) <= 0) and len(set(indices.tolist())) == 5
+    # Through get_most_uncertain_point as well.
+    _, idx, _ = get_most_uncertain_point(model, pool, n_workers=2)
+    assert idx == best
@@ -0,0 +1,127 @@
+import os
+import shutil
+import subprocess
+import sys
+import numpy as np
+from osairo.structure_cache import StructureCache, get_structure_cache, load_parsed
+
+class CountingParser:
+    """
+    Toy structure format: "a <cell length>" then one "<symbol> x y z" per site.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        lines = text.split("\n")
+        a = float(lines[0].split()[1])
+        sites = [line.split() for line in lines[1:] if line.strip()]
+        return {"lattice": np.eye(3) * a, "frac_coords": [[float(v) for v in site[1:]] for site in sites],
+                "species": [site[0] for site in sites], "meta": {"a": a}}
+
+def write(path, a=5.0, n=3):
+    sites = "".join(f"{'Si' if i % 2 else 'O'} {i / n} 0.0 0.5\n" for i in range(n))
+    path.write_text(f"a {a}\n{sites}")
+    return path
+
+def test_hit_after_first_parse(tmp_path):
+    parse = CountingParser()
+    path = write(tmp_path / "x.txt")
+    cache = StructureCache(str(tmp_path / "cache"))
+    first = cache.load(path, "toy", parse)
+    second = cache.load(path, "toy", parse)
+    assert parse.calls == 1 and (cache.hits, cache.misses) == (1, 1)
+    np.testing.assert_array_equal(second.lattice, np.eye(3) * 5.0)
+    np.testing.assert_array_equal(second.frac_coords, first.frac_coords)
+    assert list(second.species) == ["O", "Si", "O"] and second.meta == {"a": 5.0}
+    # A new instance (another process) reads the same entries from disk.
+    reopened = StructureCache(str(tmp_path / "cache"))
+    reopened.load(path, "toy", parse)
+    assert parse.calls == 1 and reopened.hits == 1
+    # Another parser kind of the same file is a separate entry.
+    cache.load(path, "other", parse)
+    assert parse.calls == 2
+
+def test_changed_file_is_reparsed(tmp_path):
+    parse = CountingParser()
+    path = write(tmp_path / "x.txt")
+    cache = StructureCache(str(tmp_path / "cache"))
+    cache.load(path, "toy", parse)
+    write(path, a=6.0, n=4)
+    structure = cache.load(path, "toy", parse)
+    assert parse.calls == 2 and len(structure) == 4
+    np.testing.assert_array_equal(structure.lattice, np.eye(3) * 6.0)
+    # Same size, new mtime: the content hash decides.
+    write(path, a=7.0, n=4)
+    os.utime(path, ns=(1, 1))
+    assert cache.load(path, "toy", parse).meta == {"a": 7.0}
+    assert parse.calls == 3
+
+def test_copied_or_touched_file_matches_by_content(tmp_path):
+    parse = CountingParser()
+    path = write(tmp_path / "x.txt")
+    cache = StructureCache(str(tmp_path / "cache"))
+    original = cache.load(path, "toy", parse)
+    copy = tmp_path / "copy.txt"
+    shutil.copy(path, copy)
+    os.utime(path, ns=(10 ** 18, 10 ** 18))
+    for target in (copy, path):
+        structure = cache.load(target, "toy", parse)
+        np.testing.assert_array_equal(structure.frac_coords, original.frac_coords)
+    assert parse.calls == 1 and cache.hits == 2
+    assert len(cache) == 2
+
+def test_compact_drops_stale_arrays(tmp_path):
+    parse = CountingParser()
+    paths = [write(tmp_path / f"{i}.txt", a=5.0 + i, n=50) for i in range(3)]
+    cache = StructureCache(str(tmp_path / "cache"))
+    for path in paths:
+        cache.load(path, "toy", parse)
+    for i, path in enumerate(paths):
+        write(path, a=10.0 + i, n=50)
+        cache.load(path, "toy", parse)
+    before = os.path.getsize(cache.archive_path)
+    archive = cache.compact()
+    assert os.path.getsize(archive) < before
+    assert [name for name in os.listdir(cache.folder) if name.endswith(".bin")] == [os.path.basename(archive)]
+    calls = parse.calls
+    reopened = StructureCache(cache.folder)
+    for i, path in enumerate(paths):
+        assert reopened.load(path, "toy", parse).meta == {"a": 10.0 + i}
+        np.testing.assert_array_equal(cache.load(path, "toy", parse).lattice, np.eye(3) * (10.0 + i))
+    assert parse.calls == calls
+
+def test_unusable_cache_falls_back_to_parsing(tmp_path, capsys):
+    parse = CountingParser()
+    path = write(tmp_path / "x.txt")
+    # The cache folder cannot be created: no cache, files still load.
+    blocker = tmp_path / "not_a_folder"
+    blocker.write_text("")
+    assert get_structure_cache(str(blocker / "cache")) is None
+    assert len(load_parsed(path, "toy", parse, cache=False)) == 3
+    # The archive cannot be written: the file is parsed without the cache.
+    cache = StructureCache(str(tmp_path / "cache"))
+    os.mkdir(cache.archive_path)
+    structure = load_parsed(path, "toy", parse, cache=cache)
+    assert len(structure) == 3 and list(structure.species) == ["O", "Si", "O"]
+    assert "parsed without it" in capsys.readouterr().out
+
+def default_cache_folder(**env):
+    env = {**{name: value for name, value in os.environ.items()
+              if name not in ("OSAIRO_STRUCTURE_CACHE", "XDG_CACHE_HOME")}, **env}
+    code = "from osairo.structure_cache import get_structure_cache as g; c = g(); print(None if c is None else c.folder)"
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return result.stdout.strip()
+
+def test_enabled_in_xdg_cache_by_default(tmp_path):
+    assert default_cache_folder(XDG_CACHE_HOME=str(tmp_path)) == str(tmp_path / "osairo" / "structures")
+    assert default_cache_folder(XDG_CACHE_HOME=str(tmp_path), OSAIRO_STRUCTURE_CACHE=str(tmp_path / "own")) \
+        == str(tmp_path / "own")
+
+def test_disabled_with_off_or_empty(tmp_path):
+    assert default_cache_folder(XDG_CACHE_HOME=str(tmp_path), OSAIRO_STRUCTURE_CACHE="off") == "None"
+    assert default_cache_folder(XDG_CACHE_HOME=str(tmp_path), OSAIRO_STRUCTURE_CACHE="") == "None"
+    assert not (tmp_path / "osairo").exists()
@@ -0,0 +1,50 @@
+import numpy as np
+from osairo.supercell import (build_supercell, lattice_matrix, minimum_supercell, perpendicular_widths,
+                              raspa_unit_cells, tile_fractional)
+
+def test_lattice_matrix_reproduces_cell_parameters():
+    matrix = lattice_matrix(5.0, 6.0, 7.0, 80.0, 95.0, 110.0)
+    lengths = np.linalg.norm(matrix, axis=1)
+    np.testing.assert_allclose(lengths, [5.0, 6.0, 7.0])
+    a, b, c = matrix
+    angle = lambda u, v: np.degrees(np.arccos(u @ v / np.linalg.norm(u) / np.linalg.norm(v)))
+    np.testing.assert_allclose([angle(b, c), angle(a, c), angle(a, b)], [80.0, 95.0, 110.0])
+
+def test_cubic_widths_are_cell_lengths():
+    np.testing.assert_allclose(perpendicular_widths(np.diag([7.0, 8.0, 9.0])), [7.0, 8.0, 9.0])
+    assert tuple(minimum_supercell(np.diag([7.0, 7.0, 7.0]), 10.0)) == (3, 3, 3)
+
+def test_triclinic_widths_against_cutoff():
+    matrix = lattice_matrix(10.0, 10.0, 10.0, 60.0, 60.0, 60.0)
+    widths = perpendicular_widths(matrix)
+    # Width = V / |a_j x a_k|, always below the cell length for a skewed cell.
+    volume = abs(np.linalg.det(matrix))
+    expected = [volume / np.linalg.norm(np.cross(matrix[1], matrix[2])),
+                volume / np.linalg.norm(np.cross(matrix[2], matrix[0])),
+                volume / np.linalg.norm(np.cross(matrix[0], matrix[1]))]
+    np.testing.assert_allclose(widths, expected)
+    assert np.all(widths < 10.0)
+    # Lengths alone (10 Å >= 2 * 5 Å) would wrongly suggest one cell is enough at 5 Å.
+    repeats = minimum_supercell(matrix, 5.0)
+    assert tuple(repeats) == (2, 2, 2)
+    assert np.all(repeats * widths >= 2 * 5.0)
+    assert np.all((repeats - 1) * widths < 2 * 5.0)
+
+def test_widths_on_a_stack_of_cells():
+    stack = np.stack([np.diag([7.0, 8.0, 9.0]), lattice_matrix(10.0, 10.0, 10.0, 60.0, 60.0, 60.0)])
+    widths = perpendicular_widths(stack)
+    assert widths.shape == (2, 3)
+    np.testing.assert_allclose(widths[1], perpendicular_widths(stack[1]))
+
+def test_build_supercell_tiles_sites():
+    frac = np.array([[0.0, 0.0, 0.0], [0.5, 0.5, 0.5]])
+    matrix, tiled, species = build_supercell(np.eye(3) * 4.0, frac, ["Si", "O"], (2, 1, 1))
+    np.testing.assert_allclose(matrix, np.diag([8.0, 4.0, 4.0]))
+    assert len(tiled) == 4 and list(species) == ["Si", "O", "Si", "O"]
+    np.testing.assert_allclose(tiled[:, 0], [0.0, 0.25, 0.5, 0.75])
+    assert np.all((tile_fractional(frac, (3, 2, 1)) >= 0) & (tile_fractional(frac, (3, 2, 1)) < 1))
+
+def test_raspa_unit_cells():
+    params = {"a": 26.343, "b": 26.343, "c": 26.343, "alpha": 90.0, "beta": 90.0, "gamma": 90.0}
+    assert raspa_unit_cells(params, cutoff=12.0) == "1 1 1"
+    assert raspa_unit_cells(dict(params, a=10.0), cutoff=12.0) == "3 1 1"